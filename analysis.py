@@ -0,0 +1,61 @@
+import math
+from dataclasses import dataclass
+from fractions import Fraction
+
+from game_logic import IGame
+
+#точні характеристики гри
+@dataclass
+class GameAnalysis:
+    """
+    Точні (не симульовані) характеристики одного раунду гри.
+    Усі ймовірності та моменти зберігаються як Fraction, без похибки округлення.
+    """
+    outcome_probabilities: dict  #код результату -> ймовірність
+    win_probability: Fraction
+    expected_delta: Fraction     #очікувана зміна балансу за раунд
+    variance: Fraction           #дисперсія зміни балансу за раунд
+
+    @property
+    def rtp(self) -> float:
+        """RTP у відсотках при ставці 1 монета за раунд."""
+        return float((self.expected_delta + 1) * 100)
+
+    @property
+    def std(self) -> float:
+        """Стандартне відхилення зміни балансу за раунд."""
+        return math.sqrt(self.variance)
+
+
+def analyze(game: IGame) -> GameAnalysis:
+    """
+    Рахує точний розподіл результатів гри, перебираючи її простір результатів.
+    Кидає NotImplementedError, якщо гра не має точної моделі.
+    """
+    outcome_probabilities = {}
+    win_probability = Fraction(0)
+    expected_delta = Fraction(0)
+    second_moment = Fraction(0)
+
+    for code, probability, is_win, money_delta in game.outcome_space():
+        delta = Fraction(money_delta)
+        outcome_probabilities[code] = outcome_probabilities.get(code, 0) + probability
+        if is_win:
+            win_probability += probability
+        expected_delta += probability * delta
+        second_moment += probability * delta * delta
+
+    return GameAnalysis(
+        outcome_probabilities=outcome_probabilities,
+        win_probability=win_probability,
+        expected_delta=expected_delta,
+        variance=second_moment - expected_delta * expected_delta
+    )
+
+
+def try_analyze(game: IGame) -> GameAnalysis:
+    """Те саме, що analyze(), але повертає None для ігор без точної моделі."""
+    try:
+        return analyze(game)
+    except NotImplementedError:
+        return None
@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from game_logic import IGame
+from game_registry import REGISTRY
+from simulation import run_simulation
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+#скільки результатів тримати в пам'яті для порівняння форматів (result_memory)
+RESULT_MEMORY_RUNS = 10 ** 6
+
+#скільки раундів циклу play_once проганяти під count_allocations(): хук профайлера
+#на кожному виклику сповільнює його в сотні разів, а алокацій на раунд там стало
+SCALAR_ALLOCATION_RUNS = 10 ** 4
+
+
+def play_scalar(game: IGame, runs: int, seed: int, workers: int):
+    """Старий шлях: цикл play_once() з підсумком у Python."""
+    total_wins = 0
+    total_money_delta = 0.0
+    for _ in range(runs):
+        result = game.play_once()
+        if result.is_win:
+            total_wins += 1
+        total_money_delta += result.money_delta
+    return total_wins, total_money_delta
+
+
+def play_batch(game: IGame, runs: int, seed: int, workers: int):
+    """Пакетний шлях у одному процесі (play_many + накопичувач)."""
+    return run_simulation(game, runs, seed=seed, workers=1)
+
+
+def play_parallel(game: IGame, runs: int, seed: int, workers: int):
+    """Пакетний шлях у пулі процесів."""
+    return run_simulation(game, runs, seed=seed, workers=workers)
+
+
+#шляхи виконання, які порівнюємо
+ENGINES = {
+    "scalar": play_scalar,
+    "batch": play_batch,
+    "parallel": play_parallel,
+}
+
+
+#старий формат результату (звичайний dataclass з рядком) - лише для порівняння пам'яті
+@dataclass
+class LegacyGameResult:
+    primary_value: any
+    is_win: bool
+    money_delta: float
+
+
+def traced_bytes(build) -> int:
+    """Скільки байтів займає об'єкт, який повертає build()."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    value = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return after - before
+
+
+def result_memory(game: IGame, runs: int = RESULT_MEMORY_RUNS, seed: int = 12345) -> dict:
+    """
+    Байтів на результат, коли runs результатів тримаються в пам'яті:
+    список старих dataclass'ів, список GameResult (slots) і ResultBatch (колонки numpy).
+    """
+    batch = game.play_many(runs, np.random.default_rng(seed))
+    legacy = traced_bytes(lambda: [
+        LegacyGameResult(game.decode_outcome(code), is_win, money_delta)
+        for code, is_win, money_delta in zip(batch.outcomes.tolist(), batch.wins.tolist(),
+                                             batch.money_deltas.tolist())
+    ])
+    slotted = traced_bytes(lambda: list(batch))
+    return {
+        "runs": runs,
+        "legacy_bytes_per_result": legacy / runs,
+        "slotted_bytes_per_result": slotted / runs,
+        "packed_bytes_per_result": batch.nbytes / runs,
+    }
+
+
+def count_allocations(function, *args) -> tuple:
+    """
+    Викликає function(*args) і рахує блоки пам'яті, виділені за час виклику
+    (а не ті, що лишилися живими). sys.getallocatedblocks() - це виділені мінус звільнені,
+    тож читаємо його на кожній події профайлера (виклик/повернення функції) і підсумовуємо
+    лише зростання. Повертає (результат, кількість блоків).
+
+    Це нижня межа: блок, створений і звільнений між двома подіями, не видно.
+    Великі буфери (дані масивів numpy) йдуть повз pymalloc - їх показує peak_bytes,
+    а алокації процесів-воркерів сюди не потрапляють.
+    """
+    allocated = 0
+    last = sys.getallocatedblocks()
+
+    def hook(frame, event, arg):
+        nonlocal allocated, last
+        blocks = sys.getallocatedblocks()
+        if event == "call":
+            blocks -= 1  #об'єкт кадру, який створює сам профайлер
+        if blocks > last:
+            allocated += blocks - last
+        #читаємо ще раз: власні алокації хука не враховуються
+        last = sys.getallocatedblocks()
+
+    sys.setprofile(hook)
+    try:
+        result = function(*args)
+    finally:
+        sys.setprofile(None)
+    allocated += max(sys.getallocatedblocks() - last, 0)
+    return result, allocated
+
+
+def measure(engine, game: IGame, runs: int, seed: int, workers: int, repeat: int,
+            allocation_runs: int = None) -> dict:
+    """
+    Міряє один шлях на одному розмірі.
+    Час - найкращий з repeat запусків без tracemalloc (він сповільнює алокації),
+    пам'ять - окремим запуском під tracemalloc, алокації - ще одним під count_allocations()
+    (на allocation_runs раундах, за замовчуванням - на всіх).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        engine(game, runs, seed, workers)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    engine(game, runs, seed, workers)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    allocation_runs = allocation_runs or runs
+    _, allocated_blocks = count_allocations(engine, game, allocation_runs, seed, workers)
+
+    return {
+        "seconds": best,
+        "rounds_per_second": runs / best if best > 0 else None,
+        "peak_bytes": peak_bytes,
+        "peak_bytes_per_round": peak_bytes / runs,
+        "allocated_blocks_per_round": allocated_blocks / allocation_runs,
+    }
+
+
+def run_benchmarks(games: list, engines: list, sizes: list, seed: int = 12345,
+                   workers: int = None, repeat: int = 3, max_scalar_runs: int = 10 ** 6,
+                   log=None) -> list:
+    """Проганяє всі комбінації гра x шлях x розмір і повертає список рядків-результатів."""
+    workers = workers or os.cpu_count() or 1
+    rows = []
+    for game_key in games:
+        for engine_key in engines:
+            for runs in sizes:
+                if engine_key == "scalar" and runs > max_scalar_runs:
+                    continue  #цикл play_once на 1e7 раундів міряти занадто довго
+                game = REGISTRY.create(game_key)
+                row = {"game": game_key, "engine": engine_key, "runs": runs,
+                       "workers": workers if engine_key == "parallel" else 1}
+                #пакетні шляхи мають мало викликів на раунд, тож рахуються на всьому запуску
+                allocation_runs = min(runs, SCALAR_ALLOCATION_RUNS) if engine_key == "scalar" else runs
+                row.update(measure(ENGINES[engine_key], game, runs, seed, workers, repeat,
+                                   allocation_runs))
+                rows.append(row)
+                if log is not None:
+                    log(f"{game_key:>7} {engine_key:>8} {runs:>10} "
+                        f"{row['rounds_per_second']:>14,.0f} раундів/с "
+                        f"{row['peak_bytes_per_round']:>8.1f} Б/раунд "
+                        f"{row['allocated_blocks_per_round']:>8.3f} алок./раунд")
+    return rows
+
+
+def environment_info() -> dict:
+    """Дані про машину і коміт, щоб порівнювати лише порівнянні результати."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(old_report: dict, new_report: dict) -> list:
+    """Порівнює два звіти: відношення швидкостей для однакових (гра, шлях, розмір)."""
+    old_rows = {(r["game"], r["engine"], r["runs"]): r for r in old_report["results"]}
+    changes = []
+    for row in new_report["results"]:
+        old = old_rows.get((row["game"], row["engine"], row["runs"]))
+        if old is None or not old["rounds_per_second"] or not row["rounds_per_second"]:
+            continue
+        changes.append({
+            "game": row["game"], "engine": row["engine"], "runs": row["runs"],
+            "speedup": row["rounds_per_second"] / old["rounds_per_second"],
+        })
+    return changes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк ігор і рушіїв симуляції.")
+    parser.add_argument("--games", nargs="+", choices=REGISTRY.keys(), default=REGISTRY.keys())
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--max-scalar-runs", type=int, default=10 ** 6)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument("--output", default="benchmark_results.json", help="куди записати JSON")
+    parser.add_argument("--compare", default=None, help="попередній JSON для порівняння")
+    parser.add_argument("--result-memory-runs", type=int, default=RESULT_MEMORY_RUNS,
+                        help="скільки результатів тримати в пам'яті для порівняння форматів (0 - пропустити)")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmarks(args.games, args.engines, args.sizes, seed=args.seed,
+                          workers=args.workers, repeat=args.repeat,
+                          max_scalar_runs=args.max_scalar_runs, log=print)
+    report = {"environment": environment_info(), "results": rows}
+
+    if args.result_memory_runs > 0:
+        report["result_memory"] = {}
+        for game_key in args.games:
+            memory = result_memory(REGISTRY.create(game_key), args.result_memory_runs, args.seed)
+            report["result_memory"][game_key] = memory
+            print(f"{game_key:>7} пам'ять на результат ({memory['runs']} шт.): "
+                  f"list[dataclass] {memory['legacy_bytes_per_result']:.1f} Б, "
+                  f"list[GameResult] {memory['slotted_bytes_per_result']:.1f} Б, "
+                  f"ResultBatch {memory['packed_bytes_per_result']:.1f} Б")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"Результати записано у {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            old_report = json.load(file)
+        for change in compare(old_report, report):
+            print(f"{change['game']:>7} {change['engine']:>8} {change['runs']:>10} "
+                  f"x{change['speedup']:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+
+from game_logic import SlotsGame
+from game_registry import REGISTRY
+from simulation import (CHUNK_SIZE, run_simulation, run_until_precision,
+                        format_summary, summary_to_dict)
+from estimators import METHODS, estimate_rtp, format_estimate
+from results_store import ResultsStore
+from result_cache import SimulationCache, describe_source
+from profiling import Profiler, format_profile
+from convergence import ConvergenceTrace, format_trace
+from wagers import format_wagers, parse_wager, run_wagers, wagers_to_dict
+
+#колонки CSV (один рядок на запуск, зручно дописувати у спільний файл)
+CSV_FIELDS = ["game", "runs", "seed", "workers", "cancelled", "wins", "win_percentage",
+              "money_delta", "rtp", "variance", "elapsed_seconds"]
+#колонки CSV режиму --wager (рядок на ставку)
+WAGER_CSV_FIELDS = ["game", "runs", "seed", "bet", "value", "stake", "wins", "win_percentage",
+                    "money_delta", "rtp", "variance"]
+#колонки CSV режиму --estimator (похибка оцінки - головне, заради чого цей режим)
+ESTIMATE_CSV_FIELDS = ["game", "method", "runs", "seed", "rtp", "rtp_standard_error", "confidence",
+                       "rtp_half_width", "elapsed_seconds"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m casino_cli",
+        description="Симуляція ігор OvvraBet без GUI."
+    )
+    parser.add_argument("--game", default="dice",
+                        help="ключ гри з реєстру (див. --list-games)")
+    parser.add_argument("--variants", metavar="FILE", default=None,
+                        help="JSON-файл з варіантами ігор (напр. таблицями виплат) для реєстру")
+    parser.add_argument("--list-games", action="store_true", help="показати доступні ігри і вийти")
+    parser.add_argument("--runs", type=int, default=1000, help="кількість раундів")
+    parser.add_argument("--seed", type=int, default=None, help="seed для відтворення запуску")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="кількість процесів (за замовчуванням - усі ядра)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="раундів в одному пакеті")
+    parser.add_argument("--precision", type=float, default=None,
+                        help="адаптивний режим: грати, доки RTP не відомий з точністю ±N відсоткових "
+                             "пунктів (--runs ігнорується)")
+    parser.add_argument("--confidence", type=float, default=0.99,
+                        help="рівень довіри для --precision і --estimator")
+    parser.add_argument("--max-runs", type=int, default=None,
+                        help="верхня межа раундів для --precision")
+    parser.add_argument("--estimator", choices=METHODS, default=None,
+                        help="лише для слотів: оцінити RTP за --runs спінів обраним методом "
+                             "(importance/stratified - зі зменшенням дисперсії)")
+    parser.add_argument("--save", metavar="DIR", default=None,
+                        help="зберегти всі раунди запуску у файл .run у теці DIR "
+                             "(див. python -m results_store)")
+    parser.add_argument("--cache", metavar="DIR", default=None,
+                        help="кеш підсумків у теці DIR: повтор запуску з тим самим seed береться "
+                             "з кешу, довший запуск лише дораховується")
+    parser.add_argument("--profile", action="store_true",
+                        help="профілювати запуск: час фаз, раунди/с, пік пам'яті")
+    parser.add_argument("--profile-dump", metavar="DIR", default=None,
+                        help="з --profile: записати знімки cProfile і tracemalloc у теку DIR")
+    parser.add_argument("--trace", action="store_true",
+                        help="записати збіжність RTP на контрольних точках 10, 20, 50, ... раундів "
+                             "(з довірчим інтервалом рівня --confidence)")
+    parser.add_argument("--wager", metavar="SPEC", action="append", default=None,
+                        help="ставка з меню (можна кілька): тип[:значення][@розмір], напр. "
+                             "main, sum:7@2, over, numbers:17,18; усі ставки розраховуються "
+                             "на тих самих розіграшах")
+    parser.add_argument("--format", choices=["text", "json", "csv"], default="text",
+                        help="формат виводу")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.variants is not None:
+        REGISTRY.load_variants(args.variants)
+    if args.list_games:
+        for spec in REGISTRY.specs():
+            capabilities = spec.capabilities()
+            print(f"{spec.key:<16} {spec.label:<28} "
+                  f"пакетний: {'так' if capabilities.batch else 'ні'}, "
+                  f"точна модель: {'так' if capabilities.analytic else 'ні'}")
+        return 0
+    if args.game not in REGISTRY:
+        parser.error(f"невідома гра '{args.game}' (доступні: {', '.join(REGISTRY.keys())})")
+    if args.runs < 0:
+        print("Помилка: кількість раундів не може бути від'ємною.", file=sys.stderr)
+        return 2
+    if args.precision is not None and not args.precision > 0:
+        print("Помилка: --precision має бути додатним.", file=sys.stderr)
+        return 2
+    if args.seed is not None and args.seed < 0:
+        print("Помилка: seed не може бути від'ємним.", file=sys.stderr)
+        return 2
+
+    game = REGISTRY.create(args.game, seed=args.seed)
+    if args.estimator is not None:
+        if not isinstance(game, SlotsGame):
+            print("Помилка: --estimator працює лише для слотів.", file=sys.stderr)
+            return 2
+        return _print_estimate(game, args)
+
+    workers = args.workers or os.cpu_count() or 1
+    if args.wager is not None:
+        return _print_wagers(game, args, workers)
+
+    writer = None
+    if args.save is not None:
+        writer = ResultsStore(args.save).new_writer(game, {
+            "runs": args.runs, "workers": workers, "chunk_size": args.chunk_size,
+            "precision": args.precision, "confidence": args.confidence,
+        })
+
+    cache = None
+    if args.cache is not None and writer is None and args.precision is None:
+        cache = SimulationCache(directory=args.cache)
+
+    profiler = None
+    if args.profile or args.profile_dump is not None:
+        dumping = args.profile_dump is not None
+        profiler = Profiler(trace_memory=dumping, cprofile=dumping, dump_dir=args.profile_dump)
+
+    trace = ConvergenceTrace() if args.trace else None
+
+    started = time.perf_counter()
+    with profiler if profiler is not None else contextlib.nullcontext():
+        if cache is not None:
+            summary = cache.run(game, args.runs, seed=args.seed, workers=workers,
+                                chunk_size=args.chunk_size, trace=trace)
+            confidence = None
+        elif args.precision is None:
+            summary = run_simulation(game, args.runs, seed=args.seed, workers=workers,
+                                     chunk_size=args.chunk_size, sink=writer, trace=trace)
+            confidence = None
+        else:
+            summary = run_until_precision(game, args.precision, args.confidence, seed=args.seed,
+                                          workers=workers, max_runs=args.max_runs, sink=writer,
+                                          trace=trace)
+            confidence = args.confidence
+    elapsed = time.perf_counter() - started
+    saved_path = writer.close(summary, elapsed) if writer is not None else None
+
+    if args.format == "text":
+        sys.stdout.write(format_summary(game, summary, confidence))
+        print(f"Час: {elapsed:.3f} с")
+        if cache is not None:
+            sys.stdout.write(describe_source(cache))
+        if saved_path is not None:
+            print(f"Збережено: {saved_path}")
+        if trace is not None:
+            sys.stdout.write(format_trace(trace, args.confidence))
+        if profiler is not None:
+            sys.stdout.write(format_profile(profiler.report))
+        return 0
+
+    data = summary_to_dict(game, summary)
+    if saved_path is not None:
+        data["saved_path"] = saved_path
+    if cache is not None:
+        data["cache"] = cache.last_source
+    if trace is not None:
+        data["convergence"] = trace.to_dict(args.confidence)
+    if profiler is not None:
+        data["profile"] = profiler.report.to_dict()
+    data["workers"] = workers
+    data["elapsed_seconds"] = elapsed
+    if confidence is not None:
+        data["confidence"] = confidence
+        data["rtp_half_width"] = summary.rtp_half_width(confidence)
+
+    if args.format == "json":
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerow(data)
+    return 0
+
+
+def _print_estimate(game: SlotsGame, args) -> int:
+    """Режим --estimator: одна оцінка RTP замість повного підсумку симуляції."""
+    started = time.perf_counter()
+    try:
+        estimate = estimate_rtp(game, args.runs, args.estimator, seed=args.seed)
+    except ValueError as error:
+        print(f"Помилка: {error}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+
+    if args.format == "text":
+        sys.stdout.write(format_estimate(game, estimate, args.confidence))
+        print(f"Час: {elapsed:.3f} с")
+        return 0
+
+    data = {
+        "game": game.get_game_name(),
+        "method": estimate.method,
+        "runs": estimate.spins,
+        "seed": estimate.seed,
+        "rtp": estimate.rtp,
+        "rtp_standard_error": estimate.standard_error,
+        "confidence": args.confidence,
+        "rtp_half_width": estimate.half_width(args.confidence),
+        "elapsed_seconds": elapsed,
+    }
+    if args.format == "json":
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=ESTIMATE_CSV_FIELDS)
+        writer.writeheader()
+        writer.writerow(data)
+    return 0
+
+
+def _print_wagers(game, args, workers: int) -> int:
+    """Режим --wager: кожна ставка з меню на тих самих раундах."""
+    try:
+        wagers = [parse_wager(text) for text in args.wager]
+        started = time.perf_counter()
+        summary = run_wagers(game, wagers, args.runs, seed=args.seed, workers=workers,
+                             chunk_size=args.chunk_size)
+    except ValueError as error:
+        print(f"Помилка: {error}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+
+    if args.format == "text":
+        sys.stdout.write(format_wagers(game, summary, args.confidence))
+        print(f"Час: {elapsed:.3f} с")
+        return 0
+
+    data = wagers_to_dict(game, summary)
+    data["workers"] = workers
+    data["elapsed_seconds"] = elapsed
+    if args.format == "json":
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        rows = csv.DictWriter(sys.stdout, fieldnames=WAGER_CSV_FIELDS, extrasaction="ignore")
+        rows.writeheader()
+        for wager in data["wagers"]:
+            rows.writerow({"game": data["game"], "runs": data["runs"], "seed": data["seed"], **wager})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+import numpy as np
+
+from game_logic import IGame
+from convergence import ConvergenceTrace
+
+#скільки точок лінії RTP зберігаємо (і малюємо) незалежно від довжини запуску
+TRACE_POINTS = 512
+
+#запас по осі Y: вісь розширюється рідко, тож повна перерисовка теж рідкісна
+HEADROOM = 1.5
+
+
+#історія RTP під час запуску
+class RtpTrace:
+    """
+    RTP після кожного пакета, проріджений до capacity точок.
+    Коли буфер заповнений, кожна друга точка відкидається, а крок запису
+    подвоюється, тож пам'ять і час малювання не залежать від довжини запуску.
+    Остання точка зберігається завжди, щоб лінія доходила до поточного стану.
+    """
+
+    def __init__(self, capacity: int = TRACE_POINTS):
+        if capacity < 2 or capacity % 2:
+            raise ValueError("capacity має бути парним і не меншим за 2")
+        self.capacity = capacity
+        self.stride = 1  #записуємо кожну stride-ту точку
+        self._runs = np.zeros(capacity, dtype=np.int64)
+        self._rtp = np.zeros(capacity)
+        self._size = 0
+        self._offered = 0
+        self._last = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, runs: int, rtp: float):
+        """Додає точку (кількість раундів, RTP у відсотках)."""
+        index = self._offered
+        self._offered += 1
+        self._last = (runs, rtp)
+        if index % self.stride:
+            return
+        if self._size == self.capacity:
+            #проріджуємо: лишаються точки з номерами, кратними новому кроку
+            half = self.capacity // 2
+            self._runs[:half] = self._runs[::2]
+            self._rtp[:half] = self._rtp[::2]
+            self._size = half
+            self.stride *= 2
+            if index % self.stride:
+                return
+        self._runs[self._size] = runs
+        self._rtp[self._size] = rtp
+        self._size += 1
+
+    def points(self) -> tuple:
+        """(раунди, RTP) для малювання, включно з останньою точкою."""
+        runs = self._runs[:self._size]
+        rtp = self._rtp[:self._size]
+        if self._last is not None and (self._size == 0 or runs[-1] != self._last[0]):
+            runs = np.append(runs, self._last[0])
+            rtp = np.append(rtp, self._last[1])
+        return runs.copy(), rtp.copy()
+
+
+def ordered_bars(game: IGame, histogram: dict, by_code: bool) -> tuple:
+    """
+    Стовпчики гістограми: (коди, підписи, кількості).
+    by_code=True - за кодом (для костей і живого графіка, де порядок не має мінятися),
+    інакше - за частотою.
+    """
+    if by_code:
+        codes = sorted(histogram)
+    else:
+        codes = sorted(histogram, key=histogram.get, reverse=True)
+    labels = [game.decode_outcome(code) for code in codes]
+    values = [histogram[code] for code in codes]
+    return codes, labels, values
+
+
+#графік результатів для вікна "Графік"
+class ResultsChart:
+    """
+    Фігура з гістограмою результатів і лінією RTP за час запуску.
+    Якщо для підсумку є ConvergenceTrace, лінія RTP малюється по контрольних
+    точках на логарифмічній осі раундів разом зі смугою довірчого інтервалу.
+    Фігура будується один раз і далі лише оновлюється:
+    show() - звичайне оновлення (для підсумку), update_live() - оновлення під час
+    запуску через blitting: перемальовуються лише стовпчики, що змінилися,
+    і лінія RTP, а повна перерисовка буває, лише коли з'явився новий результат
+    або дані вийшли за межі осей.
+    matplotlib імпортується лише тут, при створенні графіка.
+    """
+
+    def __init__(self, game: IGame, title: str, by_code: bool):
+        from matplotlib.figure import Figure
+
+        self.game = game
+        self.by_code = by_code
+        self.figure = Figure(figsize=(6, 4.5), dpi=100)
+        self.bars_ax, self.rtp_ax = self.figure.subplots(
+            2, 1, gridspec_kw={"height_ratios": [2, 1]}
+        )
+        self.bars_ax.set_title(f"Розподіл результатів ({title})")
+        self.bars_ax.set_ylabel("Кількість випадінь")
+        self.rtp_ax.set_xlabel("Раунди")
+        self.rtp_ax.set_ylabel("RTP, %")
+        #лінія RTP малюється окремо від фону (animated), щоб її можна було blit-ити
+        self.rtp_line, = self.rtp_ax.plot([], [], animated=True)
+        self._band = None  #смуга довірчого інтервалу (лише в підсумку зі збіжністю)
+
+        self.canvas = None
+        self.run_token = None  #який запуск зараз показано (для кешу)
+        self._codes = []
+        self._bars = []
+        self._values = []
+        self._rtp_background = None
+
+    def attach(self, master):
+        """Вбудовує фігуру в Tk-контейнер master і повертає віджет полотна."""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        return self.canvas.get_tk_widget()
+
+    def _on_draw(self, event):
+        """Після повної перерисовки запам'ятовує фон осі RTP (без лінії) і домальовує лінію."""
+        self._rtp_background = self.canvas.copy_from_bbox(self.rtp_ax.bbox)
+        self.rtp_ax.draw_artist(self.rtp_line)
+
+    def _rebuild_bars(self, codes: list, labels: list, values: list):
+        for bar in self._bars:
+            bar.remove()
+        self._bars = list(self.bars_ax.bar(range(len(codes)), values))
+        self.bars_ax.set_xticks(range(len(codes)), labels)
+        self._codes = codes
+        self._values = list(values)
+
+    def _clear_band(self):
+        if self._band is not None:
+            self._band.remove()
+            self._band = None
+            self.rtp_ax.set_xscale("linear")
+
+    def _set_convergence(self, convergence: ConvergenceTrace, confidence: float):
+        """Лінія RTP по контрольних точках зі смугою довірчого інтервалу, вісь раундів - логарифмічна."""
+        self._clear_band()
+        runs, rtp, low, high = convergence.points(confidence)
+        self.rtp_ax.set_xscale("log")
+        self.rtp_line.set_data(runs, rtp)
+        #на перших точках смуга безмежна або дуже широка - обрізаємо її межами осі
+        self._band = self.rtp_ax.fill_between(runs, np.nan_to_num(low, neginf=-1e9),
+                                              np.nan_to_num(high, posinf=1e9), alpha=0.25)
+        self.rtp_ax.set_xlim(runs[0], max(int(runs[-1]), runs[0] + 1))
+        low, high = float(rtp.min()), float(rtp.max())
+        pad = max((high - low) * (HEADROOM - 1), 1.0)
+        self.rtp_ax.set_ylim(low - pad, high + pad)
+
+    def _set_rtp(self, trace: RtpTrace, total_runs: int):
+        self._clear_band()
+        runs, rtp = trace.points()
+        self.rtp_line.set_data(runs, rtp)
+        if len(rtp):
+            self.rtp_ax.set_xlim(0, max(total_runs, int(runs[-1]), 1))
+            low, high = float(rtp.min()), float(rtp.max())
+            pad = max((high - low) * (HEADROOM - 1), 1.0)
+            self.rtp_ax.set_ylim(low - pad, high + pad)
+
+    def show(self, histogram: dict, trace: RtpTrace = None, total_runs: int = 0,
+             run_token=None, convergence: ConvergenceTrace = None, confidence: float = 0.95):
+        """
+        Повністю показує підсумок запуску. Якщо цей запуск (run_token) уже показано,
+        нічого не перебудовує: кешована фігура просто перемальовується.
+        convergence - контрольні точки запуску (якщо є, замість лінії trace).
+        """
+        if run_token is not None and run_token == self.run_token:
+            self.canvas.draw_idle()
+            return
+        self.run_token = run_token
+
+        codes, labels, values = ordered_bars(self.game, histogram, self.by_code)
+        self._rebuild_bars(codes, labels, values)
+        self.bars_ax.set_ylim(0, max(values, default=1) * 1.05)
+        if convergence is not None and len(convergence.points(confidence)[0]):
+            self._set_convergence(convergence, confidence)
+        elif trace is not None:
+            self._set_rtp(trace, total_runs)
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def update_live(self, histogram: dict, trace: RtpTrace, total_runs: int):
+        """Оновлення під час запуску (стовпчики завжди впорядковані за кодом)."""
+        codes, labels, values = ordered_bars(self.game, histogram, by_code=True)
+        runs, rtp = trace.points()
+
+        low, high = self.rtp_ax.get_ylim()
+        rtp_fits = len(rtp) == 0 or self._rtp_background is not None and (
+            low <= rtp.min() and rtp.max() <= high and runs[-1] <= self.rtp_ax.get_xlim()[1]
+        )
+        if codes != self._codes or max(values, default=0) > self.bars_ax.get_ylim()[1] or not rtp_fits \
+                or self._band is not None:
+            #новий результат, вихід за межі осей або підсумок зі смугою на екрані -
+            #повна перерисовка із запасом
+            self._rebuild_bars(codes, labels, values)
+            self.bars_ax.set_ylim(0, max(values, default=1) * HEADROOM)
+            self._set_rtp(trace, total_runs)
+            self.figure.tight_layout()
+            self.canvas.draw()
+            return
+
+        #кількості лише ростуть, тож вищий стовпчик повністю накриває старий:
+        #достатньо домалювати змінені стовпчики поверх поточного зображення
+        for index, value in enumerate(values):
+            if value != self._values[index]:
+                self._bars[index].set_height(value)
+                self.bars_ax.draw_artist(self._bars[index])
+        self._values = values
+        self.canvas.blit(self.bars_ax.bbox)
+
+        #лінія RTP змінює форму: відновлюємо фон її осі і малюємо лінію заново
+        self.rtp_line.set_data(runs, rtp)
+        self.canvas.restore_region(self._rtp_background)
+        self.rtp_ax.draw_artist(self.rtp_line)
+        self.canvas.blit(self.rtp_ax.bbox)
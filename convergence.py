@@ -0,0 +1,113 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+#контрольні точки в кожному десятку: 10, 20, 50, 100, 200, 500, ...
+CHECKPOINT_STEPS = (1, 2, 5)
+FIRST_CHECKPOINT = 10
+#під скільки раундів розрахований буфер за замовчуванням (43 точки - із запасом для будь-якого запуску)
+MAX_TRACE_RUNS = 10 ** 15
+
+
+def checkpoints_between(start: int, stop: int) -> list:
+    """Контрольні точки p з start < p <= stop у порядку зростання."""
+    points = []
+    decade = FIRST_CHECKPOINT
+    while decade <= stop:
+        for step in CHECKPOINT_STEPS:
+            point = step * decade
+            if start < point <= stop:
+                points.append(point)
+        decade *= 10
+    return points
+
+
+#збіжність RTP за запуск
+class ConvergenceTrace:
+    """
+    Поточні RTP і частка виграшів на контрольних точках 10, 20, 50, 100, ... раундів.
+    Зберігаються лише моменти (раунди, виграші, сума змін балансу, M2) у буфері
+    сталого розміру, тож пам'ять не залежить від довжини запуску: 100M раундів - 22 точки.
+    Остання точка (поточний стан) зберігається окремо, щоб лінія доходила до кінця.
+    Точки записує рушій (run_simulation(..., trace=...)), коли зливає пакети по порядку.
+    """
+
+    def __init__(self, max_runs: int = MAX_TRACE_RUNS):
+        self.capacity = len(checkpoints_between(0, max_runs))
+        self._runs = np.zeros(self.capacity, dtype=np.int64)
+        self._wins = np.zeros(self.capacity, dtype=np.int64)
+        self._money_delta = np.zeros(self.capacity)
+        self._money_m2 = np.zeros(self.capacity)
+        self._size = 0
+        self._last = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, runs: int, wins: int, money_delta: float, money_m2: float):
+        """Записує контрольну точку (точки понад capacity відкидаються)."""
+        if self._size == self.capacity or self._size and runs <= self._runs[self._size - 1]:
+            return
+        index = self._size
+        self._runs[index] = runs
+        self._wins[index] = wins
+        self._money_delta[index] = money_delta
+        self._money_m2[index] = money_m2
+        self._size += 1
+
+    def set_last(self, runs: int, wins: int, money_delta: float, money_m2: float):
+        """Поточний стан запуску (остання точка лінії)."""
+        self._last = (runs, wins, money_delta, money_m2)
+
+    def _columns(self) -> tuple:
+        runs = self._runs[:self._size]
+        wins = self._wins[:self._size]
+        money_delta = self._money_delta[:self._size]
+        money_m2 = self._money_m2[:self._size]
+        if self._last is not None and self._last[0] > 0 and (self._size == 0 or runs[-1] != self._last[0]):
+            runs, wins, money_delta, money_m2 = (np.append(column, value) for column, value
+                                                 in zip((runs, wins, money_delta, money_m2), self._last))
+        return runs, wins, money_delta, money_m2
+
+    def points(self, confidence: float = 0.95) -> tuple:
+        """
+        (раунди, RTP, нижня межа, верхня межа) - RTP у відсотках і його довірчий інтервал
+        рівня confidence на кожній точці; до 2 раундів межі нескінченні.
+        """
+        runs, wins, money_delta, money_m2 = self._columns()
+        rtp = (money_delta + runs) / runs * 100
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = np.where(runs > 1, money_m2 / (runs - 1), math.inf)
+            half_width = z * np.sqrt(variance / runs) * 100
+        return runs.copy(), rtp, rtp - half_width, rtp + half_width
+
+    def win_rates(self) -> tuple:
+        """(раунди, частка виграшів у відсотках) на кожній точці."""
+        runs, wins, _, _ = self._columns()
+        return runs.copy(), wins / runs * 100
+
+    def to_dict(self, confidence: float = 0.95) -> dict:
+        """Точки як словник для JSON."""
+        runs, rtp, low, high = self.points(confidence)
+        _, win_rate = self.win_rates()
+        return {
+            "confidence": confidence,
+            "runs": runs.tolist(),
+            "rtp": rtp.tolist(),
+            "rtp_low": low.tolist(),
+            "rtp_high": high.tolist(),
+            "win_percentage": win_rate.tolist(),
+        }
+
+
+def format_trace(trace: ConvergenceTrace, confidence: float = 0.95) -> str:
+    """Таблиця збіжності: рядок на контрольну точку."""
+    runs, rtp, low, high = trace.points(confidence)
+    _, win_rate = trace.win_rates()
+    text = f"--- ЗБІЖНІСТЬ (довіра {confidence * 100:g}%) ---\n"
+    for index in range(len(runs)):
+        text += f"  {runs[index]:>14,} раундів: RTP {rtp[index]:8.3f} % " \
+                f"[{low[index]:.3f}; {high[index]:.3f}], виграші {win_rate[index]:.2f} %\n"
+    return text
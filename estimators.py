@@ -0,0 +1,211 @@
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from game_logic import SlotsGame
+from simulation import CHUNK_SIZE, chunk_rng, resolve_seed
+
+#методи оцінки, які приймає estimate_rtp()
+METHODS = ("plain", "importance", "stratified")
+
+
+#оцінка RTP з похибкою
+@dataclass
+class RtpEstimate:
+    """
+    Незміщена оцінка RTP слотів та її стандартна похибка (обидві у відсотках).
+    Різні методи дають ту саму величину, але з різною похибкою на однакову кількість спінів.
+    """
+    method: str
+    rtp: float
+    standard_error: float
+    spins: int
+    seed: int = None
+
+    def half_width(self, confidence: float = 0.99) -> float:
+        """Півширина довірчого інтервалу RTP (у відсоткових пунктах)."""
+        return NormalDist().inv_cdf(0.5 + confidence / 2) * self.standard_error
+
+
+def _merge_moments(left: tuple, right: tuple) -> tuple:
+    """Зливає (кількість, середнє, M2) двох частин вибірки (формула Чана)."""
+    left_count, left_mean, left_m2 = left
+    right_count, right_mean, right_m2 = right
+    count = left_count + right_count
+    if count == 0:
+        return left
+    delta = right_mean - left_mean
+    mean = left_mean + delta * right_count / count
+    m2 = left_m2 + right_m2 + delta * delta * left_count * right_count / count
+    return count, mean, m2
+
+
+def symbol_probabilities(game: SlotsGame) -> np.ndarray:
+    """Ймовірності символів на одному барабані."""
+    weights = np.array(game.WEIGHTS, dtype=float)
+    return weights / weights.sum()
+
+
+def tilted_proposal(game: SlotsGame, defensive: float = 0.1) -> tuple:
+    """
+    Розподіл для вибірки за значущістю - суміш компонент, по одній на символ.
+    Компонента t крутить кожен барабан із вагами, зсунутими до символу t
+    (з ймовірністю 1 - defensive барабан показує t, інакше - звичайний символ),
+    тож трійка t випадає майже завжди. Компоненти обираються пропорційно
+    внеску трійки в RTP (p^3 * повернення), тобто з нахилом до дорогих символів,
+    і джекпот "7️⃣ 7️⃣ 7️⃣" перестає бути рідкісною подією.
+    Домішка звичайних ваг (defensive > 0) лишає будь-який результат можливим,
+    тому перезважена оцінка незміщена.
+    Повертає (ймовірності компонент, матриця [компонента, символ]).
+    """
+    probabilities = symbol_probabilities(game)
+    returns = np.maximum(np.array(game.PAYOUTS, dtype=float) + 1, 0)  #повернення = виграш + ставка
+    mixture = probabilities ** 3 * returns
+    if mixture.sum() > 0:
+        mixture = mixture / mixture.sum()
+    else:
+        mixture = probabilities
+    components = defensive * probabilities + (1 - defensive) * np.eye(len(probabilities))
+    return mixture, components
+
+
+def _draw_from_components(rng: np.random.Generator, targets: np.ndarray, reels: int,
+                          probabilities: np.ndarray, defensive: float) -> np.ndarray:
+    """Барабани, розіграні з компонент targets (по одній на спін) суміші tilted_proposal."""
+    ordinary = rng.choice(len(probabilities), size=(len(targets), reels), p=probabilities)
+    shifted = rng.random((len(targets), reels)) >= defensive
+    return np.where(shifted, targets[:, None], ordinary).astype(np.int16)
+
+
+def _sample_moments(seed: int, first_chunk: int, spins: int, draw) -> tuple:
+    """
+    (кількість, середнє, M2) повернень spins спінів, пакетами по CHUNK_SIZE;
+    draw(rng, size) повертає масив перезважених повернень одного пакета.
+    """
+    moments = (0, 0.0, 0.0)
+    for index, start in enumerate(range(0, spins, CHUNK_SIZE)):
+        size = min(CHUNK_SIZE, spins - start)
+        values = draw(chunk_rng(seed, first_chunk + index), size)
+        mean = float(values.mean())
+        moments = _merge_moments(moments, (size, mean, float(np.square(values - mean).sum())))
+    return moments
+
+
+def _check_spins(spins: int):
+    """Похибка рахується з вибіркової дисперсії, а їй потрібно щонайменше два спіни."""
+    if spins < 2:
+        raise ValueError(f"Для оцінки з похибкою потрібно щонайменше 2 спіни, отримано {spins}")
+
+
+def _standard_error(moments: tuple) -> float:
+    count, _, m2 = moments
+    return math.sqrt(m2 / (count - 1) / count)
+
+
+def plain_estimate(game: SlotsGame, spins: int, seed: int = None) -> RtpEstimate:
+    """Звичайна оцінка Монте-Карло (точка відліку для порівняння)."""
+    _check_spins(spins)
+    seed = resolve_seed(game, seed)
+    moments = _sample_moments(seed, 0, spins,
+                              lambda rng, size: game.play_many(size, rng).money_deltas + 1)
+    return RtpEstimate("plain", moments[1] * 100, _standard_error(moments) * 100, spins, seed)
+
+
+def importance_estimate(game: SlotsGame, spins: int, defensive: float = 0.1,
+                        seed: int = None) -> RtpEstimate:
+    """
+    Вибірка за значущістю: барабани крутяться із сумішшю tilted_proposal(),
+    а кожен спін перезважується відношенням p(спін) / суміш(спін).
+    """
+    _check_spins(spins)
+    seed = resolve_seed(game, seed)
+    probabilities = symbol_probabilities(game)
+    mixture, components = tilted_proposal(game, defensive)
+
+    def draw(rng, size):
+        targets = rng.choice(len(mixture), size=size, p=mixture)
+        reels = _draw_from_components(rng, targets, 3, probabilities, defensive)
+        #щільність суміші: сума по компонентах добутків по барабанах
+        proposal_density = mixture @ components[:, reels].prod(axis=2)
+        weights = probabilities[reels].prod(axis=1) / proposal_density
+        return (game.score_reels(reels).money_deltas + 1) * weights
+
+    moments = _sample_moments(seed, 0, spins, draw)
+    return RtpEstimate("importance", moments[1] * 100, _standard_error(moments) * 100, spins, seed)
+
+
+def stratified_estimate(game: SlotsGame, spins: int, defensive: float = 0.1,
+                        seed: int = None, pilot_fraction: float = 0.1) -> RtpEstimate:
+    """
+    Стратифікація за символом першого барабана: у страті s перший барабан
+    зафіксовано, а два інші крутяться з компонентою s суміші tilted_proposal()
+    і перезважуються. Ймовірність кожної страти відома точно, тож оцінка -
+    зважена сума середніх по стратах.
+    Спіни розподіляються між стратами за Нейманом (пропорційно p * σ страти),
+    σ оцінюється пілотною вибіркою; пілот в оцінку не входить, щоб вона лишалась незміщеною.
+    """
+    _check_spins(spins)
+    seed = resolve_seed(game, seed)
+    probabilities = symbol_probabilities(game)
+    _, components = tilted_proposal(game, defensive)
+    strata = len(probabilities)
+
+    def stratum_draw(stratum):
+        ratio = probabilities / components[stratum]
+
+        def draw(rng, size):
+            drawn = _draw_from_components(rng, np.full(size, stratum), 2, probabilities, defensive)
+            reels = np.column_stack([np.full(size, stratum, dtype=np.int16), drawn])
+            weights = ratio[drawn].prod(axis=1)
+            return (game.score_reels(reels).money_deltas + 1) * weights
+        return draw
+
+    #потоки: пілот страти s - пакети з номера s * stride, основна вибірка - з (strata + s) * stride
+    stride = 2 ** 20
+    pilot_spins = max(2, int(spins * pilot_fraction) // strata)
+    pilot_std = np.empty(strata)
+    for stratum in range(strata):
+        count, _, m2 = _sample_moments(seed, stratum * stride, pilot_spins, stratum_draw(stratum))
+        pilot_std[stratum] = math.sqrt(m2 / (count - 1))
+
+    main_spins = max(spins - pilot_spins * strata, 2 * strata)
+    shares = probabilities * pilot_std
+    shares = shares / shares.sum() if shares.sum() > 0 else probabilities
+    allocation = np.maximum(np.floor(shares * main_spins).astype(int), 2)
+
+    rtp = 0.0
+    variance = 0.0
+    for stratum in range(strata):
+        moments = _sample_moments(seed, (strata + stratum) * stride, int(allocation[stratum]),
+                                  stratum_draw(stratum))
+        rtp += probabilities[stratum] * moments[1]
+        variance += (probabilities[stratum] * _standard_error(moments)) ** 2
+
+    total_spins = pilot_spins * strata + int(allocation.sum())
+    return RtpEstimate("stratified", rtp * 100, math.sqrt(variance) * 100, total_spins, seed)
+
+
+def estimate_rtp(game: SlotsGame, spins: int, method: str = "stratified",
+                 seed: int = None) -> RtpEstimate:
+    """Оцінює RTP слотів обраним методом (див. METHODS)."""
+    if method == "plain":
+        return plain_estimate(game, spins, seed)
+    if method == "importance":
+        return importance_estimate(game, spins, seed=seed)
+    if method == "stratified":
+        return stratified_estimate(game, spins, seed=seed)
+    raise ValueError(f"Невідомий метод оцінки: {method}")
+
+
+def format_estimate(game: SlotsGame, estimate: RtpEstimate, confidence: float = 0.99) -> str:
+    """Текстовий звіт про оцінку RTP."""
+    text = f"--- Оцінка RTP гри '{game.get_game_name()}' " \
+           f"(метод: {estimate.method}, {estimate.spins} спінів) ---\n"
+    text += f"RTP: {estimate.rtp:.3f}% ± {estimate.half_width(confidence):.3f}% " \
+            f"(довіра {confidence * 100:g}%)\n"
+    text += f"Стандартна похибка: {estimate.standard_error:.4f}%\n"
+    if estimate.seed is not None:
+        text += f"Seed: {estimate.seed}\n"
+    return text
@@ -1,18 +1,141 @@
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from fractions import Fraction
+from itertools import accumulate
+from typing import Callable
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from profiling import phase
+
 #контейнер для результатів
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GameResult:
-    """Простий клас для зберігання результату одного раунду."""
-    primary_value: any
+    """
+    Простий клас для зберігання результату одного раунду.
+    Незмінний і без __dict__ (slots), тож займає мінімум пам'яті.
+    outcome - цілий код результату; значення для показу (primary_value)
+    будується декодером гри лише тоді, коли його справді читають.
+    """
+    outcome: int
     is_win: bool
     money_delta: float
+    decoder: Callable[[int], object] = field(default=None, repr=False, compare=False)
+
+    @property
+    def primary_value(self):
+        """Значення результату для UI (напр. "🍒 BAR 🍋" для Слотів)."""
+        if self.decoder is None:
+            return self.outcome
+        return self.decoder(self.outcome)
+
+#колонковий контейнер для багатьох раундів
+@dataclass(eq=False)
+class ResultBatch:
+    """
+    Результати багатьох раундів у вигляді щільних масивів (колонок),
+    замість n окремих об'єктів GameResult: кілька байтів на раунд.
+    Поводиться як послідовність GameResult (len, індекс, ітерація).
+    """
+    outcomes: np.ndarray      #коди результатів (сума костей, номер патрона...)
+    wins: np.ndarray          #маска виграшів (bool)
+    money_deltas: np.ndarray  #зміна балансу за кожен раунд
+    decoder: Callable[[int], object] = field(default=None, repr=False)
+
+    @classmethod
+    def from_results(cls, results: list, decoder=None) -> "ResultBatch":
+        """Пакує список GameResult у колонки."""
+        return cls(
+            outcomes=np.array([r.outcome for r in results], dtype=np.int64),
+            wins=np.array([r.is_win for r in results], dtype=bool),
+            money_deltas=np.array([r.money_delta for r in results], dtype=np.float64),
+            decoder=decoder
+        )
+
+    @classmethod
+    def concatenate(cls, batches: list) -> "ResultBatch":
+        """Склеює кілька пакетів однієї гри в один."""
+        return cls(
+            outcomes=np.concatenate([b.outcomes for b in batches]),
+            wins=np.concatenate([b.wins for b in batches]),
+            money_deltas=np.concatenate([b.money_deltas for b in batches]),
+            decoder=batches[0].decoder if batches else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResultBatch(self.outcomes[index], self.wins[index],
+                               self.money_deltas[index], self.decoder)
+        return GameResult(
+            outcome=int(self.outcomes[index]),
+            is_win=bool(self.wins[index]),
+            money_delta=float(self.money_deltas[index]),
+            decoder=self.decoder
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def nbytes(self) -> int:
+        """Скільки байтів займають колонки."""
+        return self.outcomes.nbytes + self.wins.nbytes + self.money_deltas.nbytes
+
+    def total_wins(self) -> int:
+        return int(np.count_nonzero(self.wins))
+
+    def total_money_delta(self) -> float:
+        return float(self.money_deltas.sum())
+
+#ставка гравця в раунді
+@dataclass(frozen=True)
+class Wager:
+    """
+    Одна ставка з "меню" ставок раунду (див. IGame.play_wagers()).
+    bet - тип ставки гри ("main" - власне правило гри, є в усіх іграх),
+    value - параметр ставки (напр. сума для "sum" у Костях), stake - розмір ставки.
+    """
+    bet: str = "main"
+    value: object = None
+    stake: float = 1.0
+
+    def __str__(self) -> str:
+        text = self.bet if self.value is None else f"{self.bet}:{self.value}"
+        return text if self.stake == 1 else f"{text} x{self.stake:g}"
 
 #"контракт" IGame
 class IGame(ABC):
-    """Абстрактний інтерфейс для всіх ігор казино."""
+    """
+    Абстрактний інтерфейс для всіх ігор казино.
+    Кожна гра має власні генератори випадкових чисел:
+    py_rng (random.Random) для play_once() і np_rng (numpy Generator) для play_many().
+    """
+
+    def __init__(self, rng=None, seed: int = None):
+        """
+        rng - готовий генератор (random.Random або numpy Generator),
+        seed - зерно, з якого створюються обидва генератори, якщо rng не задано.
+        Другий генератор виводиться з переданого, тож гра лишається відтворюваною.
+        """
+        if seed is not None and seed < 0:
+            raise ValueError(f"seed має бути невід'ємним цілим, отримано {seed}")
+        self.seed = seed
+        if rng is None:
+            self.py_rng = random.Random(seed)
+            self.np_rng = np.random.default_rng(seed)
+        elif isinstance(rng, np.random.Generator):
+            self.np_rng = rng
+            self.py_rng = random.Random(int(rng.integers(2 ** 63)))
+        elif isinstance(rng, random.Random):
+            self.py_rng = rng
+            self.np_rng = np.random.default_rng(rng.getrandbits(128))
+        else:
+            raise TypeError("rng має бути random.Random або numpy.random.Generator")
 
     @abstractmethod
     def play_once(self) -> GameResult:
@@ -24,16 +147,90 @@ class IGame(ABC):
         """Повертає назву гри для UI."""
         pass
 
+    def play_many(self, n: int, rng: np.random.Generator = None) -> ResultBatch:
+        """
+        Запускає n раундів за один виклик.
+        rng - окремий генератор для цього пакета (за замовчуванням np_rng гри).
+        Базова версія просто викликає play_once() у циклі,
+        ігри з NumPy-реалізацією перевизначають цей метод.
+        Якщо rng передано, play_once() на час пакета отримує py_rng, виведений з rng,
+        інакше пакети в різних процесах повторювали б той самий потік гри.
+        """
+        if rng is None:
+            with phase("play_once"):
+                results = [self.play_once() for _ in range(n)]
+        else:
+            game_rng = self.py_rng
+            self.py_rng = random.Random(int(rng.integers(2 ** 63)))
+            try:
+                with phase("play_once"):
+                    results = [self.play_once() for _ in range(n)]
+            finally:
+                self.py_rng = game_rng
+        with phase("pack"):
+            return ResultBatch.from_results(results, self.decode_outcome)
+
+    def play_wagers(self, n: int, wagers: list, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Розігрує n раундів і розраховує кожну ставку з wagers (список Wager)
+        на тому самому розіграші. Повертає матрицю змін балансу (n x len(wagers)).
+        Ставки "main" працюють у будь-якій грі; інші типи ставок гра описує,
+        перевизначивши draw_wager_codes() і wager_payouts().
+        """
+        stakes = np.array([wager.stake for wager in wagers], dtype=np.float64)
+        if all(wager.bet == "main" for wager in wagers):
+            return np.outer(self.play_many(n, rng).money_deltas, stakes)
+        with phase("draw"):
+            codes = self.draw_wager_codes(n, rng)
+        with phase("score"):
+            #таблиця виплат: код розіграшу x ставка, тож уся матриця - одна вибірка рядків
+            table = np.column_stack([self.wager_payouts(wager) for wager in wagers]) * stakes
+            return table[codes]
+
+    def draw_wager_codes(self, n: int, rng: np.random.Generator = None) -> np.ndarray:
+        """Коди n розіграшів, за якими wager_payouts() розраховує ставки."""
+        raise ValueError(f"{type(self).__name__} приймає лише ставки 'main'")
+
+    def wager_payouts(self, wager: Wager) -> np.ndarray:
+        """Виграш на 1 монету ставки (-1 - програш) для кожного коду з draw_wager_codes()."""
+        raise ValueError(f"{type(self).__name__} приймає лише ставки 'main'")
+
+    def decode_outcome(self, code):
+        """Перетворює код результату з ResultBatch на значення для UI."""
+        return code
+
+    def get_config(self) -> dict:
+        """
+        Параметри гри, з якими її можна створити знову: type(game)(**game.get_config()).
+        Генератори і seed сюди не входять.
+        """
+        return {}
+
+    def outcome_space(self) -> list:
+        """
+        Перелічує всі можливі результати раунду як кортежі
+        (код результату, точна ймовірність Fraction, is_win, money_delta).
+        Гра, для якої повний перелік неможливий, цей метод не перевизначає.
+        """
+        raise NotImplementedError(f"{type(self).__name__} не має точної моделі")
+
 #гра "Кості"
 class DiceGame(IGame):
-    """Реалізація гри в Кості. Правило: дубль = перемога."""
+    """
+    Реалізація гри в Кості. Правило: дубль = перемога.
+    Додаткові ставки для play_wagers(): "double" (будь-який дубль, 4:1),
+    "sum" з value 2-12 (точна сума, виплата з SUM_PAYOUTS),
+    "over" / "under" (сума більша / менша за 7, 1:1; 7 програє).
+    """
+    #виплати ставок на точну суму (за зразком разових ставок крепсу)
+    SUM_PAYOUTS = {2: 30, 3: 15, 4: 10, 5: 7, 6: 5, 7: 4, 8: 5, 9: 7, 10: 10, 11: 15, 12: 30}
 
     def get_game_name(self) -> str:
         return "Гра в Кості"
 
     def play_once(self) -> GameResult:
-        dice1 = random.randint(1, 6)
-        dice2 = random.randint(1, 6)
+        dice1 = self.py_rng.randint(1, 6)
+        dice2 = self.py_rng.randint(1, 6)
         is_win = (dice1 == dice2)
 
         if is_win:
@@ -42,50 +239,179 @@ class DiceGame(IGame):
             money_delta = -1.0
 
         return GameResult(
-            primary_value=(dice1 + dice2),
+            outcome=(dice1 + dice2),
             is_win=is_win,
             money_delta=money_delta
         )
 
+    def play_many(self, n: int, rng: np.random.Generator = None) -> ResultBatch:
+        if rng is None:
+            rng = self.np_rng
+        with phase("draw"):
+            dice = rng.integers(1, 7, size=(n, 2), dtype=np.int8)
+        with phase("score"):
+            wins = dice[:, 0] == dice[:, 1]
+            return ResultBatch(
+                outcomes=dice[:, 0] + dice[:, 1],
+                wins=wins,
+                money_deltas=np.where(wins, 4.0, -1.0)
+            )
+
+    def draw_wager_codes(self, n: int, rng: np.random.Generator = None) -> np.ndarray:
+        """Обидві кості (а не лише сума): код (кість1 - 1) * 6 + (кість2 - 1)."""
+        if rng is None:
+            rng = self.np_rng
+        dice = rng.integers(1, 7, size=(n, 2), dtype=np.int8)
+        return (dice[:, 0] - 1) * 6 + (dice[:, 1] - 1)
+
+    def wager_payouts(self, wager: Wager) -> np.ndarray:
+        first, second = np.divmod(np.arange(36), 6)
+        total = first + second + 2
+        if wager.bet in ("main", "double"):
+            wins, payout = first == second, 4.0
+        elif wager.bet == "sum":
+            if not isinstance(wager.value, int) or wager.value not in self.SUM_PAYOUTS:
+                raise ValueError(f"Ставка 'sum' потребує суми 2-12, а не {wager.value!r}")
+            wins, payout = total == wager.value, float(self.SUM_PAYOUTS[wager.value])
+        elif wager.bet == "over":
+            wins, payout = total > 7, 1.0
+        elif wager.bet == "under":
+            wins, payout = total < 7, 1.0
+        else:
+            raise ValueError(f"Невідома ставка в Костях: '{wager.bet}'")
+        return np.where(wins, payout, -1.0)
+
+    def outcome_space(self) -> list:
+        outcomes = []
+        for dice1 in range(1, 7):
+            for dice2 in range(1, 7):
+                is_win = (dice1 == dice2)
+                outcomes.append((dice1 + dice2, Fraction(1, 36), is_win, 4.0 if is_win else -1.0))
+        return outcomes
+
 #гра "Слоти" (Визначена нагорі, а не в __main__)
 class SlotsGame(IGame):
     """
     Реалізація гри в Слоти.
     Використовує "зважені" ймовірності.
+    Таблиця виплат і ваги можуть бути власними (передаються в конструктор),
+    усі таблиці для розіграшу рахуються один раз при створенні гри.
     """
     SYMBOLS = ["🍒", "🍋", "🍊", "BAR", "🔔", "7️⃣"]
     WEIGHTS = [25, 20, 15, 15, 10, 5]  # Разом 90
+    PAYOUTS = [5.0, 10.0, 15.0, 25.0, 50.0, 100.0]  #виграш за три однакові символи
+
+    def __init__(self, symbols: list = None, weights: list = None, payouts: list = None,
+                 rng=None, seed: int = None):
+        super().__init__(rng, seed)
+        self.SYMBOLS = list(symbols if symbols is not None else SlotsGame.SYMBOLS)
+        self.WEIGHTS = list(weights if weights is not None else SlotsGame.WEIGHTS)
+        self.PAYOUTS = [float(p) for p in (payouts if payouts is not None else SlotsGame.PAYOUTS)]
+        if not len(self.SYMBOLS) == len(self.WEIGHTS) == len(self.PAYOUTS):
+            raise ValueError("SYMBOLS, WEIGHTS і PAYOUTS мають бути однакової довжини")
+        if any(weight < 0 for weight in self.WEIGHTS) or not sum(self.WEIGHTS) > 0:
+            raise ValueError("WEIGHTS мають бути невід'ємними, а їх сума - додатною")
+
+        count = len(self.SYMBOLS)
+
+        #один зв'язаний метод на гру, а не новий об'єкт на кожен раунд
+        self._decoder = self.decode_outcome
+
+        #символи на барабанах - це цілі індекси, рядки потрібні лише для показу
+        self._symbol_codes = list(range(count))
+        self._cum_weights = list(accumulate(self.WEIGHTS))
+
+        #код результату: індекси символів трьох барабанів, "склеєні" в одне число;
+        #для кожного коду заздалегідь відомо, чи це виграш і скільки він платить
+        self._win_by_code = [False] * count ** 3
+        self._delta_by_code = [-1.0] * count ** 3  # Ставка = -1 монета
+        for symbol in range(count):
+            code = (symbol * count + symbol) * count + symbol
+            self._win_by_code[code] = True
+            self._delta_by_code[code] = self.PAYOUTS[symbol]
+
+        self._win_table = np.array(self._win_by_code)
+        self._delta_table = np.array(self._delta_by_code)
+
+        #таблиця "квитків": кожен символ повторено стільки разів, яка його вага,
+        #тож випадковий індекс у ній одразу дає зважений символ (лише для цілих ваг)
+        if all(float(w).is_integer() for w in self.WEIGHTS) and sum(self.WEIGHTS) <= 2 ** 16:
+            self._symbol_by_ticket = np.repeat(
+                np.arange(count, dtype=np.int16), [int(w) for w in self.WEIGHTS]
+            )
+        else:
+            self._symbol_by_ticket = None
+            self._cum_probabilities = np.array(self._cum_weights) / self._cum_weights[-1]
 
     def get_game_name(self) -> str:
         return "Слот-машина"
 
+    def get_config(self) -> dict:
+        return {"symbols": list(self.SYMBOLS), "weights": list(self.WEIGHTS),
+                "payouts": list(self.PAYOUTS)}
+
     def play_once(self) -> GameResult:
-        reels = random.choices(self.SYMBOLS, self.WEIGHTS, k=3)
-        is_win = False
-        money_delta = -1.0  # Ставка = -1 монета
-
-        if reels[0] == reels[1] and reels[1] == reels[2]:
-            is_win = True
-            symbol = reels[0]
-            if symbol == "🍒":
-                money_delta = 5.0
-            elif symbol == "🍋":
-                money_delta = 10.0
-            elif symbol == "🍊":
-                money_delta = 15.0
-            elif symbol == "BAR":
-                money_delta = 25.0
-            elif symbol == "🔔":
-                money_delta = 50.0
-            elif symbol == "7️⃣":
-                money_delta = 100.0
+        first, second, third = self.py_rng.choices(
+            self._symbol_codes, cum_weights=self._cum_weights, k=3
+        )
+        count = len(self._symbol_codes)
+        code = (first * count + second) * count + third
 
         return GameResult(
-            primary_value=" ".join(reels),
-            is_win=is_win,
-            money_delta=money_delta
+            outcome=code,
+            is_win=self._win_by_code[code],
+            money_delta=self._delta_by_code[code],
+            decoder=self._decoder
         )
 
+    def play_many(self, n: int, rng: np.random.Generator = None) -> ResultBatch:
+        if rng is None:
+            rng = self.np_rng
+        count = len(self._symbol_codes)
+        with phase("draw"):
+            if self._symbol_by_ticket is not None:
+                tickets = rng.integers(0, len(self._symbol_by_ticket), size=(n, 3), dtype=np.uint16)
+                reels = self._symbol_by_ticket[tickets]
+            else:
+                reels = np.searchsorted(self._cum_probabilities, rng.random((n, 3)), side="right")
+                reels = np.minimum(reels, count - 1).astype(np.int16)
+        with phase("score"):
+            return self.score_reels(reels)
+
+    def score_reels(self, reels: np.ndarray) -> ResultBatch:
+        """
+        Результати для вже розіграних барабанів: reels - масив (n, 3) індексів символів.
+        Дає змогу розігрувати барабани іншим розподілом (див. estimators.py).
+        """
+        count = len(self._symbol_codes)
+        codes = (reels[:, 0] * count + reels[:, 1]) * count + reels[:, 2]
+        return ResultBatch(
+            outcomes=codes,
+            wins=self._win_table[codes],
+            money_deltas=self._delta_table[codes],
+            decoder=self._decoder
+        )
+
+    def outcome_space(self) -> list:
+        count = len(self.SYMBOLS)
+        total = Fraction(sum(self.WEIGHTS)) ** 3
+        outcomes = []
+        for first in range(count):
+            for second in range(count):
+                for third in range(count):
+                    weight = (Fraction(self.WEIGHTS[first]) * Fraction(self.WEIGHTS[second])
+                              * Fraction(self.WEIGHTS[third]))
+                    code = (first * count + second) * count + third
+                    outcomes.append((code, weight / total, self._win_by_code[code], self._delta_by_code[code]))
+        return outcomes
+
+    def decode_outcome(self, code) -> str:
+        """Відновлює рядок "🍒 BAR 🍋" з коду результату."""
+        count = len(self.SYMBOLS)
+        code = int(code)
+        reels = [code // (count * count), code // count % count, code % count]
+        return " ".join(self.SYMBOLS[i] for i in reels)
+
 class PistolRouletteGame(IGame):
     """
     Реалізація гри "Рулетка з пістолетом".
@@ -97,7 +423,7 @@ class PistolRouletteGame(IGame):
 
     def play_once(self) -> GameResult:
         #симулюємо "прокрутку барабана" (1 з 6 шансів)
-        trigger_pull = random.randint(1, 6)
+        trigger_pull = self.py_rng.randint(1, 6)
 
         #правила: "Виграш" - якщо подія не сталася (випало не 1)
         #"програш" - якщо подія сталася (випало 1)
@@ -111,11 +437,30 @@ class PistolRouletteGame(IGame):
 
         #повертаємо результат
         return GameResult(
-            primary_value=trigger_pull,
+            outcome=trigger_pull,
             is_win=is_win,
             money_delta=money_delta
         )
 
+    def play_many(self, n: int, rng: np.random.Generator = None) -> ResultBatch:
+        if rng is None:
+            rng = self.np_rng
+        with phase("draw"):
+            trigger_pulls = rng.integers(1, 7, size=n, dtype=np.int8)
+        with phase("score"):
+            wins = trigger_pulls != 1
+            return ResultBatch(
+                outcomes=trigger_pulls,
+                wins=wins,
+                money_deltas=np.where(wins, 1.0, -5.0)
+            )
+
+    def outcome_space(self) -> list:
+        return [
+            (trigger_pull, Fraction(1, 6), trigger_pull != 1, 1.0 if trigger_pull != 1 else -5.0)
+            for trigger_pull in range(1, 7)
+        ]
+
 # --- Блок для тестування---
 if __name__ == "__main__":
     print("Тестування логіки DiceGame...")
@@ -158,6 +503,10 @@ if __name__ == "__main__":
     print(f"Баланс: {slot_balance}")
     print(f"RTP (Return To Player): {rtp:.2f}%")
 
+    #те саме число точно, без симуляції
+    from analysis import analyze
+    print(f"Точний RTP: {analyze(slot_game).rtp:.4f}%")
+
     print("\n" + "=" * 30 + "\n")
     print("Тестування логіки PistolRouletteGame...")
 
@@ -178,4 +527,5 @@ if __name__ == "__main__":
     print(f"Виграшів (подія не сталася): {pistol_wins}")
     print(f"Баланс: {pistol_balance}")
     #теоретично, баланс має бути близьким до 0, оскільки
-    #(5/6 * 1.0) + (1/6 * -5.0) = 0
\ No newline at end of file
+    #(5/6 * 1.0) + (1/6 * -5.0) = 0
+    print(f"Точне очікування за раунд: {analyze(pistol_game).expected_delta}")
\ No newline at end of file
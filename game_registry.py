@@ -0,0 +1,156 @@
+import importlib
+import json
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+
+from game_logic import IGame
+
+#група entry points, через яку зовнішні пакети додають свої ігри:
+#  [project.entry-points."ovvrabet.games"]
+#  roulette = "my_package.roulette:RouletteGame"
+ENTRY_POINT_GROUP = "ovvrabet.games"
+
+
+#що вміє гра (визначається за класом, без створення об'єкта)
+@dataclass(frozen=True)
+class GameCapabilities:
+    batch: bool     #власний векторизований play_many (інакше - цикл play_once)
+    analytic: bool  #є outcome_space(), тобто точний розрахунок RTP
+
+
+#опис гри в реєстрі
+@dataclass(frozen=True)
+class GameSpec:
+    """
+    Гра в реєстрі: ключ, підпис для UI і шлях "модуль:Клас".
+    Модуль імпортується лише при першому load(), тобто коли гру справді обрали.
+    config - параметри конструктора (так описуються варіанти таблиць виплат).
+    """
+    key: str
+    label: str
+    target: str
+    config: dict = field(default_factory=dict, compare=False)
+
+    def load(self) -> type:
+        """Імпортує модуль гри і повертає її клас."""
+        module_name, _, class_name = self.target.partition(":")
+        game_type = importlib.import_module(module_name)
+        for name in class_name.split("."):
+            game_type = getattr(game_type, name)
+        if not (isinstance(game_type, type) and issubclass(game_type, IGame)):
+            raise TypeError(f"{self.target} не є реалізацією IGame")
+        return game_type
+
+    def create(self, **kwargs) -> IGame:
+        """Створює гру; kwargs (напр. seed) доповнюють config."""
+        return self.load()(**{**self.config, **kwargs})
+
+    def capabilities(self) -> GameCapabilities:
+        game_type = self.load()
+        return GameCapabilities(
+            batch=game_type.play_many is not IGame.play_many,
+            analytic=game_type.outcome_space is not IGame.outcome_space
+        )
+
+
+#реєстр ігор
+class GameRegistry:
+    """
+    Реєстр реалізацій IGame, з якого GUI і CLI будують список ігор.
+    Ігри додаються через register() / register_variant(), з JSON-файлу варіантів
+    (load_variants) або з entry points зовнішніх пакетів (discover).
+    """
+
+    def __init__(self):
+        self._specs = {}
+        self._discovered = False
+
+    def register(self, key: str, label: str, target: str, config: dict = None) -> GameSpec:
+        """Додає гру; target - "модуль:Клас"."""
+        if key in self._specs:
+            raise ValueError(f"Гра '{key}' вже зареєстрована")
+        spec = GameSpec(key, label, target, dict(config or {}))
+        self._specs[key] = spec
+        return spec
+
+    def register_variant(self, key: str, base: str, label: str, **config) -> GameSpec:
+        """Варіант уже зареєстрованої гри з іншими параметрами (напр. таблицею виплат)."""
+        base_spec = self.get(base)
+        return self.register(key, label, base_spec.target, {**base_spec.config, **config})
+
+    def load_variants(self, path: str) -> list:
+        """
+        Реєструє варіанти з JSON-файлу:
+        [{"key": "slots-hot", "base": "slots", "label": "...", "config": {"payouts": [...]}}, ...]
+        """
+        with open(path, encoding="utf-8") as file:
+            variants = json.load(file)
+        return [self.register_variant(v["key"], v["base"], v.get("label", v["key"]), **v.get("config", {}))
+                for v in variants]
+
+    def discover(self, group: str = ENTRY_POINT_GROUP) -> list:
+        """
+        Реєструє ігри з entry points встановлених пакетів (один раз).
+        Модулі при цьому не імпортуються: з entry point береться лише рядок "модуль:Клас".
+        """
+        if self._discovered:
+            return []
+        self._discovered = True
+        added = []
+        for entry_point in entry_points(group=group):
+            if entry_point.name not in self._specs:
+                added.append(self.register(entry_point.name, entry_point.name, entry_point.value))
+        return added
+
+    def get(self, key: str) -> GameSpec:
+        try:
+            return self._specs[key]
+        except KeyError:
+            raise KeyError(f"Невідома гра: '{key}'") from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._specs
+
+    def keys(self) -> list:
+        return list(self._specs)
+
+    def specs(self) -> list:
+        return list(self._specs.values())
+
+    def create(self, key: str, **kwargs) -> IGame:
+        return self.get(key).create(**kwargs)
+
+    def key_for(self, game: IGame) -> str:
+        """
+        Ключ, під яким зареєстрована гра game (за класом і параметрами),
+        або None. З кількох збігів обирається найточніший варіант.
+        """
+        game_type = type(game)
+        target = f"{game_type.__module__}:{game_type.__qualname__}"
+        config = game.get_config()
+        best_key, best_score = None, -1
+        for spec in self._specs.values():
+            if spec.target != target:
+                continue
+            if any(config.get(name) != value for name, value in spec.config.items()):
+                continue
+            if len(spec.config) > best_score:
+                best_key, best_score = spec.key, len(spec.config)
+        return best_key
+
+
+def default_registry() -> GameRegistry:
+    """Реєстр із вбудованими іграми і тими, що знайдено через entry points."""
+    registry = GameRegistry()
+    registry.register("dice", "Кості", "game_logic:DiceGame")
+    registry.register("slots", "Слоти", "game_logic:SlotsGame")
+    registry.register("pistol", "Рулетка з пістолетом", "game_logic:PistolRouletteGame")
+    registry.register("roulette", "Європейська рулетка", "table_games:RouletteGame")
+    registry.register("baccarat", "Баккара", "table_games:BaccaratGame")
+    registry.register("blackjack", "Блекджек", "table_games:BlackjackGame")
+    registry.discover()
+    return registry
+
+
+#спільний реєстр програми (GUI, CLI, бенчмарк)
+REGISTRY = default_registry()
@@ -1,21 +1,38 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import scrolledtext
+from tkinter import messagebox
+from tkinter import filedialog
 import threading
+import queue
+import os
+import contextlib
 from ttkthemes import ThemedTk
 import time
-from game_logic import DiceGame, SlotsGame, PistolRouletteGame, IGame, GameResult
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from collections import Counter
+from game_logic import IGame, GameResult
+from game_registry import REGISTRY
+from simulation import run_simulation, run_until_precision, format_summary
+from charts import ResultsChart, RtpTrace
+from convergence import ConvergenceTrace
+from results_store import ResultsStore, StoredRun, RUNS_DIR, diff_runs, format_diff
+from result_cache import SimulationCache, CACHE_DIR, describe_source
+from profiling import Profiler, phase, format_profile
+from scheduler import ChunkScheduler, format_jobs
 
 
 class CasinoApp:
+    #рівень довіри для адаптивного режиму
+    ADAPTIVE_CONFIDENCE = 0.99
+    #скільки ігор ще показуємо радіокнопками; більше (варіанти таблиць виплат) - списком
+    MAX_RADIO_GAMES = 8
+    #куди пишуться знімки cProfile і tracemalloc
+    PROFILES_DIR = "profiles"
+
     def __init__(self, root):
         """Конструктор нашого додатка."""
         self.root = root
         self.root.title("OvvraBet Casino Simulator")
-        self.root.geometry("500x480")  # зробив вікно ще вищим
+        self.root.geometry("500x910")  # зробив вікно ще вищим
 
         self.current_theme = tk.StringVar(value="arc")
 
@@ -27,6 +44,19 @@ class CasinoApp:
         self.file_menu = tk.Menu(self.menubar)
         self.menubar.add_cascade(label="Файл", menu=self.file_menu)
 
+        self.file_menu.add_command(
+            label="Відкрити запуск...",
+            command=self.open_stored_run
+        )
+        self.file_menu.add_command(
+            label="Порівняти запуски...",
+            command=self.compare_stored_runs
+        )
+        self.file_menu.add_command(
+            label="Завантажити варіанти ігор...",
+            command=self.load_game_variants
+        )
+        self.file_menu.add_separator()
         self.file_menu.add_command(
             label="Налаштування...",
             command=self.show_settings_dialog
@@ -34,7 +64,7 @@ class CasinoApp:
         self.file_menu.add_separator()
         self.file_menu.add_command(
             label="Вихід",
-            command=self.root.destroy
+            command=self.on_close
         )
 
         self.help_menu = tk.Menu(self.menubar)
@@ -53,31 +83,16 @@ class CasinoApp:
         game_frame = ttk.LabelFrame(main_frame, text="Виберіть гру")
         game_frame.pack(fill=tk.X, padx=5, pady=5)
 
-        self.selected_game = tk.StringVar(value="dice")
+        #список ігор будується з реєстру: нова гра не потребує змін у GUI
+        self.selected_game = tk.StringVar(value=REGISTRY.specs()[0].key)
+        self.game_choices = None
+        self.build_game_choices(game_frame)
 
-        dice_rb = ttk.Radiobutton(
-            game_frame,
-            text="Кості",
-            variable=self.selected_game,
-            value="dice"
-        )
-        dice_rb.pack(anchor=tk.W, padx=10, pady=2)
-
-        slots_rb = ttk.Radiobutton(
-            game_frame,
-            text="Слоти",
-            variable=self.selected_game,
-            value="slots"
-        )
-        slots_rb.pack(anchor=tk.W, padx=10, pady=2)
-
-        pistol_rb = ttk.Radiobutton(
-            game_frame,
-            text="Рулетка з пістолетом",
-            variable=self.selected_game,
-            value="pistol"
-        )
-        pistol_rb.pack(anchor=tk.W, padx=10, pady=2)
+        #що вміє обрана гра (модуль гри імпортується лише тут, при виборі)
+        self.capabilities_label = ttk.Label(game_frame, text="")
+        self.capabilities_label.pack(anchor=tk.W, padx=10, pady=(0, 2))
+        self.selected_game.trace_add("write", lambda *args: self.show_capabilities())
+        self.show_capabilities()
 
         # --- секція налаштувань (Кількість запусків) ---
         settings_frame = ttk.Frame(main_frame)
@@ -90,6 +105,46 @@ class CasinoApp:
         self.runs_spinbox.set(1000)
         self.runs_spinbox.pack(side=tk.LEFT)
 
+        # --- кількість процесів для симуляції ---
+        workers_frame = ttk.Frame(main_frame)
+        workers_frame.pack(fill=tk.X, padx=5, pady=(0, 10))
+
+        workers_label = ttk.Label(workers_frame, text="Кількість процесів:")
+        workers_label.pack(side=tk.LEFT, padx=5)
+
+        self.workers_spinbox = ttk.Spinbox(workers_frame, from_=1, to=64)
+        self.workers_spinbox.set(os.cpu_count() or 1)
+        self.workers_spinbox.pack(side=tk.LEFT)
+
+        # --- seed для відтворення запуску (порожнє поле = випадковий) ---
+        seed_frame = ttk.Frame(main_frame)
+        seed_frame.pack(fill=tk.X, padx=5, pady=(0, 10))
+
+        seed_label = ttk.Label(seed_frame, text="Seed (порожньо = випадковий):")
+        seed_label.pack(side=tk.LEFT, padx=5)
+
+        self.seed_entry = ttk.Entry(seed_frame)
+        self.seed_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        # --- адаптивний режим: грати, доки RTP не відомий із заданою точністю ---
+        precision_frame = ttk.Frame(main_frame)
+        precision_frame.pack(fill=tk.X, padx=5, pady=(0, 10))
+
+        self.adaptive_mode = tk.BooleanVar(value=False)
+        adaptive_cb = ttk.Checkbutton(
+            precision_frame,
+            text="До точності RTP ± (%):",
+            variable=self.adaptive_mode
+        )
+        adaptive_cb.pack(side=tk.LEFT, padx=5)
+
+        self.precision_entry = ttk.Entry(precision_frame, width=8)
+        self.precision_entry.insert(0, "0.05")
+        self.precision_entry.pack(side=tk.LEFT)
+
+        precision_label = ttk.Label(precision_frame, text="довіра 99%")
+        precision_label.pack(side=tk.LEFT, padx=5)
+
         # --- кнопка "Старт" ---
         self.start_button = ttk.Button(
             main_frame,
@@ -98,6 +153,47 @@ class CasinoApp:
         )
         self.start_button.pack(fill=tk.X, padx=5, pady=5)
 
+        # --- кнопка "Скасувати" (зупиняє симуляцію після поточного пакета) ---
+        self.cancel_button = ttk.Button(
+            main_frame,
+            text="Скасувати",
+            command=self.cancel_simulation
+        )
+        self.cancel_button.pack(fill=tk.X, padx=5, pady=5)
+        self.cancel_button.config(state=tk.DISABLED)
+
+        # --- черга: кілька симуляцій одночасно, пакети чергуються між ними ---
+        queue_frame = ttk.LabelFrame(main_frame, text="Черга симуляцій")
+        queue_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        queue_button = ttk.Button(
+            queue_frame,
+            text="Додати в чергу",
+            command=self.queue_simulation
+        )
+        queue_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        priority_label = ttk.Label(queue_frame, text="Пріоритет:")
+        priority_label.pack(side=tk.LEFT, padx=(10, 5))
+
+        self.priority_spinbox = ttk.Spinbox(queue_frame, from_=1, to=10, width=4)
+        self.priority_spinbox.set(1)
+        self.priority_spinbox.pack(side=tk.LEFT)
+
+        self.cancel_queue_button = ttk.Button(
+            queue_frame,
+            text="Скасувати чергу",
+            command=self.cancel_queue
+        )
+        self.cancel_queue_button.pack(side=tk.RIGHT, padx=5, pady=5)
+
+        # --- прогрес симуляції ---
+        self.progress_bar = ttk.Progressbar(main_frame, maximum=1.0)
+        self.progress_bar.pack(fill=tk.X, padx=5, pady=5)
+
+        self.progress_label = ttk.Label(main_frame, text="")
+        self.progress_label.pack(anchor=tk.W, padx=5)
+
         self.show_chart_button = ttk.Button(
             main_frame,
             text="Показати графік",
@@ -106,6 +202,50 @@ class CasinoApp:
         self.show_chart_button.pack(fill=tk.X, padx=5, pady=5)
         self.show_chart_button.config(state=tk.DISABLED)
 
+        #живий графік: вікно "Графік" відкривається на старті і оновлюється після кожного пакета
+        self.live_chart = tk.BooleanVar(value=False)
+        live_chart_cb = ttk.Checkbutton(
+            main_frame,
+            text="Живий графік під час симуляції",
+            variable=self.live_chart
+        )
+        live_chart_cb.pack(anchor=tk.W, padx=5)
+
+        #збіжність RTP на контрольних точках 10, 20, 50, ... раундів (смуга інтервалу на графіку)
+        self.trace_convergence = tk.BooleanVar(value=True)
+        trace_convergence_cb = ttk.Checkbutton(
+            main_frame,
+            text="Збіжність RTP на графіку (10, 20, 50, ... раундів)",
+            variable=self.trace_convergence
+        )
+        trace_convergence_cb.pack(anchor=tk.W, padx=5)
+
+        #збереження всіх раундів запуску у runs/ (файл .run, читається через memmap)
+        self.save_runs = tk.BooleanVar(value=False)
+        save_runs_cb = ttk.Checkbutton(
+            main_frame,
+            text=f"Зберігати запуски у теку {RUNS_DIR}/",
+            variable=self.save_runs
+        )
+        save_runs_cb.pack(anchor=tk.W, padx=5)
+
+        #профілювання: час фаз, раунди/с і пік пам'яті дописуються в лог після результату
+        self.profile_run = tk.BooleanVar(value=False)
+        profile_run_cb = ttk.Checkbutton(
+            main_frame,
+            text="Профілювати запуск",
+            variable=self.profile_run
+        )
+        profile_run_cb.pack(anchor=tk.W, padx=5)
+
+        self.profile_dump = tk.BooleanVar(value=False)
+        profile_dump_cb = ttk.Checkbutton(
+            main_frame,
+            text=f"...і зберегти знімки cProfile/tracemalloc у {self.PROFILES_DIR}/",
+            variable=self.profile_dump
+        )
+        profile_dump_cb.pack(anchor=tk.W, padx=20)
+
         #--- поле для результатів (Лог) ---
         self.log_browser = scrolledtext.ScrolledText(
             main_frame,
@@ -114,12 +254,35 @@ class CasinoApp:
         )
         self.log_browser.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        #змінна для зберігання результату з потоку
-        self.simulation_result = None
+        #черга повідомлень від фонового потоку (прогрес і фінальний результат)
+        self.simulation_queue = queue.Queue()
+        self.cancel_event = threading.Event()
 
         #змінні для графіка
         self.last_run_data = None
         self.last_game_type = None
+        self.last_game = None
+        self.last_total_runs = 0
+        self.rtp_trace = RtpTrace()
+        self.convergence_trace = None  #ConvergenceTrace останнього запуску, якщо її записували
+        self.run_counter = 0  #номер запуску: за ним графік знає, чи можна взяти кешовану фігуру
+
+        self.results_store = ResultsStore()
+        #запуски з seed не рахуються вдруге: повтор береться з кешу, довший - дораховується
+        self.simulation_cache = SimulationCache(directory=CACHE_DIR)
+
+        #вікно "Графік" не знищується при закритті, а ховається разом із фігурою
+        self.chart_window = None
+        self.chart_frame = None
+        self.chart = None
+
+        #планувальник черги створюється при першому "Додати в чергу"
+        self.scheduler = None
+        self.queue_polling = False
+        #id завдання -> текст його підсумку (форматується один раз, при завершенні)
+        self.job_reports = {}
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def show_about_dialog(self):
         """
@@ -214,56 +377,280 @@ class CasinoApp:
 
     def show_chart_window(self):
         """
-        Створює та показує нове вікно "Графік".
+        Показує вікно "Графік" для останнього запуску.
         Це наше ВІКНО №4.
+        Фігура будується один раз на запуск: повторне відкриття бере її з кешу.
         """
         if self.last_run_data is None:
             tk.messagebox.showerror("Помилка", "Немає даних для графіка. "
                                                "Спочатку запустіть симуляцію.")
             return
 
-        chart_window = tk.Toplevel(self.root)
-        chart_window.title(f"Графік: {self.last_game_type.capitalize()}")
-        chart_window.geometry("600x400")
+        self.open_chart_window()
+        self.chart.show(self.last_run_data, self.rtp_trace, self.last_total_runs,
+                        run_token=self.run_counter, convergence=self.convergence_trace)
+
+    def open_chart_window(self):
+        """Створює (або показує сховане) вікно "Графік" і графік для поточної гри."""
+        if self.chart_window is None:
+            self.chart_window = tk.Toplevel(self.root)
+            self.chart_window.geometry("600x500")
+            self.chart_window.transient(self.root)
+            #закриття лише ховає вікно: фігура лишається в кеші
+            self.chart_window.protocol("WM_DELETE_WINDOW", self.chart_window.withdraw)
+
+            self.chart_frame = ttk.Frame(self.chart_window, padding="10")
+            self.chart_frame.pack(fill=tk.BOTH, expand=True)
+
+            #кнопка "Закрити"
+            close_button = ttk.Button(
+                self.chart_frame,
+                text="Закрити",
+                command=self.chart_window.withdraw
+            )
+            close_button.pack(side=tk.BOTTOM, pady=10)
+        else:
+            self.chart_window.deiconify()
+
+        self.chart_window.title(f"Графік: {self.last_game_type.capitalize()}")
+
+        #нова гра - нова фігура; та сама - оновлюємо наявну
+        if self.chart is None or self.chart.game is not self.last_game:
+            if self.chart is not None:
+                self.chart.canvas.get_tk_widget().destroy()
+            self.chart = ResultsChart(self.last_game, self.last_game_type,
+                                      by_code=self.last_game_type == "dice")
+            self.chart.attach(self.chart_frame).pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+    def chart_is_visible(self) -> bool:
+        return self.chart is not None and self.chart_window.state() != "withdrawn"
+
+    def build_game_choices(self, game_frame):
+        """(Пере)будовує перемикач ігор з реєстру - при старті і після завантаження варіантів."""
+        old_choices = self.game_choices
+        self.game_choices = ttk.Frame(game_frame)
+        if old_choices is None:
+            self.game_choices.pack(fill=tk.X)
+        else:
+            #новий перемикач стає на місце старого, над рядком можливостей гри
+            self.game_choices.pack(fill=tk.X, before=old_choices)
+            old_choices.destroy()
+        specs = REGISTRY.specs()
+
+        if len(specs) <= self.MAX_RADIO_GAMES:
+            for spec in specs:
+                game_rb = ttk.Radiobutton(
+                    self.game_choices,
+                    text=spec.label,
+                    variable=self.selected_game,
+                    value=spec.key
+                )
+                game_rb.pack(anchor=tk.W, padx=10, pady=2)
+        else:
+            keys_by_label = {spec.label: spec.key for spec in specs}
+            game_combobox = ttk.Combobox(self.game_choices, values=list(keys_by_label), state="readonly")
+            game_combobox.set(REGISTRY.get(self.selected_game.get()).label)
+            game_combobox.bind(
+                "<<ComboboxSelected>>",
+                lambda event: self.selected_game.set(keys_by_label[game_combobox.get()])
+            )
+            game_combobox.pack(fill=tk.X, padx=10, pady=2)
+
+    def load_game_variants(self):
+        """Реєструє варіанти ігор з JSON-файлу (як --variants у CLI) і додає їх у перемикач."""
+        path = filedialog.askopenfilename(
+            title="Завантажити варіанти ігор",
+            filetypes=[("JSON", "*.json")]
+        )
+        if not path:
+            return
+        try:
+            added = REGISTRY.load_variants(path)
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            tk.messagebox.showerror("Помилка", f"Не вдалося завантажити варіанти:\n{error}")
+            added = None
+
+        #навіть після помилки: частину варіантів могло бути зареєстровано до неї
+        self.build_game_choices(self.game_choices.master)
+        if added:
+            names = "\n".join(spec.label for spec in added)
+            tk.messagebox.showinfo("Варіанти ігор", f"Додано:\n{names}")
+
+    def open_stored_run(self):
+        """Відкриває збережений запуск: підсумок у лог, дані - для графіка."""
+        path = filedialog.askopenfilename(
+            title="Відкрити запуск",
+            initialdir=RUNS_DIR,
+            filetypes=[("Запуски OvvraBet", "*.run")]
+        )
+        if not path:
+            return
+        try:
+            run = StoredRun(path)
+            game = run.game()
+        except (OSError, ValueError) as error:
+            tk.messagebox.showerror("Помилка", f"Не вдалося відкрити запуск:\n{error}")
+            return
+
+        #переагрегуємо пакетами поверх memmap - увесь запуск у пам'ять не читається
+        summary = run.summary()
+        self.log_browser.delete("1.0", tk.END)
+        self.log_browser.insert(tk.END, f"Файл: {path}\n")
+        self.log_browser.insert(tk.END, format_summary(game, summary))
+
+        self.last_game = game
+        self.last_game_type = REGISTRY.key_for(game) or game.get_game_name()
+        self.last_run_data = summary.histogram
+        self.last_total_runs = summary.runs
+        self.rtp_trace = RtpTrace()
+        self.convergence_trace = None
+        self.run_counter += 1
+        self.show_chart_button.config(state=tk.NORMAL)
+
+    def compare_stored_runs(self):
+        """Порівнює два збережені запуски (перший обраний - база)."""
+        paths = filedialog.askopenfilenames(
+            title="Оберіть два запуски",
+            initialdir=RUNS_DIR,
+            filetypes=[("Запуски OvvraBet", "*.run")]
+        )
+        if not paths:
+            return
+        if len(paths) != 2:
+            tk.messagebox.showerror("Помилка", "Оберіть рівно два файли запусків.")
+            return
+        try:
+            base, other = StoredRun(paths[0]), StoredRun(paths[1])
+        except (OSError, ValueError) as error:
+            tk.messagebox.showerror("Помилка", f"Не вдалося відкрити запуск:\n{error}")
+            return
 
-        chart_window.transient(self.root)
+        self.log_browser.delete("1.0", tk.END)
+        self.log_browser.insert(tk.END, format_diff(base, other, diff_runs(base, other)))
 
-        frame = ttk.Frame(chart_window, padding="10")
-        frame.pack(fill=tk.BOTH, expand=True)
+    def show_capabilities(self):
+        """Показує під списком ігор, чи має обрана гра пакетний режим і точну модель."""
+        try:
+            capabilities = REGISTRY.get(self.selected_game.get()).capabilities()
+        except (ImportError, AttributeError, TypeError) as error:
+            self.capabilities_label.config(text=f"Гра недоступна: {error}")
+            return
+        self.capabilities_label.config(
+            text=f"Пакетний режим: {'так' if capabilities.batch else 'ні'} | "
+                 f"точна модель: {'так' if capabilities.analytic else 'ні'}"
+        )
+
+    def read_run_settings(self):
+        """
+        Читає налаштування запуску з форми і створює обрану гру.
+        Повертає (гра, раунди, процеси, точність або None) або None з помилкою в лозі.
+        """
+        try:
+            num_runs = int(self.runs_spinbox.get())
+            num_workers = int(self.workers_spinbox.get())
+            seed_text = self.seed_entry.get().strip()
+            seed = int(seed_text) if seed_text else None
+            precision = float(self.precision_entry.get()) if self.adaptive_mode.get() else None
+        except ValueError:
+            self.log_browser.insert(tk.END, "Помилка: Кількість запусків, процесів і seed мають бути числами.")
+            return None
+        if seed is not None and seed < 0:
+            self.log_browser.insert(tk.END, "Помилка: seed не може бути від'ємним.")
+            return None
+        if precision is not None and not precision > 0:
+            self.log_browser.insert(tk.END, "Помилка: точність RTP має бути додатною.")
+            return None
+
+        try:
+            game: IGame = REGISTRY.create(self.selected_game.get(), seed=seed)
+        except (KeyError, ImportError, AttributeError, TypeError, ValueError) as error:
+            self.log_browser.insert(tk.END, f"Помилка: гру не вдалося створити ({error}).")
+            return None
+        return game, num_runs, num_workers, precision
+
+    def queue_simulation(self):
+        """
+        Додає симуляцію обраної гри в чергу, не чекаючи попередніх.
+        Пакети всіх завдань черги чергуються на одному пулі процесів
+        (більший пріоритет - більша частка пакетів).
+        """
+        self.log_browser.delete("1.0", tk.END)
+        settings = self.read_run_settings()
+        if settings is None:
+            return
+        game, num_runs, num_workers, precision = settings
+        try:
+            priority = int(self.priority_spinbox.get())
+        except ValueError:
+            self.log_browser.insert(tk.END, "Помилка: пріоритет має бути числом.")
+            return
+
+        #пул перестворюється лише тоді, коли змінили кількість процесів і черга порожня
+        if self.scheduler is not None and self.scheduler.workers != num_workers \
+                and not self.scheduler.active_jobs():
+            self.scheduler.shutdown()
+            self.scheduler = None
+        if self.scheduler is None:
+            self.scheduler = ChunkScheduler(workers=num_workers)
+
+        label = f"{REGISTRY.get(self.selected_game.get()).label}, {num_runs} раундів"
+        if precision is not None:
+            label += " (у черзі - без адаптивного режиму)"
+        self.scheduler.submit(game, num_runs, priority=priority, label=label)
+
+        if not self.queue_polling:
+            self.queue_polling = True
+            self.check_queue()
 
-        #готуємо дані для графіка
-        data_counter = Counter(self.last_run_data)
+    def check_queue(self):
+        """
+        Раз на 100 мс показує в лозі стан усіх завдань черги,
+        а під ним - підсумки завершених (найсвіжіші зверху).
+        Поки йде окремий запуск ("Запустити"), лог належить йому і не перезаписується.
+        """
+        jobs = self.scheduler.jobs
+        single_run_active = str(self.start_button["state"]) == tk.DISABLED
+
+        for job in jobs:
+            if job.finished and job.id not in self.job_reports:
+                #format_summary з точним аналізом дорогий - не повторюємо його кожні 100 мс
+                self.job_reports[job.id] = \
+                    f"\n#{job.id} " + format_summary(job.game, job.summary) if job.summary.runs > 0 else ""
+                #графік показує останнє завершене завдання (якщо не йде окремий запуск)
+                if not single_run_active and job.summary.runs > 0:
+                    self.last_game = job.game
+                    self.last_game_type = REGISTRY.key_for(job.game) or job.game.get_game_name()
+                    self.last_run_data = job.summary.histogram
+                    self.last_total_runs = job.summary.runs
+                    self.rtp_trace = RtpTrace()
+                    self.convergence_trace = None
+                    self.run_counter += 1
+                    self.show_chart_button.config(state=tk.NORMAL)
+
+        if not single_run_active:
+            text = "--- ЧЕРГА СИМУЛЯЦІЙ ---\n" + format_jobs(jobs)
+            text += "".join(self.job_reports.get(job.id, "") for job in reversed(jobs))
+            self.log_browser.delete("1.0", tk.END)
+            self.log_browser.insert(tk.END, text)
 
-        #сортуємо дані для гарного вигляду
-        if self.last_game_type == "dice":
-            #сортуємо за сумою (ключем)
-            labels = sorted(data_counter.keys())
+        if self.scheduler.active_jobs():
+            self.root.after(100, self.check_queue)
         else:
-            #сортуємо за частотою (значенням)
-            labels = [k for k, v in data_counter.most_common()]
-
-        values = [data_counter[label] for label in labels]
-
-        #створюємо фігуру Matplotlib
-        fig = plt.Figure(figsize=(5, 3), dpi=100)
-        ax = fig.add_subplot(111)
-        ax.bar(range(len(labels)), values, tick_label=labels)
-        ax.set_title(f"Розподіл результатів ({self.last_game_type})")
-        ax.set_ylabel("Кількість випадінь")
-        fig.tight_layout()
-
-        #вбудовуємо фігуру в Tkinter
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-        #кнопка "Закрити"
-        close_button = ttk.Button(
-            frame,
-            text="Закрити",
-            command=chart_window.destroy
-        )
-        close_button.pack(side=tk.BOTTOM, pady=10)
+            self.queue_polling = False
+
+    def cancel_queue(self):
+        """Скасовує всі незавершені завдання черги."""
+        if self.scheduler is None:
+            return
+        for job in self.scheduler.active_jobs():
+            self.scheduler.cancel(job)
+
+    def on_close(self):
+        """Закриває програму, зупинивши чергу (інакше пул дограв би всі завдання)."""
+        self.cancel_event.set()
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+        self.root.destroy()
 
     def start_simulation(self):
         """
@@ -275,85 +662,151 @@ class CasinoApp:
         self.show_chart_button.config(state=tk.DISABLED)
         self.log_browser.delete("1.0", tk.END)
         self.log_browser.insert(tk.END, "Запуск симуляції... Будь ласка, зачекайте...\n")
+        self.progress_bar.config(value=0)
+        self.progress_label.config(text="")
         self.root.update_idletasks()
 
         self.last_run_data = None  #очищуємо старі дані
 
-        try:
-            num_runs = int(self.runs_spinbox.get())
-        except ValueError:
-            self.log_browser.insert(tk.END, "Помилка: Кількість запусків має бути числом.")
-            self.start_button.config(state=tk.NORMAL)
-            return
-
-        game_choice = self.selected_game.get()
-        self.last_game_type = game_choice  #зберігаємо, яку гру запустили
-        game: IGame = None
-
-        if game_choice == "dice":
-            game = DiceGame()
-        elif game_choice == "slots":
-            game = SlotsGame()
-        elif game_choice == "pistol":
-            game = PistolRouletteGame()
-        else:
-            self.log_browser.insert(tk.END, "Помилка: Ця гра ще не реалізована.")
+        settings = self.read_run_settings()
+        if settings is None:
             self.start_button.config(state=tk.NORMAL)
             return
+        game, num_runs, num_workers, precision = settings
+        self.last_game_type = self.selected_game.get()  #зберігаємо, яку гру запустили
+
+        self.last_game = game
+        self.last_total_runs = num_runs
+        self.rtp_trace = RtpTrace()
+        self.convergence_trace = ConvergenceTrace() if self.trace_convergence.get() else None
+        self.run_counter += 1
+        if self.live_chart.get():
+            self.open_chart_window()
+        self.cancel_event.clear()
+        self.cancel_button.config(state=tk.NORMAL)
+
+        writer = None
+        if self.save_runs.get():
+            writer = self.results_store.new_writer(game, {
+                "runs": num_runs, "workers": num_workers, "precision": precision
+            })
+
+        profiler = None
+        if self.profile_run.get() or self.profile_dump.get():
+            dumping = self.profile_dump.get()
+            profiler = Profiler(trace_memory=dumping, cprofile=dumping,
+                                dump_dir=self.PROFILES_DIR if dumping else None)
 
         simulation_thread = threading.Thread(
             target=self.run_simulation_logic,
-            args=(game, num_runs)
+            args=(game, num_runs, num_workers, precision, writer, profiler,
+                  self.convergence_trace)
         )
         simulation_thread.start()
 
         self.check_for_result()
 
-    def run_simulation_logic(self, game: IGame, num_runs: int):
+    def run_simulation_logic(self, game: IGame, num_runs: int, num_workers: int,
+                             precision: float = None, writer=None, profiler=None,
+                             trace: ConvergenceTrace = None):
         """
         Ця функція (ФОНОВИЙ ПОТІК) виконує всю важку роботу.
         Вона НЕ МАЄ права чіпати UI (напр. log_browser).
+        profiler (profiling.Profiler) - якщо заданий, запуск профілюється по фазах.
+        trace - куди записувати збіжність RTP (графік читає її лише після "done").
         """
 
-        total_wins = 0
-        total_money_delta = 0.0
-
-        raw_data_list = []  #збираємо дані для графіка
-
-        for _ in range(num_runs):
-            result = game.play_once()
-            if result.is_win:
-                total_wins += 1
-            total_money_delta += result.money_delta
-
-            raw_data_list.append(result.primary_value)  #зберегти результат
-
-        if num_runs == 0:
-            win_percentage = 0
-        else:
-            win_percentage = (total_wins / num_runs) * 100.0
-
-        rtp_text = ""
-        if isinstance(game, SlotsGame) and num_runs > 0:
-            rtp = (total_money_delta + num_runs) / num_runs * 100
-            rtp_text = f"RTP (Return To Player): {rtp:.2f}%\n"
+        try:
+            #пакети рахуються у пулі процесів, тут лише зливаємо підсумки;
+            #прогрес іде в чергу раз на пакет, а не раз на раунд
+            on_progress = lambda progress: self.simulation_queue.put(("progress", progress))
+            started = time.perf_counter()
+            with profiler if profiler is not None else contextlib.nullcontext():
+                with phase("simulate"):
+                    if precision is None and writer is None:
+                        summary = self.simulation_cache.run(
+                            game, num_runs, workers=num_workers,
+                            on_progress=on_progress,
+                            cancel_event=self.cancel_event,
+                            trace=trace
+                        )
+                        confidence = None
+                    elif precision is None:
+                        #для збереження потрібні всі раунди, тож кеш підсумків тут не допоможе
+                        summary = run_simulation(
+                            game, num_runs, workers=num_workers,
+                            on_progress=on_progress,
+                            cancel_event=self.cancel_event,
+                            sink=writer,
+                            trace=trace
+                        )
+                        confidence = None
+                    else:
+                        #кількість раундів визначає сам рушій; зупинити можна кнопкою "Скасувати"
+                        summary = run_until_precision(
+                            game, precision, self.ADAPTIVE_CONFIDENCE, workers=num_workers,
+                            on_progress=on_progress,
+                            cancel_event=self.cancel_event,
+                            sink=writer,
+                            trace=trace
+                        )
+                        confidence = self.ADAPTIVE_CONFIDENCE
+
+                with phase("format"):
+                    result_text = format_summary(game, summary, confidence)
+                    if precision is None and writer is None:
+                        result_text += describe_source(self.simulation_cache)
+
+                if writer is not None:
+                    with phase("save"):
+                        saved_path = writer.close(summary, time.perf_counter() - started)
+                    result_text += f"Збережено: {saved_path}\n"
+
+            if profiler is not None:
+                result_text += format_profile(profiler.report)
+        except Exception as error:
+            #без цього потік тихо помер би, а кнопка "Запустити" лишилася б вимкненою
+            if writer is not None:
+                writer.abort()
+            self.simulation_queue.put(("error", f"{type(error).__name__}: {error}"))
+            return
 
-        result_text = ""
-        result_text += f"--- Запуск гри '{game.get_game_name()}' ({num_runs} разів) ---\n"
-        result_text += "\n--- СТАТИСТИКА ЗАВЕРШЕНА ---\n"
-        result_text += f"Всього виграшів: {total_wins} ({win_percentage:.2f} %)\n"
-        result_text += f"Чистий прибуток/збиток: {total_money_delta} монет\n"
-        result_text += rtp_text
+        self.simulation_queue.put(("done", (result_text, summary.histogram)))
 
-        self.simulation_result = (result_text, raw_data_list)
+    def cancel_simulation(self):
+        """Просить фоновий потік зупинитися після поточного пакета."""
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_label.config(text="Скасування...")
 
     def check_for_result(self):
         """
-        ця функція кожні 100мс перевіряє,
-        чи фоновий потік вже закінчив роботу.
+        ця функція ~60 разів на секунду забирає з черги
+        повідомлення фонового потоку: прогрес, готовий результат або помилку.
         """
-        if self.simulation_result is not None:
-            text_result, data_result = self.simulation_result
+        latest_progress = None
+        while True:
+            try:
+                kind, payload = self.simulation_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                #у лінію RTP йде кожен знімок, а на екран - лише найсвіжіший
+                self.rtp_trace.add(payload.runs_done, payload.rtp)
+                latest_progress = payload
+                continue
+
+            if kind == "error":
+                self.log_browser.delete("1.0", tk.END)
+                self.log_browser.insert(tk.END, f"--- ПОМИЛКА СИМУЛЯЦІЇ ---\n{payload}\n")
+                self.start_button.config(state=tk.NORMAL)
+                self.cancel_button.config(state=tk.DISABLED)
+                self.progress_label.config(text="Симуляцію зупинено через помилку")
+                tk.messagebox.showerror("Помилка", f"Симуляція завершилася з помилкою:\n{payload}")
+                return
+
+            text_result, data_result = payload
 
             self.log_browser.delete("1.0", tk.END)
             self.log_browser.insert(tk.END, text_result)
@@ -361,18 +814,38 @@ class CasinoApp:
             #зберігаємо дані та вмикаємо кнопку
             self.last_run_data = data_result
             self.start_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
             self.show_chart_button.config(state=tk.NORMAL)
+            if latest_progress is not None:
+                self.show_progress(latest_progress)
+            if self.chart_is_visible():
+                #відкритий графік перемикаємо на підсумковий вигляд цього запуску
+                self.open_chart_window()
+                self.chart.show(self.last_run_data, self.rtp_trace, self.last_total_runs,
+                                run_token=self.run_counter, convergence=self.convergence_trace)
+            return
 
-            self.simulation_result = None
-        else:
-            self.root.after(100, self.check_for_result)
+        if latest_progress is not None:
+            self.show_progress(latest_progress)
+        self.root.after(16, self.check_for_result)
+
+    def show_progress(self, progress):
+        """Оновлює смугу прогресу, рядок з частковими результатами і живий графік."""
+        self.last_total_runs = progress.total_runs
+        if self.live_chart.get() and self.chart_is_visible():
+            self.chart.update_live(progress.histogram, self.rtp_trace, progress.total_runs)
+        self.progress_bar.config(value=progress.fraction_done)
+        self.progress_label.config(
+            text=f"{progress.runs_done} / {progress.total_runs} раундів | "
+                 f"виграші {progress.win_rate:.2f} % | RTP {progress.rtp:.2f} % | "
+                 f"{progress.rounds_per_second:,.0f} раундів/с"
+        )
 
 
 # --- Блок запуску програми ---
 if __name__ == "__main__":
-    #це потрібно для коректної роботи графіків на Windows
-    plt.switch_backend('agg')
-
+    #графіки будуються через Figure напряму (без pyplot),
+    #тому перемикати backend matplotlib більше не потрібно
     root = ThemedTk(theme="arc")
     app = CasinoApp(root)
     app.current_theme.set("arc")
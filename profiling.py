@@ -0,0 +1,227 @@
+import cProfile
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+try:
+    import resource  #немає на Windows
+except ImportError:
+    resource = None
+
+#активний профайлер - свій у кожному потоці (немає атрибута profiler - інструментація вимкнена):
+#фази з потоків пулу чи планувальника не змішуються зі стеком фаз потоку, що профілює
+_local = threading.local()
+
+
+class _NullPhase:
+    """Порожній контекст: саме його повертає phase(), коли профілювання вимкнене."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(name: str):
+    """
+    Контекст для заміру фази "гарячого" шляху: with phase("draw"): ...
+    Без активного профайлера - один пошук атрибута потоку і порожній контекст;
+    фази ставляться навколо пакетів, а не окремих раундів, тож ціна непомітна.
+    """
+    profiler = getattr(_local, "profiler", None)
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
+
+
+def active():
+    """Активний профайлер цього потоку або None."""
+    return getattr(_local, "profiler", None)
+
+
+class _Phase:
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._stack.append(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed = time.perf_counter() - self.started
+        path = "/".join(self.profiler._stack)
+        self.profiler._stack.pop()
+        self.profiler.add(path, elapsed)
+        return False
+
+
+#звіт профілювання
+@dataclass
+class ProfileReport:
+    """
+    Підсумок профілювання запуску.
+    phases - шлях фази ("play/draw") -> (кількість викликів, секунди);
+    вкладені фази входять у час батьківської. Фази з процесів-воркерів
+    додаються до тих самих шляхів, тож їх сума може перевищувати wall_seconds.
+    """
+    phases: dict
+    wall_seconds: float
+    rounds: int
+    peak_memory_bytes: int   #None, якщо виміряти нічим
+    #"tracemalloc" (пік Python-алокацій за запуск) або "rss" (пік пам'яті процесу
+    #за весь час його життя, а не лише за цей запуск)
+    memory_source: str
+    dump_paths: list
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Звіт як словник для JSON (фази - {"calls": ..., "seconds": ...})."""
+        data = asdict(self)
+        data["phases"] = {path: {"calls": calls, "seconds": seconds}
+                          for path, (calls, seconds) in self.phases.items()}
+        data["rounds_per_second"] = self.rounds_per_second
+        return data
+
+
+#профайлер
+class Profiler:
+    """
+    Збирає час фаз, кількість раундів і пік пам'яті, поки активний (with Profiler() as p).
+    Профайлер активний лише в потоці, що увійшов у with: phase() з інших потоків
+    його не бачить, тож стек фаз належить одному потоку.
+    trace_memory вмикає tracemalloc (точний пік Python-алокацій, але повільніше),
+    cprofile - cProfile для потоку, в якому профайлер активовано.
+    dump_dir - куди записати .prof і знімок tracemalloc при виході.
+    """
+
+    def __init__(self, trace_memory: bool = False, cprofile: bool = False, dump_dir: str = None):
+        self.trace_memory = trace_memory
+        self.cprofile = cprofile
+        self.dump_dir = dump_dir
+        self.phases = {}
+        self.rounds = 0
+        self._stack = []
+        self._previous = None
+        self._profile = None
+        self._started_tracemalloc = False
+        self._started = None
+        self.report = None
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def add(self, path: str, seconds: float, calls: int = 1):
+        entry = self.phases.get(path)
+        if entry is None:
+            self.phases[path] = [calls, seconds]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+
+    def merge(self, phases: dict):
+        """Додає фази, зібрані в іншому процесі (вони вкладаються в поточну фазу)."""
+        prefix = "/".join(self._stack)
+        for path, (calls, seconds) in phases.items():
+            self.add(f"{prefix}/{path}" if prefix else path, seconds, calls)
+
+    def add_rounds(self, rounds: int):
+        self.rounds += rounds
+
+    def __enter__(self) -> "Profiler":
+        self._previous = active()
+        _local.profiler = self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        wall_seconds = time.perf_counter() - self._started
+        if self._profile is not None:
+            self._profile.disable()
+        _local.profiler = self._previous
+
+        if self.trace_memory:
+            peak_memory, memory_source = tracemalloc.get_traced_memory()[1], "tracemalloc"
+        elif resource is not None:
+            #ru_maxrss на Linux - у кілобайтах, на macOS - у байтах
+            scale = 1 if os.uname().sysname == "Darwin" else 1024
+            peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+            memory_source = "rss"
+        else:
+            peak_memory, memory_source = None, None
+
+        dump_paths = self._dump() if self.dump_dir is not None else []
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        self.report = ProfileReport(
+            phases={path: tuple(entry) for path, entry in self.phases.items()},
+            wall_seconds=wall_seconds,
+            rounds=self.rounds,
+            peak_memory_bytes=peak_memory,
+            memory_source=memory_source,
+            dump_paths=dump_paths
+        )
+        return False
+
+    def _dump(self) -> list:
+        """Пише статистику cProfile (.prof) і топ алокацій tracemalloc (.txt)."""
+        os.makedirs(self.dump_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        paths = []
+        if self._profile is not None:
+            path = os.path.join(self.dump_dir, f"profile-{stamp}.prof")
+            pstats.Stats(self._profile).dump_stats(path)
+            paths.append(path)
+        if tracemalloc.is_tracing():
+            path = os.path.join(self.dump_dir, f"tracemalloc-{stamp}.txt")
+            statistics = tracemalloc.take_snapshot().statistics("lineno")
+            with open(path, "w", encoding="utf-8") as file:
+                for statistic in statistics[:50]:
+                    file.write(f"{statistic}\n")
+            paths.append(path)
+        return paths
+
+
+def format_profile(report: ProfileReport) -> str:
+    """Текстовий звіт профілювання (дерево фаз із часткою від батьківської фази)."""
+    text = "--- ПРОФІЛЮВАННЯ ---\n"
+    text += f"Час: {report.wall_seconds:.3f} с, {report.rounds} раундів, " \
+            f"{report.rounds_per_second:,.0f} раундів/с\n"
+    if report.peak_memory_bytes is not None:
+        if report.memory_source == "tracemalloc":
+            label = "пік алокацій Python за запуск"
+        else:
+            label = "пік пам'яті процесу за весь час роботи, не лише цього запуску"
+        text += f"Пам'ять ({label}): {report.peak_memory_bytes / 2 ** 20:.1f} МБ\n"
+
+    for path in sorted(report.phases):
+        calls, seconds = report.phases[path]
+        parent, _, name = path.rpartition("/")
+        parent_seconds = report.phases[parent][1] if parent in report.phases else report.wall_seconds
+        share = seconds / parent_seconds * 100 if parent_seconds > 0 else 0.0
+        indent = "  " * path.count("/")
+        text += f"  {indent}{name}: {seconds:.3f} с ({share:.1f} %), викликів: {calls}\n"
+
+    for path in report.dump_paths:
+        text += f"Знімок: {path}\n"
+    return text
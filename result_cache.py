@@ -0,0 +1,253 @@
+import hashlib
+import inspect
+import json
+import os
+from collections import OrderedDict
+
+from game_logic import IGame
+from simulation import CHUNK_SIZE, SimulationSummary, run_simulation
+
+#тека дискового кешу за замовчуванням (для GUI)
+CACHE_DIR = os.path.join(".cache", "simulations")
+
+#міняється, коли змінюється логіка ігор чи рушія: старі записи на диску стають недійсними
+CACHE_VERSION = 1
+
+#звідки взявся результат останнього SimulationCache.run()
+HIT, EXTENDED, MISS, UNCACHED = "hit", "extended", "miss", "uncached"
+
+
+def describe_source(cache: "SimulationCache") -> str:
+    """Рядок для звіту: звідки взявся результат останнього запуску через кеш."""
+    if cache.last_source == HIT:
+        return "Результат взято з кешу (0 раундів симульовано)\n"
+    if cache.last_source == EXTENDED:
+        return f"Продовжено запуск з кешу: симульовано {cache.last_simulated_runs} раундів\n"
+    return ""
+
+
+def _copy_summary(summary: SimulationSummary) -> SimulationSummary:
+    """Незалежна копія підсумку: кеш і викликач не мають ділити одну гістограму."""
+    return SimulationSummary(
+        runs=summary.runs,
+        wins=summary.wins,
+        money_delta=summary.money_delta,
+        money_m2=summary.money_m2,
+        histogram=dict(summary.histogram),
+        seed=summary.seed
+    )
+
+
+def _summary_to_json(summary: SimulationSummary) -> dict:
+    return {
+        "runs": summary.runs,
+        "wins": summary.wins,
+        "money_delta": summary.money_delta,
+        "money_m2": summary.money_m2,
+        #пари, а не об'єкт: ключі JSON - лише рядки, а коди мають лишитися числами
+        "histogram": sorted(summary.histogram.items()),
+        "seed": summary.seed,
+    }
+
+
+def _summary_from_json(data: dict) -> SimulationSummary:
+    return SimulationSummary(
+        runs=data["runs"],
+        wins=data["wins"],
+        money_delta=data["money_delta"],
+        money_m2=data["money_m2"],
+        histogram={code: count for code, count in data["histogram"]},
+        seed=data["seed"]
+    )
+
+
+#кеш результатів симуляції
+class SimulationCache:
+    """
+    Кеш підсумків run_simulation() для запусків із відомим seed.
+    Ключ - клас гри, її параметри (get_config()), seed і розмір пакета;
+    для ключа зберігаються підсумки різної довжини. Гра з параметрами
+    конструктора, що не перевизначає get_config(), не кешується (див. cacheable()).
+
+    Пам'ять - LRU на max_entries підсумків; якщо задано directory, підсумки
+    ще й пишуться на диск (JSON), а найдавніше використані файли видаляються,
+    коли тека перевищує max_disk_bytes.
+
+    Бо кожен пакет має власний потік (seed, номер пакета), збережений підсумок
+    цілих пакетів можна продовжити: на 10M у кеші і запит на 12M симулюються
+    лише 2M, а результат такий самий до біта, як у запуску з нуля.
+    """
+
+    def __init__(self, max_entries: int = 64, directory: str = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()  #(ключ, раунди) -> SimulationSummary
+        self.last_source = None
+        self.last_simulated_runs = 0
+
+    @staticmethod
+    def cacheable(game: IGame) -> bool:
+        """
+        Чи описує get_config() гру повністю. Типовий get_config() повертає {},
+        тож для гри з власними параметрами конструктора всі її варіанти
+        мали б один ключ - такі ігри кеш обходить.
+        """
+        game_type = type(game)
+        if game_type.get_config is not IGame.get_config:
+            return True
+        parameters = inspect.signature(game_type.__init__).parameters
+        return set(parameters) <= {"self", "rng", "seed"}
+
+    @staticmethod
+    def key(game: IGame, seed: int, chunk_size: int = CHUNK_SIZE) -> str:
+        """Ключ запуску (без кількості раундів)."""
+        game_type = type(game)
+        description = json.dumps({
+            "version": CACHE_VERSION,
+            "game": f"{game_type.__module__}.{game_type.__qualname__}",
+            "config": game.get_config(),
+            "seed": seed,
+            "chunk_size": chunk_size,
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+    # --- пам'ять і диск ---
+
+    def _disk_path(self, key: str, runs: int) -> str:
+        return os.path.join(self.directory, f"{key}-{runs}.json")
+
+    def _remember(self, key: str, summary: SimulationSummary):
+        self._memory[(key, summary.runs)] = summary
+        self._memory.move_to_end((key, summary.runs))
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str, runs: int) -> SimulationSummary:
+        summary = self._memory.get((key, runs))
+        if summary is not None:
+            self._memory.move_to_end((key, runs))
+            return summary
+        if self.directory is None:
+            return None
+        path = self._disk_path(key, runs)
+        try:
+            with open(path, encoding="utf-8") as file:
+                summary = _summary_from_json(json.load(file))
+        except (OSError, ValueError, KeyError):
+            return None
+        os.utime(path)  #час доступу - для витіснення найдавніше використаних
+        self._remember(key, summary)
+        return summary
+
+    def _cached_runs(self, key: str) -> set:
+        """Довжини підсумків, які є для ключа (у пам'яті або на диску)."""
+        runs = {cached_runs for cached_key, cached_runs in self._memory if cached_key == key}
+        if self.directory is not None and os.path.isdir(self.directory):
+            prefix = f"{key}-"
+            for name in os.listdir(self.directory):
+                if name.startswith(prefix) and name.endswith(".json"):
+                    runs.add(int(name[len(prefix):-len(".json")]))
+        return runs
+
+    def _store(self, key: str, summary: SimulationSummary):
+        summary = _copy_summary(summary)
+        self._remember(key, summary)
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._disk_path(key, summary.runs)
+        partial_path = f"{path}.tmp"
+        with open(partial_path, "w", encoding="utf-8") as file:
+            json.dump(_summary_to_json(summary), file)
+        os.replace(partial_path, path)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """Видаляє найдавніше використані файли, поки тека не влізе в max_disk_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    # --- публічний інтерфейс ---
+
+    def get(self, game: IGame, seed: int, runs: int,
+            chunk_size: int = CHUNK_SIZE) -> SimulationSummary:
+        """Точний збіг (копія) або None."""
+        if not self.cacheable(game):
+            return None
+        summary = self._load(self.key(game, seed, chunk_size), runs)
+        return _copy_summary(summary) if summary is not None else None
+
+    def best_prefix(self, game: IGame, seed: int, runs: int,
+                    chunk_size: int = CHUNK_SIZE) -> SimulationSummary:
+        """Найдовший збережений підсумок цілих пакетів, не довший за runs (або None)."""
+        if not self.cacheable(game):
+            return None
+        key = self.key(game, seed, chunk_size)
+        candidates = [cached_runs for cached_runs in self._cached_runs(key)
+                      if cached_runs <= runs and cached_runs % chunk_size == 0]
+        for cached_runs in sorted(candidates, reverse=True):
+            summary = self._load(key, cached_runs)
+            if summary is not None:
+                return _copy_summary(summary)
+        return None
+
+    def put(self, game: IGame, summary: SimulationSummary, chunk_size: int = CHUNK_SIZE):
+        """Зберігає підсумок (скасований запуск теж: його цілі пакети - валідний префікс)."""
+        if summary.runs == 0 or not self.cacheable(game):
+            return
+        self._store(self.key(game, summary.seed, chunk_size), summary)
+
+    def clear(self):
+        """Очищує пам'ять і теку кешу."""
+        self._memory.clear()
+        if self.directory is not None and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def run(self, game: IGame, num_runs: int, seed: int = None, workers: int = None,
+            chunk_size: int = CHUNK_SIZE, on_progress=None, cancel_event=None,
+            trace=None) -> SimulationSummary:
+        """
+        run_simulation() через кеш. Без seed (ні явного, ні в грі) запуск не відтворюваний,
+        тож кеш обходиться, як і для гри, яку не можна описати ключем (cacheable()).
+        Звідки взявся результат - у last_source (HIT, EXTENDED, MISS або UNCACHED),
+        скільки раундів симульовано - у last_simulated_runs.
+        trace отримує контрольні точки лише симульованих раундів (при HIT лишається порожнім).
+        """
+        if seed is None:
+            seed = game.seed
+        if seed is None or not self.cacheable(game):
+            self.last_source = UNCACHED
+            summary = run_simulation(game, num_runs, seed=seed, workers=workers, chunk_size=chunk_size,
+                                     on_progress=on_progress, cancel_event=cancel_event,
+                                     trace=trace)
+            self.last_simulated_runs = summary.runs
+            return summary
+
+        cached = self.get(game, seed, num_runs, chunk_size)
+        if cached is not None:
+            self.last_source = HIT
+            self.last_simulated_runs = 0
+            return cached
+
+        prefix = self.best_prefix(game, seed, num_runs, chunk_size)
+        summary = run_simulation(game, num_runs, seed=seed, workers=workers,
+                                 chunk_size=chunk_size, on_progress=on_progress,
+                                 cancel_event=cancel_event, resume=prefix, trace=trace)
+        self.last_source = EXTENDED if prefix is not None else MISS
+        self.last_simulated_runs = summary.runs - (prefix.runs if prefix is not None else 0)
+        self.put(game, summary, chunk_size)
+        return summary
@@ -0,0 +1,346 @@
+import argparse
+import json
+import os
+import shutil
+import struct
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from game_logic import IGame, ResultBatch
+from game_registry import REGISTRY
+from simulation import CHUNK_SIZE, SimulationSummary, format_summary
+
+#тека, куди GUI і CLI складають запуски за замовчуванням
+RUNS_DIR = "runs"
+
+#формат файлу: MAGIC, довжина заголовка (uint64 LE), JSON-заголовок, колонки
+MAGIC = b"OVVRARUN"
+FORMAT_VERSION = 1
+#початок заголовка і кожної колонки вирівняно, щоб memmap читав їх без зсуву
+ALIGNMENT = 64
+
+#колонки ResultBatch у порядку запису
+COLUMNS = ("outcomes", "wins", "money_deltas")
+
+
+def _padding(position: int) -> int:
+    return -position % ALIGNMENT
+
+
+#запис запуску на диск
+class RunWriter:
+    """
+    Пише пакети раундів одного запуску у файл .run, не тримаючи їх у пам'яті.
+    Підходить як sink для run_simulation(): колонки пакетів дописуються
+    у тимчасові файли, а close() збирає їх в один файл із JSON-заголовком.
+    Використовується як контекстний менеджер; при винятку тимчасові файли видаляються.
+    """
+
+    def __init__(self, path: str, game: IGame, parameters: dict = None):
+        self.path = path
+        self.game = game
+        self.parameters = dict(parameters or {})
+        self.runs = 0
+        self._dtypes = None
+        self._column_paths = {name: f"{path}.{name}.tmp" for name in COLUMNS}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._files = {name: open(column_path, "wb")
+                       for name, column_path in self._column_paths.items()}
+
+    def __enter__(self) -> "RunWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.abort()
+
+    def write(self, batch: ResultBatch):
+        """Дописує пакет раундів (типи колонок беруться з першого пакета)."""
+        if self._dtypes is None:
+            self._dtypes = {name: getattr(batch, name).dtype for name in COLUMNS}
+        for name in COLUMNS:
+            column = np.ascontiguousarray(getattr(batch, name), dtype=self._dtypes[name])
+            column.tofile(self._files[name])
+        self.runs += len(batch)
+
+    def close(self, summary: SimulationSummary = None, elapsed: float = None) -> str:
+        """
+        Збирає файл запуску і повертає шлях до нього.
+        summary дає seed, прапорець скасування і короткі підсумки для заголовка.
+        """
+        for file in self._files.values():
+            file.close()
+        dtypes = self._dtypes or {"outcomes": np.dtype(np.int64), "wins": np.dtype(bool),
+                                  "money_deltas": np.dtype(np.float64)}
+
+        game_type = type(self.game)
+        header = {
+            "version": FORMAT_VERSION,
+            "game": self.game.get_game_name(),
+            "game_class": f"{game_type.__module__}.{game_type.__qualname__}",
+            "game_key": REGISTRY.key_for(self.game),
+            "config": self.game.get_config(),
+            "seed": summary.seed if summary is not None else self.game.seed,
+            "parameters": self.parameters,
+            "runs": self.runs,
+            "cancelled": bool(summary.cancelled) if summary is not None else False,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "elapsed_seconds": elapsed,
+        }
+        if summary is not None and summary.runs > 0:
+            header["wins"] = summary.wins
+            header["money_delta"] = summary.money_delta
+            header["rtp"] = summary.rtp
+
+        #зсуви колонок залежать від довжини заголовка, а заголовок - від зсувів,
+        #тож спершу рахуємо довжину із запасом під числа
+        header["columns"] = [{"name": name, "dtype": dtypes[name].str, "offset": 0, "length": self.runs}
+                             for name in COLUMNS]
+        reserve = len(json.dumps(header, ensure_ascii=False).encode("utf-8")) + 32 * len(COLUMNS)
+        offset = len(MAGIC) + 8 + reserve
+        offset += _padding(offset)
+        for column in header["columns"]:
+            column["offset"] = offset
+            offset += self.runs * dtypes[column["name"]].itemsize
+            offset += _padding(offset)
+
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        header_bytes += b" " * (reserve - len(header_bytes))
+
+        partial_path = f"{self.path}.tmp"
+        with open(partial_path, "wb") as output:
+            output.write(MAGIC)
+            output.write(struct.pack("<Q", len(header_bytes)))
+            output.write(header_bytes)
+            for column in header["columns"]:
+                output.write(b"\0" * (column["offset"] - output.tell()))
+                with open(self._column_paths[column["name"]], "rb") as source:
+                    shutil.copyfileobj(source, output, 1 << 20)
+        os.replace(partial_path, self.path)
+        self._remove_columns()
+        return self.path
+
+    def abort(self):
+        """Відкидає незавершений запис."""
+        for file in self._files.values():
+            file.close()
+        self._remove_columns()
+
+    def _remove_columns(self):
+        for column_path in self._column_paths.values():
+            if os.path.exists(column_path):
+                os.remove(column_path)
+
+
+#збережений запуск
+class StoredRun:
+    """
+    Запуск, прочитаний з файлу .run. Колонки - numpy.memmap лише для читання:
+    у пам'ять потрапляють тільки ті сторінки, які справді читаються,
+    тож навіть запуск на 100M раундів можна переагрегувати чи порівняти пакетами.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: це не файл запуску")
+            header_length, = struct.unpack("<Q", file.read(8))
+            self.header = json.loads(file.read(header_length).decode("utf-8"))
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: невідома версія формату {self.header.get('version')}")
+
+        self._columns = {}
+        for column in self.header["columns"]:
+            dtype = np.dtype(column["dtype"])
+            if column["length"] == 0:
+                self._columns[column["name"]] = np.empty(0, dtype=dtype)
+            else:
+                self._columns[column["name"]] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=column["offset"], shape=(column["length"],)
+                )
+
+    @property
+    def runs(self) -> int:
+        return self.header["runs"]
+
+    @property
+    def seed(self) -> int:
+        return self.header["seed"]
+
+    @property
+    def outcomes(self) -> np.ndarray:
+        return self._columns["outcomes"]
+
+    @property
+    def wins(self) -> np.ndarray:
+        return self._columns["wins"]
+
+    @property
+    def money_deltas(self) -> np.ndarray:
+        return self._columns["money_deltas"]
+
+    def game(self) -> IGame:
+        """
+        Створює гру з тими самими параметрами (потрібна для підписів і теорії).
+        Клас шукається лише серед зареєстрованих у REGISTRY: файл не може змусити
+        імпортувати довільний модуль. Гра, якої вже немає, дає ValueError.
+        """
+        key = self.header.get("game_key")
+        if key in REGISTRY:
+            spec = REGISTRY.get(key)
+        else:
+            #старі файли (і незареєстровані ігри) мають лише шлях до класу
+            target = self.header.get("game_class")
+            spec = next((spec for spec in REGISTRY.specs()
+                         if spec.target.replace(":", ".") == target), None)
+            if spec is None:
+                raise ValueError(f"Гра запуску не зареєстрована: {target}")
+        try:
+            return spec.load()(seed=self.seed, **self.header["config"])
+        except (ImportError, AttributeError, TypeError) as error:
+            raise ValueError(f"Не вдалося відновити гру '{spec.key}': {error}") from error
+
+    def batch(self, start: int = 0, stop: int = None) -> ResultBatch:
+        """Раунди [start, stop) як ResultBatch поверх memmap (без копіювання)."""
+        return ResultBatch(
+            outcomes=self.outcomes[start:stop],
+            wins=self.wins[start:stop],
+            money_deltas=self.money_deltas[start:stop]
+        )
+
+    def iter_batches(self, chunk_size: int = CHUNK_SIZE):
+        for start in range(0, self.runs, chunk_size):
+            yield self.batch(start, start + chunk_size)
+
+    def summary(self, chunk_size: int = CHUNK_SIZE) -> SimulationSummary:
+        """Переагреговує запуск пакетами - пам'ять не залежить від кількості раундів."""
+        summary = SimulationSummary(seed=self.seed, cancelled=self.header["cancelled"])
+        for batch in self.iter_batches(chunk_size):
+            summary.merge(SimulationSummary.from_batch(batch))
+        return summary
+
+
+#порівняння двох запусків
+@dataclass
+class RunDiff:
+    """Різниця між двома збереженими запусками (other мінус base)."""
+    base_runs: int
+    other_runs: int
+    rtp_difference: float            #у відсоткових пунктах
+    win_percentage_difference: float
+    histogram_difference: dict       #код результату -> різниця кількостей (лише ненульові)
+    first_divergence: int = None     #перший раунд, де коди відрізняються (None - спільна частина однакова)
+
+
+def diff_runs(base: StoredRun, other: StoredRun, chunk_size: int = CHUNK_SIZE) -> RunDiff:
+    """Порівнює два запуски пакетами, не завантажуючи їх у пам'ять цілком."""
+    base_summary = base.summary(chunk_size)
+    other_summary = other.summary(chunk_size)
+
+    first_divergence = None
+    common = min(base.runs, other.runs)
+    for start in range(0, common, chunk_size):
+        stop = min(start + chunk_size, common)
+        different = np.flatnonzero(base.outcomes[start:stop] != other.outcomes[start:stop])
+        if different.size:
+            first_divergence = start + int(different[0])
+            break
+
+    codes = set(base_summary.histogram) | set(other_summary.histogram)
+    histogram_difference = {}
+    for code in sorted(codes):
+        difference = other_summary.histogram.get(code, 0) - base_summary.histogram.get(code, 0)
+        if difference:
+            histogram_difference[code] = difference
+
+    return RunDiff(
+        base_runs=base.runs,
+        other_runs=other.runs,
+        rtp_difference=other_summary.rtp - base_summary.rtp if base.runs and other.runs else 0.0,
+        win_percentage_difference=other_summary.win_percentage - base_summary.win_percentage,
+        histogram_difference=histogram_difference,
+        first_divergence=first_divergence
+    )
+
+
+def format_diff(base: StoredRun, other: StoredRun, diff: RunDiff) -> str:
+    """Текстовий звіт про різницю двох запусків."""
+    game = other.game()
+    text = "--- Порівняння запусків ---\n"
+    text += f"База:  {os.path.basename(base.path)} ({diff.base_runs} раундів, seed {base.seed})\n"
+    text += f"Інший: {os.path.basename(other.path)} ({diff.other_runs} раундів, seed {other.seed})\n"
+    text += f"Різниця RTP: {diff.rtp_difference:+.3f} п.п.\n"
+    text += f"Різниця відсотка виграшів: {diff.win_percentage_difference:+.3f} п.п.\n"
+    if diff.first_divergence is None:
+        text += "Спільна частина запусків однакова\n"
+    else:
+        text += f"Перша відмінність: раунд {diff.first_divergence}\n"
+    for code, difference in diff.histogram_difference.items():
+        text += f"  {game.decode_outcome(code)}: {difference:+d}\n"
+    return text
+
+
+#тека зі збереженими запусками
+class ResultsStore:
+    """Тека з файлами .run: створення записувачів, перелік і відкриття запусків."""
+
+    def __init__(self, directory: str = RUNS_DIR):
+        self.directory = directory
+
+    def new_writer(self, game: IGame, parameters: dict = None) -> RunWriter:
+        """Записувач для нового запуску; ім'я файлу - час і клас гри."""
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(self.directory, f"{stamp}_{type(game).__name__}.run")
+        return RunWriter(path, game, parameters)
+
+    def list_runs(self) -> list:
+        """Усі запуски в теці, від найстаріших до найновіших."""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(".run"))
+        return [StoredRun(os.path.join(self.directory, name)) for name in names]
+
+    def open(self, name: str) -> StoredRun:
+        """Відкриває запуск за шляхом або за ім'ям файлу в теці."""
+        if os.path.exists(name):
+            return StoredRun(name)
+        return StoredRun(os.path.join(self.directory, name))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m results_store",
+                                     description="Перегляд і порівняння збережених запусків.")
+    parser.add_argument("--dir", default=RUNS_DIR, help="тека із запусками")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="перелік запусків")
+    show_parser = commands.add_parser("show", help="переагрегувати запуск і показати підсумок")
+    show_parser.add_argument("run")
+    diff_parser = commands.add_parser("diff", help="порівняти два запуски")
+    diff_parser.add_argument("base")
+    diff_parser.add_argument("other")
+    args = parser.parse_args(argv)
+
+    store = ResultsStore(args.dir)
+    if args.command == "list":
+        for run in store.list_runs():
+            rtp = run.header.get("rtp")
+            rtp_text = f"RTP {rtp:.2f}%" if rtp is not None else ""
+            print(f"{os.path.basename(run.path)}  {run.header['game']}  {run.runs} раундів  "
+                  f"seed {run.seed}  {rtp_text}")
+    elif args.command == "show":
+        run = store.open(args.run)
+        sys.stdout.write(format_summary(run.game(), run.summary()))
+    else:
+        base, other = store.open(args.base), store.open(args.other)
+        sys.stdout.write(format_diff(base, other, diff_runs(base, other)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from game_logic import IGame
+from simulation import (CHUNK_SIZE, SimulationProgress, SimulationSummary, _play_chunk,
+                        resolve_seed)
+
+#стани завдання
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+
+#підписи станів для UI
+STATUS_LABELS = {
+    QUEUED: "у черзі",
+    RUNNING: "виконується",
+    DONE: "готово",
+    CANCELLED: "скасовано",
+    FAILED: "помилка",
+}
+
+
+#завдання планувальника
+@dataclass(eq=False)
+class ScheduledJob:
+    """
+    Одна симуляція в черзі планувальника: runs раундів гри пакетами по chunk_size.
+    priority - вага завдання: завдання з priority=2 отримує вдвічі більше пакетів,
+    ніж завдання з priority=1, поки обидва не завершаться.
+    Стан читається з будь-якого потоку (status, progress, wait()).
+    """
+    id: int
+    label: str
+    game: IGame = field(repr=False)
+    runs: int
+    seed: int
+    chunk_size: int
+    priority: float = 1.0
+    on_progress: object = field(default=None, repr=False)  #on_progress(SimulationProgress)
+    on_done: object = field(default=None, repr=False)      #on_done(ScheduledJob)
+    status: str = QUEUED
+    summary: SimulationSummary = None
+    progress: SimulationProgress = None  #знімок після останнього злитого пакета
+    error: str = None
+    started: float = None
+    elapsed_seconds: float = None
+    #скільки пакетів відправлено в пул і скільки з них ще рахуються
+    dispatched: int = field(default=0, repr=False)
+    in_flight: int = field(default=0, repr=False)
+    cancel_requested: bool = field(default=False, repr=False)
+    _ready: dict = field(default_factory=dict, repr=False)  #пакети, що прийшли не по черзі
+    _merged: int = field(default=0, repr=False)
+    _finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.runs // self.chunk_size)
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: float = None) -> SimulationSummary:
+        """Чекає завершення і повертає підсумок (для скасованого - цілі пакети до зупинки)."""
+        self._finished.wait(timeout)
+        return self.summary
+
+
+#планувальник пакетів
+class ChunkScheduler:
+    """
+    Кілька симуляцій одночасно на одному пулі процесів.
+    Завдання ріжуться на пакети сталого розміру, а наступний пакет у пул
+    отримує завдання з найменшою кількістю відправлених пакетів на одиницю
+    пріоритету (зважений round-robin), тож коротка гра в кості не чекає,
+    поки дограються 50M спінів слотів, а всі ядра зайняті, поки є робота.
+
+    Пакети кожного завдання зливаються в порядку номерів, тому підсумок
+    такий самий до біта, як у run_simulation() з тим самим seed.
+    """
+
+    def __init__(self, workers: int = None, max_pending: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        #трохи більше пакетів, ніж процесів: воркер не простоює, поки ми зливаємо результат
+        self.max_pending = max_pending or 2 * self.workers
+        self.jobs = []
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._ids = itertools.count(1)
+        self._closed = False
+
+    def submit(self, game: IGame, runs: int, seed: int = None, chunk_size: int = CHUNK_SIZE,
+               priority: float = 1.0, label: str = None, on_progress=None,
+               on_done=None) -> ScheduledJob:
+        """
+        Додає симуляцію в чергу і повертає її завдання.
+        on_progress і on_done викликаються з потоку пулу (не з потоку UI).
+        """
+        if runs < 0:
+            raise ValueError("Кількість раундів не може бути від'ємною")
+        if chunk_size <= 0:
+            #інакше завдання потрапило б у jobs і ламало б кожен наступний _next_job()
+            raise ValueError("Розмір пакета має бути додатним")
+        if priority <= 0:
+            raise ValueError("Пріоритет має бути додатним")
+        seed = resolve_seed(game, seed)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Планувальник зупинено")
+            job = ScheduledJob(
+                id=next(self._ids),
+                label=label or game.get_game_name(),
+                game=game,
+                runs=runs,
+                seed=seed,
+                chunk_size=chunk_size,
+                priority=priority,
+                on_progress=on_progress,
+                on_done=on_done,
+                summary=SimulationSummary(seed=seed),
+                started=time.perf_counter()
+            )
+            self.jobs.append(job)
+        if runs == 0:
+            self._finish(job, DONE)
+        else:
+            self._dispatch()
+        return job
+
+    def cancel(self, job: ScheduledJob):
+        """Зупиняє завдання: нові пакети не відправляються, уже відправлені доробляються."""
+        with self._lock:
+            if job.finished:
+                return
+            job.cancel_requested = True
+            finish = job.in_flight == 0
+        if finish:
+            self._finish(job, CANCELLED)
+
+    def active_jobs(self) -> list:
+        return [job for job in self.jobs if not job.finished]
+
+    def shutdown(self, cancel: bool = True):
+        """Зупиняє пул; cancel - скасувати незавершені завдання, інакше дочекатися їх."""
+        with self._lock:
+            self._closed = True
+        for job in self.active_jobs():
+            if cancel:
+                self.cancel(job)
+            job.wait()
+        self._executor.shutdown(cancel_futures=True)
+
+    def _next_job(self) -> ScheduledJob:
+        """Завдання, якому належить наступний пакет (викликається під self._lock)."""
+        candidates = [job for job in self.jobs
+                      if not job.cancel_requested and not job.finished
+                      and job.dispatched < job.chunk_count]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda job: (job.dispatched / job.priority, job.id))
+
+    def _dispatch(self):
+        """Доповнює пул пакетами, поки є місце і робота."""
+        while True:
+            with self._lock:
+                if self._in_flight >= self.max_pending:
+                    return
+                job = self._next_job()
+                if job is None:
+                    return
+                index = job.dispatched
+                job.dispatched += 1
+                job.in_flight += 1
+                job.status = RUNNING
+                self._in_flight += 1
+            runs = min(job.chunk_size, job.runs - index * job.chunk_size)
+            future = self._executor.submit(_play_chunk, job.game, runs, job.seed, index)
+            future.add_done_callback(lambda done, job=job, index=index: self._on_chunk(job, index, done))
+
+    def _on_chunk(self, job: ScheduledJob, index: int, future):
+        """Приймає готовий пакет (у потоці пулу), зливає по порядку і добирає нові пакети."""
+        progress = None
+        outcome = None
+        with self._lock:
+            self._in_flight -= 1
+            job.in_flight -= 1
+            if future.cancelled():
+                error = None
+            else:
+                error = future.exception()
+
+            if error is not None:
+                job.error = f"{type(error).__name__}: {error}"
+                job.cancel_requested = True
+            elif not future.cancelled() and not job.cancel_requested:
+                job._ready[index] = future.result()
+                #зливаємо всі пакети, що йдуть поспіль від уже злитих
+                merged_any = False
+                while job._merged in job._ready:
+                    job.summary.merge(job._ready.pop(job._merged))
+                    job._merged += 1
+                    merged_any = True
+                if merged_any:
+                    progress = SimulationProgress.from_summary(job.summary, job.runs, job.started)
+                    job.progress = progress
+
+            if job._merged == job.chunk_count:
+                outcome = DONE
+            elif job.cancel_requested and job.in_flight == 0 and not job.finished:
+                outcome = FAILED if job.error is not None else CANCELLED
+
+        if progress is not None and job.on_progress is not None:
+            job.on_progress(progress)
+        if outcome is not None:
+            self._finish(job, outcome)
+        self._dispatch()
+
+    def _finish(self, job: ScheduledJob, status: str):
+        with self._lock:
+            if job.finished:
+                return
+            job._ready.clear()
+            if status != DONE:
+                job.summary.cancelled = True
+            job.status = status
+            job.elapsed_seconds = time.perf_counter() - job.started
+            job._finished.set()
+        if job.on_done is not None:
+            job.on_done(job)
+
+
+def format_jobs(jobs: list) -> str:
+    """Таблиця стану завдань: рядок на завдання (для логу GUI)."""
+    lines = []
+    for job in jobs:
+        line = f"#{job.id} {job.label}: {STATUS_LABELS[job.status]}"
+        if job.priority != 1:
+            line += f" (пріоритет {job.priority:g})"
+        progress = job.progress
+        if progress is not None:
+            line += f" | {progress.runs_done} / {job.runs} раундів ({progress.fraction_done * 100:.0f} %)" \
+                    f" | RTP {progress.rtp:.2f} %"
+            if not job.finished:
+                line += f" | {progress.rounds_per_second:,.0f} раундів/с"
+        if job.elapsed_seconds is not None:
+            line += f" | {job.elapsed_seconds:.2f} с"
+        if job.error is not None:
+            line += f" | {job.error}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,470 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from game_logic import IGame
+from game_registry import REGISTRY
+from result_cache import SimulationCache
+from simulation import (CHUNK_SIZE, SimulationProgress, SimulationSummary, _play_chunk,
+                        resolve_seed, summary_to_dict)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+#стани завдання
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+FINISHED = (DONE, CANCELLED, FAILED)
+
+#найбільший запит, який приймає сервер (байтів тіла)
+MAX_BODY = 1024 * 1024
+#скільки завершених завдань тримати для GET /jobs/<id> (старіші забуваються)
+MAX_FINISHED_JOBS = 1000
+
+
+class JobError(ValueError):
+    """Некоректне завдання (невідома гра, параметри, кількість раундів)."""
+
+
+#завдання симуляції
+@dataclass(eq=False)
+class Job:
+    """
+    Одне завдання сервісу: гра game_key з параметрами config, runs раундів, seed.
+    Поки завдання виконується, progress оновлюється після кожного пакета,
+    а по завершенні summary містить підсумок (як у run_simulation()).
+    """
+    id: str
+    game_key: str
+    config: dict
+    runs: int
+    seed: int
+    chunk_size: int
+    game: IGame = field(repr=False)
+    status: str = QUEUED
+    progress: SimulationProgress = None
+    summary: SimulationSummary = None
+    source: str = None          #звідки результат: result_cache.HIT / EXTENDED / MISS
+    error: str = None
+    elapsed_seconds: float = None
+    dedup_key: tuple = field(default=None, repr=False)
+    cancel_requested: bool = field(default=False, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _finished: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def _publish(self):
+        """Будить усіх, хто чекає на зміну стану завдання."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+        if self.finished:
+            self._finished.set()
+
+    async def wait(self) -> "Job":
+        """Чекає завершення завдання."""
+        await self._finished.wait()
+        return self
+
+    async def watch(self):
+        """Асинхронний ітератор станів завдання (to_dict()) аж до завершення."""
+        while True:
+            changed = self._changed
+            yield self.to_dict(with_result=self.finished)
+            if self.finished:
+                return
+            await changed.wait()
+
+    def to_dict(self, with_result: bool = True) -> dict:
+        data = {
+            "id": self.id,
+            "game": self.game_key,
+            "config": self.config,
+            "runs": self.runs,
+            "seed": self.seed,
+            "chunk_size": self.chunk_size,
+            "status": self.status,
+            "progress": None,
+            "source": self.source,
+            "error": self.error,
+        }
+        if self.progress is not None:
+            data["progress"] = {
+                "runs_done": self.progress.runs_done,
+                "total_runs": self.progress.total_runs,
+                "win_rate": self.progress.win_rate,
+                "rtp": self.progress.rtp,
+                "rounds_per_second": self.progress.rounds_per_second,
+            }
+        if with_result and self.summary is not None and self.status in (DONE, CANCELLED):
+            data["result"] = summary_to_dict(self.game, self.summary)
+            data["elapsed_seconds"] = self.elapsed_seconds
+        return data
+
+
+#сервіс симуляцій
+class SimulationService:
+    """
+    Черга завдань симуляції поверх одного "теплого" пулу процесів.
+    Пакети всіх завдань ділять пул: у роботі не більше max_pending пакетів,
+    а місця в пулі видаються по черзі, тож довге завдання не блокує коротке.
+    Однакові завдання (гра, параметри, seed, раунди), що ще виконуються,
+    не дублюються: submit() повертає вже наявне. Готові підсумки береться
+    з SimulationCache, довший запуск дораховується від збереженого.
+
+    Результат завдання такий самий до біта, як у run_simulation() з тим самим seed.
+    Зберігається не більше max_finished_jobs завершених завдань: найстаріші
+    забуваються, щоб довго запущений сервіс не накопичував підсумки й ігри.
+    """
+
+    def __init__(self, workers: int = None, max_pending: int = None,
+                 cache: SimulationCache = None, registry=REGISTRY,
+                 max_finished_jobs: int = MAX_FINISHED_JOBS):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.max_finished_jobs = max_finished_jobs
+        self.cache = cache if cache is not None else SimulationCache()
+        self.registry = registry
+        self.jobs = {}
+        self._in_flight = {}   #ключ дедуплікації -> Job
+        self._tasks = set()
+        self._executor = None
+        self._slots = None
+
+    async def __aenter__(self) -> "SimulationService":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+        return False
+
+    def start(self):
+        """Запускає пул процесів (одразу, щоб перше завдання не чекало на старт воркерів)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+    async def close(self):
+        """Скасовує незавершені завдання і зупиняє пул."""
+        for job in self.jobs.values():
+            if not job.finished:
+                job.cancel_requested = True
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def submit(self, game: str, runs: int, seed: int = None, config: dict = None,
+               chunk_size: int = CHUNK_SIZE) -> Job:
+        """
+        Ставить завдання в чергу і повертає його (або однакове, що вже виконується).
+        Без seed береться випадковий, він записується в завдання.
+        """
+        self.start()
+        if config is None:
+            config = {}
+        if not isinstance(config, dict):
+            raise JobError("config має бути JSON-об'єктом")
+        config = dict(config)
+        if not isinstance(runs, int) or isinstance(runs, bool) or runs < 0:
+            raise JobError("runs має бути невід'ємним цілим числом")
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size <= 0:
+            raise JobError("chunk_size має бути додатним цілим числом")
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            raise JobError("seed має бути цілим числом")
+        try:
+            game_object = self.registry.create(game, **config)
+        except KeyError as error:
+            raise JobError(error.args[0]) from None
+        except (TypeError, ValueError) as error:
+            raise JobError(f"Гру '{game}' не вдалося створити: {error}") from None
+
+        dedup_key = None
+        if seed is not None and SimulationCache.cacheable(game_object):
+            dedup_key = (SimulationCache.key(game_object, seed, chunk_size), runs)
+            existing = self._in_flight.get(dedup_key)
+            if existing is not None:
+                return existing
+
+        job = Job(
+            id=uuid.uuid4().hex[:12],
+            game_key=game,
+            config=config,
+            runs=runs,
+            seed=resolve_seed(game_object, seed),
+            chunk_size=chunk_size,
+            game=game_object,
+            dedup_key=dedup_key
+        )
+        self.jobs[job.id] = job
+        if dedup_key is not None:
+            self._in_flight[dedup_key] = job
+        task = asyncio.get_running_loop().create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        try:
+            return self.jobs[job_id]
+        except KeyError:
+            raise KeyError(f"Невідоме завдання: '{job_id}'") from None
+
+    def cancel(self, job_id: str) -> Job:
+        """Просить завдання зупинитися (пакети, що вже граються, доробляються)."""
+        job = self.get(job_id)
+        if not job.finished:
+            job.cancel_requested = True
+            job._publish()
+        return job
+
+    async def run(self, game: str, runs: int, seed: int = None, config: dict = None,
+                  chunk_size: int = CHUNK_SIZE) -> Job:
+        """submit() і очікування результату."""
+        return await self.submit(game, runs, seed, config, chunk_size).wait()
+
+    async def _run(self, job: Job):
+        started = time.perf_counter()
+        try:
+            await self._simulate(job, started)
+        except Exception as error:
+            job.status = FAILED
+            job.error = f"{type(error).__name__}: {error}"
+        finally:
+            job.elapsed_seconds = time.perf_counter() - started
+            if job.dedup_key is not None and self._in_flight.get(job.dedup_key) is job:
+                del self._in_flight[job.dedup_key]
+            job._publish()
+            self._forget_finished()
+
+    def _forget_finished(self):
+        """Забуває найстаріші завершені завдання понад max_finished_jobs."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+
+    async def _simulate(self, job: Job, started: float):
+        cached = self.cache.get(job.game, job.seed, job.runs, job.chunk_size)
+        if cached is not None:
+            job.summary, job.source, job.status = cached, "hit", DONE
+            job.progress = SimulationProgress.from_summary(cached, job.runs, started)
+            return
+
+        summary = SimulationSummary(seed=job.seed)
+        prefix = self.cache.best_prefix(job.game, job.seed, job.runs, job.chunk_size)
+        first_chunk = 0
+        if prefix is not None:
+            summary.merge(prefix)
+            first_chunk = prefix.runs // job.chunk_size
+        job.source = "extended" if prefix is not None else "miss"
+        job.summary = summary
+        job.status = RUNNING
+        if summary.runs > 0:
+            job.progress = SimulationProgress.from_summary(summary, job.runs, started)
+        job._publish()
+
+        loop = asyncio.get_running_loop()
+        pending = asyncio.Queue()
+
+        async def submit_chunks():
+            """Віддає пакети в пул, щойно в ньому звільняється місце."""
+            for start in range(first_chunk * job.chunk_size, job.runs, job.chunk_size):
+                await self._slots.acquire()
+                if job.cancel_requested:
+                    self._slots.release()
+                    break
+                future = loop.run_in_executor(
+                    self._executor, _play_chunk, job.game,
+                    min(job.chunk_size, job.runs - start), job.seed, start // job.chunk_size
+                )
+                future.add_done_callback(lambda _: self._slots.release())
+                await pending.put(future)
+            await pending.put(None)
+
+        submitter = loop.create_task(submit_chunks())
+        try:
+            #підсумки пакетів зливаються по порядку, тож результат не залежить від пулу
+            while True:
+                future = await pending.get()
+                if future is None:
+                    break
+                chunk_summary = await future
+                if job.cancel_requested:
+                    break
+                summary.merge(chunk_summary)
+                job.progress = SimulationProgress.from_summary(summary, job.runs, started)
+                job._publish()
+        finally:
+            submitter.cancel()
+            while not pending.empty():
+                future = pending.get_nowait()
+                if future is not None:
+                    future.cancel()
+
+        if job.cancel_requested and summary.runs < job.runs:
+            summary.cancelled = True
+            job.status = CANCELLED
+        else:
+            job.status = DONE
+        self.cache.put(job.game, summary, job.chunk_size)
+
+    # --- HTTP ---
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """
+        Запускає локальний HTTP/JSON API:
+          GET    /games              - ігри з реєстру
+          POST   /jobs               - {"game", "runs", "seed", "config", "chunk_size"}
+          GET    /jobs               - усі завдання
+          GET    /jobs/<id>          - стан і результат завдання
+          GET    /jobs/<id>/events   - потік станів (NDJSON, рядок на пакет) до завершення
+          DELETE /jobs/<id>          - скасувати завдання
+        """
+        self.start()
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                method, path, body = await _read_request(reader)
+            except (ValueError, asyncio.IncompleteReadError):
+                await _write_json(writer, 400, {"error": "Некоректний HTTP-запит"})
+                return
+            await self._route(method, path, body, writer)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter):
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+
+        if parts == ["games"] and method == "GET":
+            games = []
+            for spec in self.registry.specs():
+                capabilities = spec.capabilities()
+                games.append({"key": spec.key, "label": spec.label, "config": spec.config,
+                              "batch": capabilities.batch, "analytic": capabilities.analytic})
+            await _write_json(writer, 200, games)
+            return
+
+        if parts == ["jobs"] and method == "GET":
+            await _write_json(writer, 200, [job.to_dict(with_result=False) for job in self.jobs.values()])
+            return
+
+        if parts == ["jobs"] and method == "POST":
+            try:
+                request = json.loads(body or b"{}")
+                if not isinstance(request, dict):
+                    raise JobError("тіло запиту має бути JSON-об'єктом")
+                jobs_before = len(self.jobs)
+                job = self.submit(request.get("game"), request.get("runs"), request.get("seed"),
+                                  request.get("config"), request.get("chunk_size", CHUNK_SIZE))
+            except ValueError as error:  #JobError і некоректний JSON
+                await _write_json(writer, 400, {"error": str(error)})
+                return
+            data = job.to_dict()
+            data["deduplicated"] = len(self.jobs) == jobs_before
+            await _write_json(writer, 202, data)
+            return
+
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await _write_json(writer, 404, {"error": f"Невідоме завдання: '{parts[1]}'"})
+                return
+            if len(parts) == 2 and method == "GET":
+                await _write_json(writer, 200, job.to_dict())
+                return
+            if len(parts) == 2 and method == "DELETE":
+                await _write_json(writer, 200, self.cancel(job.id).to_dict(with_result=False))
+                return
+            if parts[2:] == ["events"] and method == "GET":
+                await _write_head(writer, 200, "application/x-ndjson")
+                async for state in job.watch():
+                    writer.write(json.dumps(state, ensure_ascii=False).encode("utf-8") + b"\n")
+                    await writer.drain()
+                return
+
+        await _write_json(writer, 404, {"error": f"Немає такого ресурсу: {method} {path}"})
+
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found"}
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple:
+    """(метод, шлях, тіло) одного HTTP/1.1-запиту."""
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise ValueError("некоректний рядок запиту")
+    method, path, _ = request_line
+    length = 0
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if not 0 <= length <= MAX_BODY:
+        raise ValueError("некоректна довжина тіла")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, body
+
+
+async def _write_head(writer: asyncio.StreamWriter, status: int, content_type: str, length: int = None):
+    head = f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n" \
+           f"Content-Type: {content_type}; charset=utf-8\r\nConnection: close\r\n"
+    if length is not None:
+        head += f"Content-Length: {length}\r\n"
+    writer.write((head + "\r\n").encode("latin-1"))
+    await writer.drain()
+
+
+async def _write_json(writer: asyncio.StreamWriter, status: int, data):
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    await _write_head(writer, status, "application/json", len(body))
+    writer.write(body)
+    await writer.drain()
+
+
+async def _serve_forever(args):
+    cache = SimulationCache(directory=args.cache) if args.cache is not None else None
+    async with SimulationService(workers=args.workers, cache=cache,
+                                 max_finished_jobs=args.max_finished_jobs) as service:
+        server = await service.serve(args.host, args.port)
+        address = server.sockets[0].getsockname()
+        print(f"Сервіс симуляцій: http://{address[0]}:{address[1]} ({service.workers} процесів)",
+              flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m service",
+                                     description="Локальний HTTP/JSON сервіс симуляцій зі спільним пулом процесів.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="процесів у пулі (за замовчуванням - усі ядра)")
+    parser.add_argument("--cache", metavar="DIR", default=None, help="дисковий кеш підсумків")
+    parser.add_argument("--max-finished-jobs", type=int, default=MAX_FINISHED_JOBS,
+                        help="скільки завершених завдань пам'ятати для GET /jobs/<id>")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+from dataclasses import dataclass
+from fractions import Fraction
+from math import gcd, lcm
+
+import numpy as np
+
+from game_logic import IGame
+from simulation import chunk_rng
+
+#рівні квантилів кінцевого банкролу у звіті
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+#причини завершення сесії
+RUNNING, RUINED, STOPPED_LOSS, STOPPED_WIN = 0, 1, 2, 3
+
+
+#результати багатьох ігрових сесій
+@dataclass(eq=False)
+class SessionReport:
+    """
+    Підсумок сесій гравця (симульований або точний).
+    Сесія закінчується розоренням (банкрол менший за ставку), stop-loss,
+    stop-win або після max_rounds раундів.
+    """
+    sessions: int                   #кількість симульованих сесій (None для точного розрахунку)
+    max_rounds: int
+    ruin_probability: float
+    stop_loss_probability: float
+    stop_win_probability: float
+    ruin_round_probabilities: np.ndarray  #[k] - ймовірність розоритися саме на раунді k
+    final_bankroll_quantiles: dict  #рівень квантиля -> банкрол
+    mean_final_bankroll: float
+    mean_rounds_played: float
+    seed: int = None
+
+    def ruin_probability_by(self, rounds: int) -> float:
+        """Ймовірність розоритися не пізніше ніж за rounds раундів."""
+        return float(self.ruin_round_probabilities[:rounds + 1].sum())
+
+
+def _play_block(game: IGame, sessions: int, max_rounds: int, bankroll: float, bet: float,
+                stop_loss: float, stop_win: float, rng: np.random.Generator, window: int):
+    """
+    Грає блок сесій вікнами по window раундів: у кожному вікні всі живі сесії
+    отримують свої раунди одним викликом play_many, банкрол рахується через cumsum,
+    а завершені сесії випадають з наступних вікон.
+    """
+    balance = np.full(sessions, float(bankroll))
+    rounds_played = np.zeros(sessions, dtype=np.int64)
+    reasons = np.full(sessions, RUNNING, dtype=np.int8)
+    alive = np.arange(sessions)
+
+    floor = bankroll - stop_loss if stop_loss is not None else -np.inf
+    ceiling = bankroll + stop_win if stop_win is not None else np.inf
+
+    for start in range(0, max_rounds, window):
+        if alive.size == 0:
+            break
+        width = min(window, max_rounds - start)
+
+        deltas = game.play_many(alive.size * width, rng).money_deltas.reshape(alive.size, width)
+        path = balance[alive, None] + np.cumsum(deltas * bet, axis=1)
+
+        ruined = path < bet
+        stopped_loss = path <= floor
+        stopped_win = path >= ceiling
+        stopped = ruined | stopped_loss | stopped_win
+
+        has_stop = stopped.any(axis=1)
+        rows = np.arange(alive.size)
+        last = np.where(has_stop, stopped.argmax(axis=1), width - 1)
+
+        balance[alive] = path[rows, last]
+        rounds_played[alive] += last + 1
+
+        #розорення важливіше за stop-loss, якщо обидва сталися в одному раунді
+        reason = np.select(
+            [ruined[rows, last], stopped_loss[rows, last], stopped_win[rows, last]],
+            [RUINED, STOPPED_LOSS, STOPPED_WIN],
+            default=RUNNING
+        )
+        reasons[alive] = reason
+        alive = alive[~has_stop]
+
+    return balance, rounds_played, reasons
+
+
+def simulate_sessions(game: IGame, sessions: int, max_rounds: int, bankroll: float,
+                      bet: float = 1.0, stop_loss: float = None, stop_win: float = None,
+                      seed: int = None, window: int = 100,
+                      block_rounds: int = 5_000_000) -> SessionReport:
+    """
+    Симулює sessions незалежних сесій гравця зі стартовим банкролом bankroll
+    і ставкою bet за раунд (виграш/програш раунду множиться на bet).
+    stop_loss/stop_win - на скільки монет банкрол може впасти/вирости до зупинки.
+    Сесії обробляються блоками, щоб пам'ять не залежала від їх кількості.
+    """
+    if bankroll < bet:
+        raise ValueError("Стартовий банкрол менший за ставку: сесія не може початися")
+    if seed is None:
+        seed = game.seed
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    block_sessions = max(1, block_rounds // max(1, window))
+    finals, rounds, reasons = [], [], []
+    for block_index, start in enumerate(range(0, sessions, block_sessions)):
+        size = min(block_sessions, sessions - start)
+        block = _play_block(game, size, max_rounds, bankroll, bet, stop_loss, stop_win,
+                            chunk_rng(seed, block_index), window)
+        finals.append(block[0])
+        rounds.append(block[1])
+        reasons.append(block[2])
+
+    finals = np.concatenate(finals)
+    rounds = np.concatenate(rounds)
+    reasons = np.concatenate(reasons)
+
+    return SessionReport(
+        sessions=sessions,
+        max_rounds=max_rounds,
+        ruin_probability=float(np.mean(reasons == RUINED)),
+        stop_loss_probability=float(np.mean(reasons == STOPPED_LOSS)),
+        stop_win_probability=float(np.mean(reasons == STOPPED_WIN)),
+        ruin_round_probabilities=np.bincount(
+            rounds[reasons == RUINED], minlength=max_rounds + 1
+        ) / sessions,
+        final_bankroll_quantiles=dict(zip(QUANTILES, np.quantile(finals, QUANTILES).tolist())),
+        mean_final_bankroll=float(finals.mean()),
+        mean_rounds_played=float(rounds.mean()),
+        seed=seed
+    )
+
+
+def _common_unit(values: list) -> Fraction:
+    """Найбільший крок, кратні якого всі values (тоді банкрол - ціле число кроків)."""
+    numerator, denominator = 0, 1
+    for value in values:
+        value = Fraction(value)
+        numerator = gcd(numerator, value.numerator)
+        denominator = lcm(denominator, value.denominator)
+    return Fraction(numerator, denominator)
+
+
+def exact_sessions(game: IGame, max_rounds: int, bankroll: float, bet: float = 1.0,
+                   stop_loss: float = None, stop_win: float = None,
+                   max_states: int = 5_000_000) -> SessionReport:
+    """
+    Точний розподіл банкролу за max_rounds раундів без Монте-Карло.
+    Розподіл зміни балансу за раунд береться з outcome_space() гри, а банкрол
+    рахується як марковський ланцюг з поглинаючими станами (розорення, stop-loss,
+    stop-win): щораунду ймовірності живих станів зсуваються на кожну можливу зміну.
+    Обробляється лише діапазон станів, куди вже могла потрапити ймовірність.
+    Правила зупинки такі самі, як у simulate_sessions().
+    """
+    if bankroll < bet:
+        raise ValueError("Стартовий банкрол менший за ставку: сесія не може початися")
+
+    #розподіл зміни банкролу за раунд (з урахуванням ставки)
+    delta_probabilities = {}
+    for _, probability, _, money_delta in game.outcome_space():
+        delta = Fraction(money_delta) * Fraction(bet)
+        delta_probabilities[delta] = delta_probabilities.get(delta, 0) + probability
+
+    #переходимо до цілих кроків, щоб стани банкролу були індексами масиву
+    limits = [bankroll, bet] + [v for v in (stop_loss, stop_win) if v is not None]
+    unit = _common_unit(list(delta_probabilities) + limits)
+    steps = {int(delta / unit): float(p) for delta, p in delta_probabilities.items()}
+    start = int(Fraction(bankroll) / unit)
+    bet_level = int(Fraction(bet) / unit)
+
+    lowest_step = min(min(steps), 0)
+    highest_step = max(max(steps), 0)
+
+    #живі (не поглинуті) стани: [low, high]
+    low = bet_level
+    if stop_loss is not None:
+        low = max(low, start - int(Fraction(stop_loss) / unit) + 1)
+    if stop_win is not None:
+        high = start + int(Fraction(stop_win) / unit) - 1
+    else:
+        high = start + highest_step * max_rounds
+    size = high - low + 1
+    span = highest_step - lowest_step
+    if size + span > max_states:
+        raise ValueError(f"Забагато станів банкролу ({size + span}); збільште max_states")
+
+    alive = np.zeros(size)
+    alive[start - low] = 1.0
+    #final[g] - ймовірність закінчити з банкролом (low + lowest_step + g) кроків
+    final = np.zeros(size + span)
+    ruin_round_probabilities = np.zeros(max_rounds + 1)
+    stop_loss_probability = 0.0
+    stop_win_probability = 0.0
+    mean_rounds_played = 0.0
+
+    support_low = support_high = start - low
+    for round_number in range(1, max_rounds + 1):
+        source = alive[support_low:support_high + 1]
+        mean_rounds_played += source.sum()
+
+        #flow[j] - ймовірність опинитися у стані alive[support_low + lowest_step + j]
+        flow = np.zeros(len(source) + span)
+        for step, probability in steps.items():
+            offset = step - lowest_step
+            flow[offset:offset + len(source)] += source * probability
+
+        base = support_low + lowest_step
+        keep_from = max(0, -base)
+        keep_to = min(len(flow), size - base)
+
+        alive = np.zeros(size)
+        alive[base + keep_from:base + keep_to] = flow[keep_from:keep_to]
+
+        below = flow[:keep_from]
+        above = flow[keep_to:]
+        final[support_low:support_low + keep_from] += below
+        final[support_low + keep_to:support_low + len(flow)] += above
+
+        below_levels = low + base + np.arange(keep_from)
+        ruined = below[below_levels < bet_level].sum()
+        ruin_round_probabilities[round_number] = ruined
+        stop_loss_probability += below.sum() - ruined
+        stop_win_probability += above.sum()
+
+        support_low = max(0, support_low + lowest_step)
+        support_high = min(size - 1, support_high + highest_step)
+
+    final[-lowest_step:-lowest_step + size] += alive
+
+    levels = (low + lowest_step + np.arange(size + span)) * float(unit)
+    cumulative = np.cumsum(final)
+    quantiles = {
+        q: float(levels[min(np.searchsorted(cumulative, q - 1e-12), len(levels) - 1)])
+        for q in QUANTILES
+    }
+
+    return SessionReport(
+        sessions=None,
+        max_rounds=max_rounds,
+        ruin_probability=float(ruin_round_probabilities.sum()),
+        stop_loss_probability=float(stop_loss_probability),
+        stop_win_probability=float(stop_win_probability),
+        ruin_round_probabilities=ruin_round_probabilities,
+        final_bankroll_quantiles=quantiles,
+        mean_final_bankroll=float(np.dot(levels, final)),
+        mean_rounds_played=float(mean_rounds_played)
+    )
+
+
+def format_session_report(game: IGame, report: SessionReport) -> str:
+    """Текстовий звіт про сесії (для логу чи консолі)."""
+    if report.sessions is None:
+        text = f"--- Сесії гри '{game.get_game_name()}' (точний розрахунок, " \
+               f"до {report.max_rounds} раундів) ---\n"
+    else:
+        text = f"--- Сесії гри '{game.get_game_name()}' ({report.sessions} сесій, " \
+               f"до {report.max_rounds} раундів) ---\n"
+    text += f"Ймовірність розорення: {report.ruin_probability * 100:.2f} %\n"
+    if report.stop_loss_probability:
+        text += f"Зупинка по stop-loss: {report.stop_loss_probability * 100:.2f} %\n"
+    if report.stop_win_probability:
+        text += f"Зупинка по stop-win: {report.stop_win_probability * 100:.2f} %\n"
+    text += f"Середня кількість раундів: {report.mean_rounds_played:.1f}\n"
+    text += f"Середній кінцевий банкрол: {report.mean_final_bankroll:.2f}\n"
+    text += "Квантилі кінцевого банкролу: " + ", ".join(
+        f"{int(q * 100)}% - {value:g}" for q, value in report.final_bankroll_quantiles.items()
+    ) + "\n"
+    if report.seed is not None:
+        text += f"Seed: {report.seed}\n"
+    return text
@@ -0,0 +1,504 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from statistics import NormalDist
+
+import numpy as np
+
+from game_logic import IGame, SlotsGame
+from analysis import try_analyze
+from profiling import Profiler, phase, active as active_profiler
+from convergence import ConvergenceTrace, checkpoints_between
+
+#скільки раундів грає один пакет (і один виклик play_many)
+CHUNK_SIZE = 100_000
+
+def _count_outcomes(outcomes: np.ndarray) -> dict:
+    """Гістограма кодів результатів одного пакета."""
+    if outcomes.dtype.kind in "iu" and len(outcomes) > 0 and outcomes.min() >= 0:
+        #цілі невід'ємні коди рахуємо за O(n) без сортування
+        counts = np.bincount(outcomes)
+        codes = np.flatnonzero(counts)
+        return dict(zip(codes.tolist(), counts[codes].tolist()))
+
+    codes, counts = np.unique(outcomes, return_counts=True)
+    return dict(zip(codes.tolist(), counts.tolist()))
+
+#підсумок симуляції
+@dataclass
+class SimulationSummary:
+    """
+    Накопичувач результатів симуляції (або одного її пакета).
+    Пам'ять залежить лише від кількості різних результатів, а не від кількості раундів:
+    пакети додаються через add_batch(), підсумки пакетів зливаються через merge().
+    """
+    runs: int = 0
+    wins: int = 0
+    money_delta: float = 0.0
+    money_m2: float = 0.0  #сума квадратів відхилень від середнього (Велфорд), для дисперсії
+    histogram: dict = field(default_factory=dict)  #код результату -> кількість
+    seed: int = None
+    cancelled: bool = False  #симуляцію зупинили до кінця
+    #пакети раундів (ResultBatch), лише якщо їх явно попросили (keep_raw)
+    raw_chunks: list = field(default=None, repr=False, compare=False)
+    #фази профілювання пакета з процесу-воркера (див. profiling.py), до злиття
+    profile: dict = field(default=None, repr=False, compare=False)
+    #підсумки початків пакета до контрольних точок збіжності (див. convergence.py), до злиття
+    checkpoints: list = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_batch(cls, batch, keep_raw: bool = False) -> "SimulationSummary":
+        summary = cls()
+        summary.add_batch(batch, keep_raw)
+        return summary
+
+    def add_batch(self, batch, keep_raw: bool = False):
+        """Додає до підсумку пакет раундів (ResultBatch)."""
+        runs = len(batch)
+        if runs == 0:
+            return
+        money_delta = batch.total_money_delta()
+        mean = money_delta / runs
+        m2 = float(np.square(batch.money_deltas - mean).sum())
+        self._add_moments(runs, money_delta, m2)
+
+        self.wins += batch.total_wins()
+        self._add_histogram(_count_outcomes(batch.outcomes))
+        if keep_raw:
+            self._add_raw(batch)
+
+    def merge(self, other: "SimulationSummary"):
+        """Додає до цього підсумку результати іншого пакета."""
+        if other.runs > 0:
+            self._add_moments(other.runs, other.money_delta, other.money_m2)
+        self.wins += other.wins
+        self._add_histogram(other.histogram)
+        if other.raw_chunks is not None:
+            for batch in other.raw_chunks:
+                self._add_raw(batch)
+
+    def _add_moments(self, runs: int, money_delta: float, m2: float):
+        """
+        Зливає кількість, суму і M2 іншої вибірки з цими (паралельна формула Велфорда/Чана),
+        тож дисперсія стабільна навіть на мільярдах раундів.
+        """
+        if self.runs == 0:
+            self.runs, self.money_delta, self.money_m2 = runs, money_delta, m2
+            return
+        total = self.runs + runs
+        difference = money_delta / runs - self.money_delta / self.runs
+        self.money_m2 += m2 + difference * difference * self.runs * runs / total
+        self.runs = total
+        self.money_delta += money_delta
+
+    def _add_histogram(self, histogram: dict):
+        for code, count in histogram.items():
+            self.histogram[code] = self.histogram.get(code, 0) + count
+
+    def _add_raw(self, batch):
+        if self.raw_chunks is None:
+            self.raw_chunks = []
+        self.raw_chunks.append(batch)
+
+    @property
+    def raw_outcomes(self) -> np.ndarray:
+        """Уся послідовність кодів результатів (None, якщо keep_raw не вмикали)."""
+        if self.raw_chunks is None:
+            return None
+        return np.concatenate([batch.outcomes for batch in self.raw_chunks])
+
+    @property
+    def win_percentage(self) -> float:
+        if self.runs == 0:
+            return 0
+        return (self.wins / self.runs) * 100.0
+
+    @property
+    def rtp(self) -> float:
+        """RTP у відсотках: скільки з поставлених монет (по 1 за раунд) повернулося."""
+        if self.runs == 0:
+            return 0.0
+        return (self.money_delta + self.runs) / self.runs * 100
+
+    @property
+    def mean_delta(self) -> float:
+        """Середня зміна балансу за раунд."""
+        if self.runs == 0:
+            return 0.0
+        return self.money_delta / self.runs
+
+    @property
+    def variance(self) -> float:
+        """Вибіркова дисперсія зміни балансу за раунд."""
+        if self.runs < 2:
+            return 0.0
+        return self.money_m2 / (self.runs - 1)
+
+    def rtp_half_width(self, confidence: float = 0.99) -> float:
+        """Половина ширини довірчого інтервалу RTP (у відсоткових пунктах)."""
+        if self.runs < 2:
+            return math.inf
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return z * math.sqrt(self.variance / self.runs) * 100
+
+
+#проміжний стан симуляції для UI
+@dataclass
+class SimulationProgress:
+    """Знімок часткових результатів, який публікується після кожного пакета."""
+    runs_done: int
+    total_runs: int
+    win_rate: float          #у відсотках
+    rtp: float               #у відсотках
+    rounds_per_second: float
+    histogram: dict = field(default=None, repr=False)  #копія гістограми (для живого графіка)
+
+    @classmethod
+    def from_summary(cls, summary: SimulationSummary, total_runs: int,
+                     started: float) -> "SimulationProgress":
+        """Знімок поточного підсумку; started - time.perf_counter() на початку запуску."""
+        elapsed = time.perf_counter() - started
+        return cls(
+            runs_done=summary.runs,
+            total_runs=total_runs,
+            win_rate=summary.win_percentage,
+            rtp=summary.rtp,
+            rounds_per_second=summary.runs / elapsed if elapsed > 0 else 0.0,
+            histogram=dict(summary.histogram)
+        )
+
+    @property
+    def fraction_done(self) -> float:
+        if self.total_runs == 0:
+            return 1.0
+        return self.runs_done / self.total_runs
+
+
+def chunk_rng(seed: int, chunk_index: int) -> np.random.Generator:
+    """
+    Генератор для пакета номер chunk_index.
+    Кожен пакет отримує власний незалежний потік, похідний від головного seed,
+    тому результат не залежить від того, який процес рахував пакет.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+
+
+def _play_chunk(game: IGame, runs: int, seed: int, chunk_index: int,
+                keep_raw: bool = False, profile: bool = False,
+                trace_start: int = None) -> SimulationSummary:
+    """
+    Рахує один пакет (виконується у процесі-воркері).
+    profile - профілювати пакет власним профайлером: активний профайлер
+    головного процесу у воркер не потрапляє, тож фази повертаються в summary.profile.
+    trace_start - номер раунду перед пакетом у запуску: тоді для контрольних точок
+    збіжності, що потрапляють у пакет, рахуються підсумки його початків (summary.checkpoints).
+    """
+    if profile:
+        with Profiler() as profiler:
+            summary = _play_chunk(game, runs, seed, chunk_index, keep_raw, trace_start=trace_start)
+        summary.profile = profiler.phases
+        return summary
+
+    batch = game.play_many(runs, chunk_rng(seed, chunk_index))
+    with phase("aggregate"):
+        summary = SimulationSummary.from_batch(batch, keep_raw)
+        if trace_start is not None:
+            summary.checkpoints = _checkpoint_prefixes(batch, trace_start)
+        return summary
+
+
+def _checkpoint_prefixes(batch, start: int) -> list:
+    """Моменти перших раундів пакета до кожної контрольної точки в ньому (без гістограм)."""
+    prefixes = []
+    for point in checkpoints_between(start, start + len(batch)):
+        deltas = batch.money_deltas[:point - start]
+        money_delta = float(deltas.sum())
+        prefixes.append(SimulationSummary(
+            runs=len(deltas),
+            wins=int(np.count_nonzero(batch.wins[:point - start])),
+            money_delta=money_delta,
+            money_m2=float(np.square(deltas - money_delta / len(deltas)).sum())
+        ))
+    return prefixes
+
+
+def run_simulation(game: IGame, num_runs: int, seed: int = None,
+                   workers: int = None, chunk_size: int = CHUNK_SIZE,
+                   keep_raw: bool = False, on_progress=None,
+                   cancel_event=None, sink=None,
+                   resume: "SimulationSummary" = None,
+                   trace: ConvergenceTrace = None) -> SimulationSummary:
+    """
+    Запускає num_runs раундів гри, розподіляючи пакети по процесах.
+    При однаковому seed результат однаковий до біта; без seed береться game.seed,
+    а якщо й його немає - випадковий (він записується в summary.seed).
+    Окремі результати раундів не зберігаються, якщо не передано keep_raw=True.
+
+    on_progress(SimulationProgress) викликається після кожного пакета;
+    якщо cancel_event (threading.Event) встановлено, симуляція зупиняється
+    не пізніше ніж через один пакет.
+    sink (напр. results_store.RunWriter) отримує кожен пакет раундів через
+    sink.write(batch) по порядку - так запуск пишеться на диск без накопичення в пам'яті.
+
+    resume - підсумок перших пакетів цього ж запуску (той самий seed і chunk_size,
+    лише цілі пакети): симулюються тільки пакети після нього, а результат
+    такий самий до біта, як у запуску з нуля.
+
+    trace (convergence.ConvergenceTrace) отримує поточні RTP і частку виграшів
+    на контрольних точках 10, 20, 50, ... раундів; з resume - лише точки після нього.
+    """
+    seed = resolve_seed(game, seed)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    play_raw = keep_raw or sink is not None
+
+    first_chunk = 0
+    summary = SimulationSummary(seed=seed)
+    if resume is not None:
+        if resume.seed != seed or resume.runs % chunk_size or resume.runs > num_runs:
+            raise ValueError("resume має бути підсумком цілих пакетів запуску з тим самим seed")
+        if play_raw:
+            raise ValueError("resume не можна поєднувати з keep_raw чи sink")
+        first_chunk = resume.runs // chunk_size
+        summary.merge(resume)
+
+    chunk_sizes = [min(chunk_size, num_runs - start)
+                   for start in range(first_chunk * chunk_size, num_runs, chunk_size)]
+
+    trace_start = summary.runs if trace is not None else None
+    #для одного процесу пул лише додає витрат на запуск
+    if workers == 1 or len(chunk_sizes) <= 1:
+        chunk_summaries = _iter_chunks(None, game, seed, chunk_sizes, first_chunk, play_raw,
+                                       trace_start)
+        _collect_chunks(summary, chunk_summaries, num_runs, on_progress, cancel_event,
+                        sink, keep_raw, trace)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_summaries = _iter_chunks(executor, game, seed, chunk_sizes, first_chunk, play_raw,
+                                           trace_start)
+            _collect_chunks(summary, chunk_summaries, num_runs, on_progress, cancel_event,
+                            sink, keep_raw, trace)
+            if summary.cancelled:
+                executor.shutdown(cancel_futures=True)
+
+    return summary
+
+
+def resolve_seed(game: IGame, seed: int) -> int:
+    """Явний seed, інакше seed гри, інакше випадковий (він записується в підсумок)."""
+    if seed is None:
+        seed = game.seed
+    elif seed < 0:
+        raise ValueError(f"seed має бути невід'ємним цілим, отримано {seed}")
+    if seed is None:
+        #випадковий seed теж записується в підсумок, щоб запуск можна було повторити
+        seed = np.random.SeedSequence().entropy
+    return seed
+
+
+def _iter_chunks(executor, game: IGame, seed: int, chunk_sizes: list,
+                 first_chunk: int, keep_raw: bool = False, trace_start: int = None):
+    """
+    Підсумки пакетів first_chunk, first_chunk + 1, ... по порядку.
+    Без пулу (executor=None) пакети рахуються ліниво: наступний не почнеться,
+    якщо симуляцію скасовано; з пулом усі пакети відправляються одразу.
+    trace_start - скільки раундів запуску зіграно до першого з цих пакетів,
+    якщо потрібні контрольні точки збіжності.
+    """
+    starts = [None] * len(chunk_sizes)
+    if trace_start is not None:
+        starts = (trace_start + np.cumsum([0] + chunk_sizes[:-1])).tolist()
+
+    if executor is None:
+        return (_play_chunk(game, size, seed, first_chunk + index, keep_raw, trace_start=start)
+                for index, (size, start) in enumerate(zip(chunk_sizes, starts)))
+
+    profile = active_profiler() is not None
+    args = [(game, size, seed, first_chunk + index, keep_raw, profile, start)
+            for index, (size, start) in enumerate(zip(chunk_sizes, starts))]
+
+    futures = [executor.submit(_play_chunk, *chunk_args) for chunk_args in args]
+    #результати беремо по порядку, тож зливаємо їх завжди однаково
+    return (future.result() for future in futures)
+
+
+def run_until_precision(game: IGame, target_half_width: float, confidence: float = 0.99,
+                        seed: int = None, workers: int = None, chunk_size: int = 10_000,
+                        min_runs: int = 100_000, max_runs: int = None,
+                        on_progress=None, cancel_event=None, sink=None,
+                        trace: ConvergenceTrace = None) -> SimulationSummary:
+    """
+    Симулює, поки довірчий інтервал RTP (рівня confidence) не стане вужчим
+    за ±target_half_width відсоткових пунктів, і повертає підсумок.
+
+    Пакети мають сталий розмір і власні потоки (як у run_simulation), а кількість
+    пакетів у кожному кроці береться з поточної оцінки дисперсії (не більше ніж
+    подвоєння зіграного), тому результат для seed не залежить від кількості процесів.
+    min_runs захищає від зупинки, поки рідкісні великі виграші ще не траплялися.
+    sink і trace - як у run_simulation().
+    """
+    if not target_half_width > 0:
+        #0 дав би ділення на нуль в оцінці кроку, а від'ємна точність недосяжна
+        raise ValueError(f"Точність має бути додатною, отримано {target_half_width}")
+    seed = resolve_seed(game, seed)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    summary = SimulationSummary(seed=seed)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    next_chunk = 0
+    started = time.perf_counter()
+    try:
+        while True:
+            if summary.runs >= min_runs and summary.rtp_half_width(confidence) <= target_half_width:
+                break
+            if max_runs is not None and summary.runs >= max_runs:
+                break
+
+            #скільки раундів ще потрібно за поточною оцінкою дисперсії
+            if summary.runs >= 2 and summary.variance > 0:
+                required = (z * math.sqrt(summary.variance) * 100 / target_half_width) ** 2
+            else:
+                required = min_runs
+            missing = max(required, min_runs) - summary.runs
+            chunks = math.ceil(max(missing, 1) / chunk_size)
+            chunks = min(chunks, max(1, summary.runs // chunk_size))  #не більше ніж подвоєння
+            if max_runs is not None:
+                chunks = min(chunks, math.ceil((max_runs - summary.runs) / chunk_size))
+
+            sizes = [chunk_size] * chunks
+            if max_runs is not None:
+                sizes[-1] = min(chunk_size, max_runs - summary.runs - chunk_size * (chunks - 1))
+            estimated_total = max(int(required), summary.runs + sum(sizes))
+
+            #пакети зливаються прямо в підсумок, щоб контрольні точки бачили весь запуск
+            chunk_summaries = _iter_chunks(executor, game, seed, sizes, next_chunk,
+                                           sink is not None,
+                                           summary.runs if trace is not None else None)
+            _collect_chunks(summary, chunk_summaries, summary.runs + sum(sizes), None,
+                            cancel_event, sink, trace=trace)
+            next_chunk += chunks
+
+            if on_progress is not None:
+                on_progress(SimulationProgress.from_summary(summary, estimated_total, started))
+            if summary.cancelled:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return summary
+
+
+def _collect_chunks(summary: SimulationSummary, chunk_summaries, total_runs: int,
+                    on_progress, cancel_event, sink=None, keep_raw: bool = False,
+                    trace: ConvergenceTrace = None):
+    """
+    Зливає підсумки пакетів по порядку, після кожного публікує прогрес
+    і перевіряє, чи не просили зупинитися.
+    Сирі пакети віддаються в sink і лишаються в підсумку, лише якщо keep_raw.
+    Контрольні точки пакета (зігране до нього + початок пакета) пишуться в trace.
+    Якщо активний профайлер, кожен крок міряється як окрема фаза
+    ("play" - гра пакета або очікування воркера, "sink", "merge", "progress").
+    """
+    started = time.perf_counter()
+    profiler = active_profiler()
+    chunk_summaries = iter(chunk_summaries)
+    while True:
+        with phase("play"):
+            chunk_summary = next(chunk_summaries, None)
+            if chunk_summary is not None and chunk_summary.profile is not None:
+                profiler.merge(chunk_summary.profile)
+                chunk_summary.profile = None
+        if chunk_summary is None:
+            break
+        if profiler is not None:
+            profiler.add_rounds(chunk_summary.runs)
+
+        if sink is not None:
+            with phase("sink"):
+                for batch in chunk_summary.raw_chunks or []:
+                    sink.write(batch)
+            if not keep_raw:
+                chunk_summary.raw_chunks = None
+        with phase("merge"):
+            if trace is not None:
+                _record_checkpoints(trace, summary, chunk_summary)
+            summary.merge(chunk_summary)
+            if trace is not None:
+                trace.set_last(summary.runs, summary.wins, summary.money_delta, summary.money_m2)
+
+        if on_progress is not None:
+            with phase("progress"):
+                on_progress(SimulationProgress.from_summary(summary, total_runs, started))
+
+        if cancel_event is not None and cancel_event.is_set() and summary.runs < total_runs:
+            summary.cancelled = True
+            return
+
+
+def _record_checkpoints(trace: ConvergenceTrace, summary: SimulationSummary,
+                       chunk_summary: SimulationSummary):
+    """Пише в trace точки пакета: підсумок до пакета, злитий з початком пакета."""
+    for prefix in chunk_summary.checkpoints or []:
+        point = SimulationSummary(runs=summary.runs, wins=summary.wins,
+                                  money_delta=summary.money_delta, money_m2=summary.money_m2)
+        point.merge(prefix)
+        trace.record(point.runs, point.wins, point.money_delta, point.money_m2)
+    chunk_summary.checkpoints = None
+
+
+def format_summary(game: IGame, summary: SimulationSummary, confidence: float = None) -> str:
+    """
+    Текстовий звіт, який GUI виводить у лог.
+    Якщо задано confidence, додається довірчий інтервал RTP.
+    """
+    rtp_text = ""
+    if isinstance(game, SlotsGame) and summary.runs > 0:
+        rtp_text = f"RTP (Return To Player): {summary.rtp:.2f}%\n"
+
+    result_text = ""
+    result_text += f"--- Запуск гри '{game.get_game_name()}' ({summary.runs} разів) ---\n"
+    if summary.cancelled:
+        result_text += "\n--- СИМУЛЯЦІЮ СКАСОВАНО (показано зіграні раунди) ---\n"
+    else:
+        result_text += "\n--- СТАТИСТИКА ЗАВЕРШЕНА ---\n"
+    result_text += f"Всього виграшів: {summary.wins} ({summary.win_percentage:.2f} %)\n"
+    result_text += f"Чистий прибуток/збиток: {summary.money_delta} монет\n"
+    result_text += rtp_text
+    if confidence is not None and summary.runs > 1:
+        result_text += (f"RTP: {summary.rtp:.3f}% ± {summary.rtp_half_width(confidence):.3f}% "
+                        f"(довіра {confidence * 100:g}%)\n")
+    result_text += f"Seed: {summary.seed}\n"
+
+    #поруч із симуляцією показуємо точну теорію, якщо гра її має
+    analysis = try_analyze(game)
+    if analysis is not None and summary.runs > 0:
+        expected_total = float(analysis.expected_delta) * summary.runs
+        result_text += "\n--- ТЕОРІЯ (точний розрахунок) ---\n"
+        result_text += f"Ймовірність виграшу: {float(analysis.win_probability) * 100:.2f} %\n"
+        result_text += f"Очікуваний прибуток/збиток: {expected_total:.2f} монет\n"
+        result_text += f"RTP: {analysis.rtp:.2f}% (σ за раунд: {analysis.std:.3f})\n"
+    return result_text
+
+
+def summary_to_dict(game: IGame, summary: SimulationSummary) -> dict:
+    """Підсумок у вигляді словника для JSON/CSV (ключі гістограми - рядки для UI)."""
+    return {
+        "game": game.get_game_name(),
+        "runs": summary.runs,
+        "seed": summary.seed,
+        "cancelled": summary.cancelled,
+        "wins": summary.wins,
+        "win_percentage": summary.win_percentage,
+        "money_delta": summary.money_delta,
+        "rtp": summary.rtp if summary.runs > 0 else None,
+        "variance": summary.variance,
+        "histogram": {
+            str(game.decode_outcome(code)): count
+            for code, count in sorted(summary.histogram.items())
+        }
+    }
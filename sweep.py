@@ -0,0 +1,210 @@
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+
+from analysis import try_analyze
+from game_registry import REGISTRY, GameSpec
+from simulation import run_simulation
+
+#скільки раундів симулювати для точки, якщо точної моделі немає
+DEFAULT_RUNS = 1_000_000
+
+#сума цілих ваг, до якої округлюються знайдені ваги (вміщується в таблицю "квитків" слотів)
+WEIGHT_TOTAL = 10_000
+
+
+#результат однієї точки перебору
+@dataclass
+class SweepPoint:
+    """Характеристики гри з параметрами config: точні або симульовані."""
+    config: dict
+    method: str               #"exact" або "simulated"
+    rtp: float                #у відсотках
+    hit_rate: float           #частка виграшних раундів, у відсотках
+    variance: float           #дисперсія зміни балансу за раунд
+    runs: int = None          #лише для симуляції
+    rtp_half_width: float = None  #99% інтервал RTP, лише для симуляції
+
+
+def grid(**axes) -> list:
+    """
+    Усі комбінації значень осей: grid(weights=[w1, w2], payouts=[p1]) -> 2 конфігурації.
+    Кожна вісь - список можливих значень одного параметра конструктора.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def random_configs(count: int, seed: int = None, **axes) -> list:
+    """count різних випадкових комбінацій значень осей (або всі, якщо їх менше)."""
+    combinations = math.prod(len(values) for values in axes.values())
+    rng = random.Random(seed)
+    if combinations <= count:
+        return grid(**axes)
+    chosen = sorted(rng.sample(range(combinations), count))
+    names = list(axes)
+    configs = []
+    for index in chosen:
+        config = {}
+        for name in reversed(names):
+            index, position = divmod(index, len(axes[name]))
+            config[name] = axes[name][position]
+        configs.append({name: config[name] for name in names})
+    return configs
+
+
+def evaluate(spec: GameSpec, config: dict, runs: int = DEFAULT_RUNS, seed: int = 0) -> SweepPoint:
+    """
+    Оцінює одну точку найдешевшим способом: точний розрахунок, якщо гра його має,
+    інакше пакетна симуляція (усі точки з тим самим seed - так різниця між ними менш шумна).
+    """
+    game = spec.create(**config)
+    analysis = try_analyze(game)
+    if analysis is not None:
+        return SweepPoint(config=config, method="exact", rtp=analysis.rtp,
+                          hit_rate=float(analysis.win_probability) * 100,
+                          variance=float(analysis.variance))
+
+    summary = run_simulation(game, runs, seed=seed, workers=1)
+    return SweepPoint(config=config, method="simulated", rtp=summary.rtp,
+                      hit_rate=summary.win_percentage, variance=summary.variance,
+                      runs=summary.runs, rtp_half_width=summary.rtp_half_width())
+
+
+def run_sweep(game_key: str, configs: list, runs: int = DEFAULT_RUNS, seed: int = 0,
+              workers: int = None, registry=REGISTRY) -> list:
+    """
+    Оцінює кожну конфігурацію гри game_key; точки рахуються паралельно
+    у пулі процесів, а результати повертаються в порядку configs.
+    """
+    spec = registry.get(game_key)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(configs) <= 1:
+        return [evaluate(spec, config, runs, seed) for config in configs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(evaluate, spec, config, runs, seed) for config in configs]
+        return [future.result() for future in futures]
+
+
+def in_band(points: list, rtp_low: float, rtp_high: float) -> list:
+    """Точки з RTP у смузі [rtp_low, rtp_high], найближчі до її середини - першими."""
+    middle = (rtp_low + rtp_high) / 2
+    matching = [point for point in points if rtp_low <= point.rtp <= rtp_high]
+    return sorted(matching, key=lambda point: abs(point.rtp - middle))
+
+
+def _tilted_weights(weights: list, payouts: list, tilt: float) -> list:
+    """Ваги, зсунуті до дорогих символів (tilt > 0) чи дешевих (tilt < 0), у цілих квитках."""
+    raw = [weight * (payout + 1) ** tilt for weight, payout in zip(weights, payouts)]
+    total = sum(raw)
+    return [max(1, round(value / total * WEIGHT_TOTAL)) for value in raw]
+
+
+def find_weights(game_key: str, rtp_low: float, rtp_high: float, config: dict = None,
+                 runs: int = DEFAULT_RUNS, seed: int = 0, registry=REGISTRY,
+                 max_steps: int = 60) -> SweepPoint:
+    """
+    Шукає ваги символів, з якими RTP гри потрапляє в смугу [rtp_low, rtp_high].
+    Ваги змінюються одним параметром нахилу: weight * (payout + 1) ** tilt,
+    а RTP росте разом із нахилом, тож нахил шукається бісекцією.
+    Повертає точку зі знайденими вагами (у config) або None, якщо смуга недосяжна.
+    Гра має приймати параметри weights і payouts (як SlotsGame).
+    """
+    spec = registry.get(game_key)
+    base = spec.create(**(config or {}))
+    weights, payouts = list(base.WEIGHTS), list(base.PAYOUTS)
+    middle = (rtp_low + rtp_high) / 2
+
+    def point_for(tilt: float) -> SweepPoint:
+        return evaluate(spec, {**(config or {}), "weights": _tilted_weights(weights, payouts, tilt)},
+                        runs, seed)
+
+    low, high = -4.0, 4.0
+    best = None
+    for _ in range(max_steps):
+        tilt = (low + high) / 2
+        point = point_for(tilt)
+        if best is None or abs(point.rtp - middle) < abs(best.rtp - middle):
+            best = point
+        if rtp_low <= point.rtp <= rtp_high:
+            return point
+        if point.rtp < rtp_low:
+            low = tilt
+        else:
+            high = tilt
+    return best if rtp_low <= best.rtp <= rtp_high else None
+
+
+def format_table(points: list) -> str:
+    """Таблиця результатів перебору."""
+    lines = [f"{'RTP, %':>10} {'±99%':>8} {'виграші, %':>11} {'дисперсія':>12} {'метод':>10}  параметри"]
+    for point in points:
+        half_width = f"{point.rtp_half_width:.3f}" if point.rtp_half_width is not None else "-"
+        lines.append(f"{point.rtp:>10.3f} {half_width:>8} {point.hit_rate:>11.3f} "
+                     f"{point.variance:>12.3f} {point.method:>10}  "
+                     f"{json.dumps(point.config, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sweep",
+                                     description="Перебір параметрів гри (ваг, таблиць виплат).")
+    parser.add_argument("--game", default="slots", help="ключ гри з реєстру")
+    parser.add_argument("--grid", metavar="FILE",
+                        help='JSON з осями перебору, напр. {"weights": [[...], [...]], "payouts": [[...]]}')
+    parser.add_argument("--random", type=int, default=None, metavar="N",
+                        help="замість повної сітки - N випадкових комбінацій")
+    parser.add_argument("--target-rtp", type=float, nargs=2, metavar=("LOW", "HIGH"),
+                        help="з --grid: лишити точки в смузі RTP; без --grid: підібрати ваги під смугу")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="раундів на точку, якщо гра не має точної моделі")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    args = parser.parse_args(argv)
+
+    if args.grid is None:
+        if args.target_rtp is None:
+            parser.error("потрібен --grid або --target-rtp")
+        point = find_weights(args.game, *args.target_rtp, runs=args.runs, seed=args.seed)
+        if point is None:
+            print("Смуга RTP недосяжна зміною ваг.", file=sys.stderr)
+            return 1
+        points = [point]
+    else:
+        with open(args.grid, encoding="utf-8") as file:
+            axes = json.load(file)
+        if args.random is not None:
+            configs = random_configs(args.random, args.seed, **axes)
+        else:
+            configs = grid(**axes)
+        points = run_sweep(args.game, configs, runs=args.runs, seed=args.seed, workers=args.workers)
+        if args.target_rtp is not None:
+            points = in_band(points, *args.target_rtp)
+
+    if args.format == "text":
+        sys.stdout.write(format_table(points))
+    elif args.format == "json":
+        json.dump([asdict(point) for point in points], sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(asdict(points[0])) if points else ["config"])
+        writer.writeheader()
+        for point in points:
+            row = asdict(point)
+            row["config"] = json.dumps(row["config"], ensure_ascii=False)
+            writer.writerow(row)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,525 @@
+from fractions import Fraction
+
+import numpy as np
+
+from game_logic import IGame, GameResult, ResultBatch, Wager
+from profiling import phase
+
+#червоні номери європейської рулетки
+RED_NUMBERS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+
+#зовнішні ставки рулетки: назва -> номери, які вона покриває
+OUTSIDE_BETS = {
+    "red": sorted(RED_NUMBERS),
+    "black": sorted(set(range(1, 37)) - RED_NUMBERS),
+    "even": list(range(2, 37, 2)),
+    "odd": list(range(1, 37, 2)),
+    "low": list(range(1, 19)),
+    "high": list(range(19, 37)),
+    "dozen1": list(range(1, 13)),
+    "dozen2": list(range(13, 25)),
+    "dozen3": list(range(25, 37)),
+    "column1": list(range(1, 37, 3)),
+    "column2": list(range(2, 37, 3)),
+    "column3": list(range(3, 37, 3)),
+}
+
+#скільки номерів покривають внутрішні ставки: стрейт, спліт, стріт, корнер, сікслайн
+INSIDE_BET_SIZES = (1, 2, 3, 4, 6)
+
+
+def covered_numbers(bet: str, numbers=None) -> list:
+    """Номери, які покриває ставка рулетки (зовнішня з OUTSIDE_BETS або "numbers")."""
+    if bet == "numbers":
+        if isinstance(numbers, int):
+            numbers = [numbers]
+        if not numbers or len(set(numbers)) != len(numbers) or len(numbers) not in INSIDE_BET_SIZES \
+                or not all(0 <= number <= 36 for number in numbers):
+            raise ValueError("numbers - 1, 2, 3, 4 або 6 різних номерів 0-36")
+        return [int(number) for number in numbers]
+    if bet in OUTSIDE_BETS:
+        if numbers is not None:
+            raise ValueError(f"Ставка '{bet}' не приймає numbers")
+        return OUTSIDE_BETS[bet]
+    raise ValueError(f"Невідома ставка: '{bet}'")
+
+
+#гра "Європейська рулетка"
+class RouletteGame(IGame):
+    """
+    Європейська рулетка (37 секторів, одне зеро), одна ставка в 1 монету на спін.
+    bet - зовнішня ставка з OUTSIDE_BETS або "numbers" (внутрішня ставка на номери
+    numbers: 1 номер - straight, 2 - split, 3 - street, 4 - corner, 6 - line).
+    Виплата за ставку на k номерів - 36 / k - 1 до 1, як у казино.
+    play_wagers() приймає будь-які з цих ставок одночасно (value - номери для "numbers").
+    """
+    POCKETS = 37
+
+    def __init__(self, bet: str = "red", numbers: list = None, rng=None, seed: int = None):
+        super().__init__(rng, seed)
+        covered = covered_numbers(bet, numbers)
+        self.bet = bet
+        self.numbers = covered if bet == "numbers" else None
+
+        self.payout = 36 / len(covered) - 1
+        self._win_table = np.zeros(self.POCKETS, dtype=bool)
+        self._win_table[covered] = True
+        self._delta_table = np.where(self._win_table, self.payout, -1.0)
+        self._decoder = self.decode_outcome
+
+    def get_game_name(self) -> str:
+        return "Європейська рулетка"
+
+    def get_config(self) -> dict:
+        return {"bet": self.bet, "numbers": self.numbers}
+
+    def play_once(self) -> GameResult:
+        pocket = self.py_rng.randrange(self.POCKETS)
+        return GameResult(
+            outcome=pocket,
+            is_win=bool(self._win_table[pocket]),
+            money_delta=float(self._delta_table[pocket]),
+            decoder=self._decoder
+        )
+
+    def play_many(self, n: int, rng: np.random.Generator = None) -> ResultBatch:
+        if rng is None:
+            rng = self.np_rng
+        with phase("draw"):
+            pockets = rng.integers(0, self.POCKETS, size=n, dtype=np.int8)
+        with phase("score"):
+            return ResultBatch(
+                outcomes=pockets,
+                wins=self._win_table[pockets],
+                money_deltas=self._delta_table[pockets],
+                decoder=self._decoder
+            )
+
+    def draw_wager_codes(self, n: int, rng: np.random.Generator = None) -> np.ndarray:
+        return self.play_many(n, rng).outcomes
+
+    def wager_payouts(self, wager: Wager) -> np.ndarray:
+        if wager.bet == "main":
+            return self._delta_table
+        covered = covered_numbers(wager.bet, wager.value)
+        wins = np.zeros(self.POCKETS, dtype=bool)
+        wins[covered] = True
+        return np.where(wins, 36 / len(covered) - 1, -1.0)
+
+    def decode_outcome(self, code):
+        if code == 0:
+            return "0 зеро"
+        return f"{code} {'червоне' if code in RED_NUMBERS else 'чорне'}"
+
+    def outcome_space(self) -> list:
+        return [(pocket, Fraction(1, self.POCKETS), bool(self._win_table[pocket]),
+                 float(self._delta_table[pocket]))
+                for pocket in range(self.POCKETS)]
+
+
+#спільна основа ігор з черевиком карт
+class ShoeGame(IGame):
+    """
+    Гра, що роздається з черевика на decks колод до розрізної карти (penetration).
+    Черевик - масив цілих значень карт (int8), без об'єктів карт; роздачі
+    ведуться одночасно в багатьох черевиках: на кожному кроці кожен черевик
+    роздає одну руку, і це одна векторна операція на всі черевики.
+
+    Кожен виклик play_many() починає зі свіжих черевиків, тож пакети
+    незалежні (як окремі сесії гри) і відтворювані від свого генератора.
+    Підкласи задають CARD_VALUES (значення карт однієї колоди)
+    і _play_rounds(cards, positions) -> (коди, виграші, зміни балансу, нові позиції).
+    """
+    CARD_VALUES = []
+    #середня кількість карт на роздачу: з неї оцінюється, скільки черевиків тасувати
+    AVERAGE_CARDS_PER_ROUND = 5.0
+    #скільки карт роздача може взяти після розрізної карти (запас у кінці черевика)
+    MAX_CARDS_PER_ROUND = 48
+    #скільки рук play_once() роздає наперед одним пакетом
+    ONCE_BUFFER = 16384
+
+    def __init__(self, decks: int = 8, penetration: float = 0.75, rng=None, seed: int = None):
+        super().__init__(rng, seed)
+        if decks < 1:
+            raise ValueError("decks має бути не менше 1")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration має бути в (0, 1]")
+        self.decks = int(decks)
+        self.penetration = float(penetration)
+        self._shoe_values = np.tile(np.array(self.CARD_VALUES, dtype=np.int8), self.decks)
+        self._shoe_size = len(self._shoe_values)
+        self._cut = max(1, int(self._shoe_size * self.penetration))
+        values, counts = np.unique(self._shoe_values, return_counts=True)
+        self._pad_values, self._pad_probabilities = values, counts / counts.sum()
+        self._decoder = self.decode_outcome
+        #руки для play_once(), роздані наперед
+        self._buffer = None
+        self._buffer_index = 0
+
+    def get_config(self) -> dict:
+        return {"decks": self.decks, "penetration": self.penetration}
+
+    def _new_shoes(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        count перетасованих черевиків рядками матриці. За кожним - запас карт,
+        узятих із тим самим складом колод: це "перетасовані відбої" для роздачі,
+        що не вмістилася до кінця черевика (буває лише при penetration близько 1).
+        """
+        shoes = rng.permuted(np.broadcast_to(self._shoe_values, (count, self._shoe_size)), axis=1)
+        spare = rng.choice(self._pad_values, size=(count, self.MAX_CARDS_PER_ROUND),
+                           p=self._pad_probabilities).astype(np.int8)
+        return np.concatenate([shoes, spare], axis=1)
+
+    def _play_rounds(self, cards: np.ndarray, positions: np.ndarray) -> tuple:
+        raise NotImplementedError
+
+    def play_many(self, n: int, rng: np.random.Generator = None) -> ResultBatch:
+        if rng is None:
+            rng = self.np_rng
+        if n == 0:
+            #порожній пакет - без жодного черевика, як в інших іграх
+            return ResultBatch(np.empty(0, dtype=np.int8), np.empty(0, dtype=bool),
+                               np.empty(0, dtype=np.float64), decoder=self._decoder)
+        codes, wins, deltas = [], [], []
+        shoe_ids, round_ids = [], []
+        played = 0
+        first_shoe = 0
+        rounds_per_shoe = self._cut / self.AVERAGE_CARDS_PER_ROUND
+        while played < n:
+            #тасування - найдорожча частина, тож черевиків рівно стільки, скільки в середньому
+            #треба; якщо рук забракне, наступний прохід дотасує ще кілька
+            count = max(1, int(np.ceil((n - played) / rounds_per_shoe)))
+            with phase("shuffle"):
+                shoes = self._new_shoes(count, rng)
+            row = shoes.shape[1]
+            cards = shoes.ravel()
+            starts = np.arange(count, dtype=np.int64) * row
+            offsets = np.zeros(count, dtype=np.int64)
+            active = np.arange(count)
+            round_index = 0
+            with phase("deal"):
+                while active.size:
+                    round_codes, round_wins, round_deltas, next_positions = \
+                        self._play_rounds(cards, starts[active] + offsets[active])
+                    codes.append(round_codes)
+                    wins.append(round_wins)
+                    deltas.append(round_deltas)
+                    shoe_ids.append(active + first_shoe)
+                    round_ids.append(np.full(active.size, round_index))
+                    played += active.size
+                    offsets[active] = next_positions - starts[active]
+                    active = active[offsets[active] < self._cut]
+                    round_index += 1
+            first_shoe += count
+
+        with phase("score"):
+            #руки впорядковуються черевик за черевиком, як їх зіграв би один гравець:
+            #місце руки - початок її черевика плюс номер роздачі в ньому (без сортування)
+            shoe_ids, round_ids = np.concatenate(shoe_ids), np.concatenate(round_ids)
+            rounds_in_shoe = np.bincount(shoe_ids, minlength=first_shoe)
+            destination = (np.cumsum(rounds_in_shoe) - rounds_in_shoe)[shoe_ids] + round_ids
+            kept = destination < n
+            destination = destination[kept]
+            columns = []
+            for parts in (codes, wins, deltas):
+                values = np.concatenate(parts)
+                column = np.empty(n, dtype=values.dtype)
+                column[destination] = values[kept]
+                columns.append(column)
+            return ResultBatch(*columns, decoder=self._decoder)
+
+    def play_once(self) -> GameResult:
+        """
+        Наступна рука з черевиків, роздених наперед пакетом play_many():
+        одна рука окремо коштувала б стільки ж векторних операцій, скільки тисяча.
+        """
+        if self._buffer is None or self._buffer_index >= len(self._buffer):
+            self._buffer = self.play_many(self.ONCE_BUFFER, self.np_rng)
+            self._buffer_index = 0
+        result = self._buffer[self._buffer_index]
+        self._buffer_index += 1
+        return result
+
+
+#гра "Баккара"
+class BaccaratGame(ShoeGame):
+    """
+    Баккара (пунто банко) з черевика на 8 колод, ставка в 1 монету.
+    bet: "player" (виплата 1:1), "banker" (0.95:1, комісія 5%) або "tie" (8:1);
+    при нічиїй ставки на гравця і банкіра повертаються.
+    Код результату - хто виграв: 0 гравець, 1 банкір, 2 нічия.
+    play_wagers() розраховує всі три ставки на тих самих роздачах.
+    """
+    #значення карт однієї колоди: туз - 1, 2-9 - номінал, 10 і картинки - 0
+    CARD_VALUES = [min(rank, 10) % 10 for rank in range(1, 14)] * 4
+    AVERAGE_CARDS_PER_ROUND = 4.94
+    BETS = ("player", "banker", "tie")
+    #зміна балансу ставки за кодом переможця
+    BET_DELTAS = {
+        "player": np.array([1.0, -1.0, 0.0]),
+        "banker": np.array([-1.0, 0.95, 0.0]),
+        "tie": np.array([-1.0, -1.0, 8.0]),
+    }
+    OUTCOMES = ["гравець", "банкір", "нічия"]
+
+    #чи бере банкір третю карту: [сума банкіра 0-7, третя карта гравця 0-9]
+    _BANKER_DRAWS = np.array([
+        [True] * 10,                                                       #0
+        [True] * 10,                                                       #1
+        [True] * 10,                                                       #2
+        [value != 8 for value in range(10)],                               #3
+        [2 <= value <= 7 for value in range(10)],                          #4
+        [4 <= value <= 7 for value in range(10)],                          #5
+        [6 <= value <= 7 for value in range(10)],                          #6
+        [False] * 10,                                                      #7
+    ])
+
+    def __init__(self, bet: str = "banker", decks: int = 8, penetration: float = 0.75,
+                 rng=None, seed: int = None):
+        super().__init__(decks, penetration, rng, seed)
+        if bet not in self.BETS:
+            raise ValueError(f"Невідома ставка: '{bet}' (можливі: {', '.join(self.BETS)})")
+        self.bet = bet
+        self._delta_table = self.BET_DELTAS[bet]
+
+    def get_game_name(self) -> str:
+        return "Баккара"
+
+    def get_config(self) -> dict:
+        return {"bet": self.bet, **super().get_config()}
+
+    def decode_outcome(self, code):
+        return self.OUTCOMES[code]
+
+    def draw_wager_codes(self, n: int, rng: np.random.Generator = None) -> np.ndarray:
+        return self.play_many(n, rng).outcomes
+
+    def wager_payouts(self, wager: Wager) -> np.ndarray:
+        bet = self.bet if wager.bet == "main" else wager.bet
+        if bet not in self.BET_DELTAS:
+            raise ValueError(f"Невідома ставка в баккара: '{wager.bet}'")
+        return self.BET_DELTAS[bet]
+
+    def _play_rounds(self, cards: np.ndarray, positions: np.ndarray) -> tuple:
+        player = (cards[positions] + cards[positions + 2]) % 10
+        banker = (cards[positions + 1] + cards[positions + 3]) % 10
+        positions = positions + 4
+
+        #натуральна 8 або 9 в будь-кого - карт більше не беруть
+        playing = (player < 8) & (banker < 8)
+        player_draws = playing & (player <= 5)
+        third = np.where(player_draws, cards[positions], 0)
+        player = np.where(player_draws, (player + third) % 10, player)
+        positions = positions + player_draws
+
+        banker_draws = playing & np.where(player_draws,
+                                          self._BANKER_DRAWS[np.minimum(banker, 7), third],
+                                          banker <= 5)
+        banker = np.where(banker_draws, (banker + cards[positions]) % 10, banker)
+        positions = positions + banker_draws
+
+        codes = np.where(player > banker, 0, np.where(banker > player, 1, 2)).astype(np.int8)
+        deltas = self._delta_table[codes]
+        return codes, deltas > 0, deltas, positions
+
+
+#дії базової стратегії
+STAND, HIT, DOUBLE, DOUBLE_OR_STAND, SPLIT = range(5)
+_ACTIONS = {"S": STAND, "H": HIT, "D": DOUBLE, "X": DOUBLE_OR_STAND, "P": SPLIT}
+
+#базова стратегія (4-8 колод, дилер стоїть на м'яких 17, подвоєння після спліту);
+#стовпці - відкрита карта дилера 2, 3, ..., 10, туз;
+#D - подвоїти (якщо не можна - взяти), X - подвоїти (якщо не можна - стояти)
+HARD_STRATEGY = {
+    **{total: "HHHHHHHHHH" for total in range(4, 9)},
+    9: "HDDDDHHHHH",
+    10: "DDDDDDDDHH",
+    11: "DDDDDDDDDH",
+    12: "HHSSSHHHHH",
+    **{total: "SSSSSHHHHH" for total in range(13, 17)},
+    **{total: "SSSSSSSSSS" for total in range(17, 22)},
+}
+SOFT_STRATEGY = {
+    12: "HHHHHHHHHH",
+    13: "HHHDDHHHHH",
+    14: "HHHDDHHHHH",
+    15: "HHDDDHHHHH",
+    16: "HHDDDHHHHH",
+    17: "HDDDDHHHHH",
+    18: "XXXXXSSHHH",
+    19: "SSSSSSSSSS",
+    20: "SSSSSSSSSS",
+    21: "SSSSSSSSSS",
+}
+#пари за значенням карти (1 - тузи); P - розділити, інше - грати як звичайну суму
+PAIR_SPLITS = {
+    1: "PPPPPPPPPP",
+    2: "PPPPPPHHHH",
+    3: "PPPPPPHHHH",
+    4: "HHHPPHHHHH",
+    5: "HHHHHHHHHH",
+    6: "PPPPPHHHHH",
+    7: "PPPPPPHHHH",
+    8: "PPPPPPPPPP",
+    9: "PPPPPSPPSS",
+    10: "SSSSSSSSSS",
+}
+
+
+def _strategy_table(rows: dict, size: int) -> np.ndarray:
+    """Таблиця дій [рядок, відкрита карта дилера 1-10] (туз - стовпець 1)."""
+    table = np.full((size, 11), STAND, dtype=np.int8)
+    for row, actions in rows.items():
+        for column, action in enumerate(actions):
+            upcard = column + 2 if column < 9 else 1
+            table[row, upcard] = _ACTIONS[action]
+    return table
+
+
+#гра "Блекджек"
+class BlackjackGame(ShoeGame):
+    """
+    Блекджек з черевика на 6 колод, гравець грає за базовою стратегією, ставка 1 монета.
+    Правила: дилер стоїть на м'яких 17 і перевіряє блекджек, блекджек платить 3:2,
+    подвоєння на будь-яких двох картах і після спліту, один спліт
+    (розділені тузи отримують по одній карті). Зміна балансу - від -4 до +4.
+    Стратегія береться з таблиць HARD_STRATEGY / SOFT_STRATEGY / PAIR_SPLITS,
+    заздалегідь перетворених на масиви (дія = один індекс у таблиці).
+    Код результату - зміна балансу в півставках плюс 8 (0 - програш 4 ставок).
+    """
+    #значення карт однієї колоди: туз - 1, картинки - 10
+    CARD_VALUES = [min(rank, 10) for rank in range(1, 14)] * 4
+    AVERAGE_CARDS_PER_ROUND = 5.5
+
+    _HARD = _strategy_table(HARD_STRATEGY, 32)
+    _SOFT = _strategy_table(SOFT_STRATEGY, 32)
+    _PAIRS = _strategy_table(PAIR_SPLITS, 11)
+
+    def __init__(self, decks: int = 6, penetration: float = 0.75, rng=None, seed: int = None):
+        super().__init__(decks, penetration, rng, seed)
+
+    def get_game_name(self) -> str:
+        return "Блекджек"
+
+    def decode_outcome(self, code):
+        delta = (code - 8) / 2
+        return f"{delta:+g}"
+
+    def _play_hands(self, cards, positions, totals, aces, upcards, may_double):
+        """
+        Доігрує руки гравця за базовою стратегією (без сплітів).
+        totals - сума карт (туз = 1), aces - чи є туз у руці.
+        Повертає (жорстка сума, чи є туз, ставка 1 або 2, позиції після руки).
+        """
+        positions, totals, aces = positions.copy(), totals.copy(), aces.copy()
+        stakes = np.ones(len(positions))
+        active = np.arange(len(positions))
+        first_decision = True
+        while active.size:
+            total = totals[active]
+            soft = aces[active] & (total <= 11)
+            upcard = upcards[active]
+            action = np.where(soft, self._SOFT[total + 10 * soft, upcard], self._HARD[total, upcard])
+
+            doubles = (action == DOUBLE) | (action == DOUBLE_OR_STAND)
+            if first_decision:
+                doubles &= may_double[active]
+            else:
+                doubles[:] = False
+            hits = (action == HIT) | ((action == DOUBLE) & ~doubles)
+
+            drawing = active[hits | doubles]
+            card = cards[positions[drawing]]
+            positions[drawing] += 1
+            totals[drawing] += card
+            aces[drawing] |= card == 1
+            stakes[active[doubles]] = 2
+
+            #далі грають лише руки, що взяли карту (не подвоєні) і не перебрали
+            active = active[hits]
+            active = active[totals[active] <= 21]
+            first_decision = False
+        return totals, aces, stakes, positions
+
+    @staticmethod
+    def _best_total(totals, aces):
+        return np.where(aces & (totals <= 11), totals + 10, totals)
+
+    @staticmethod
+    def _settle(player, stakes, dealer):
+        """Зміна балансу руки з найкращою сумою player проти суми дилера dealer."""
+        return np.where(player > 21, -stakes,
+                        np.where(dealer > 21, stakes,
+                                 np.sign(player - dealer) * stakes))
+
+    def _play_rounds(self, cards: np.ndarray, positions: np.ndarray) -> tuple:
+        count = len(positions)
+        first, upcard = cards[positions], cards[positions + 1]
+        second, hole = cards[positions + 2], cards[positions + 3]
+        positions = positions + 4
+        deltas = np.zeros(count)
+
+        player_blackjack = (first + second == 11) & ((first == 1) | (second == 1))
+        dealer_blackjack = (upcard + hole == 11) & ((upcard == 1) | (hole == 1))
+        deltas[dealer_blackjack & ~player_blackjack] = -1.0
+        deltas[player_blackjack & ~dealer_blackjack] = 1.5
+
+        hands = np.flatnonzero(~(player_blackjack | dealer_blackjack))
+        pair = first[hands]
+        split = (pair == second[hands]) & (self._PAIRS[pair, upcard[hands]] == SPLIT)
+
+        #руки без спліту
+        single = hands[~split]
+        totals, aces, single_stakes, single_end = self._play_hands(
+            cards, positions[single], (first + second)[single],
+            (first == 1)[single] | (second == 1)[single], upcard[single],
+            np.ones(len(single), dtype=bool)
+        )
+        single_totals = self._best_total(totals, aces)
+        positions[single] = single_end
+
+        #розділені пари: друга карта першої руки, гра нею, потім друга рука
+        pairs = hands[split]
+        pair_cards = first[pairs]
+        pair_aces = pair_cards == 1
+        split_totals, split_stakes = [], []
+        pair_positions = positions[pairs]
+        for _ in range(2):
+            card = cards[pair_positions]
+            pair_positions = pair_positions + 1
+            totals, aces = pair_cards + card, pair_aces | (card == 1)
+            stakes = np.ones(len(pairs))
+            #розділені тузи отримують лише одну карту
+            playing = np.flatnonzero(~pair_aces)
+            totals[playing], aces[playing], stakes[playing], pair_positions[playing] = self._play_hands(
+                cards, pair_positions[playing], totals[playing], aces[playing],
+                upcard[pairs][playing], np.ones(len(playing), dtype=bool)
+            )
+            split_totals.append(self._best_total(totals, aces))
+            split_stakes.append(stakes)
+        positions[pairs] = pair_positions
+
+        #дилер добирає, лише якщо в гравця лишилася рука, що не перебрала
+        player_standing = np.zeros(count, dtype=bool)
+        player_standing[single] = single_totals <= 21
+        if len(pairs):
+            player_standing[pairs] = (split_totals[0] <= 21) | (split_totals[1] <= 21)
+        dealer_totals = upcard + hole
+        dealer_aces = (upcard == 1) | (hole == 1)
+        drawing = np.flatnonzero(player_standing)
+        while drawing.size:
+            best = self._best_total(dealer_totals[drawing], dealer_aces[drawing])
+            drawing = drawing[best < 17]
+            card = cards[positions[drawing]]
+            positions[drawing] += 1
+            dealer_totals[drawing] += card
+            dealer_aces[drawing] |= card == 1
+        dealer = self._best_total(dealer_totals, dealer_aces)
+
+        deltas[single] = self._settle(single_totals, single_stakes, dealer[single])
+        if len(pairs):
+            deltas[pairs] = (self._settle(split_totals[0], split_stakes[0], dealer[pairs])
+                             + self._settle(split_totals[1], split_stakes[1], dealer[pairs]))
+
+        codes = (deltas * 2).astype(np.int8) + 8
+        return codes, deltas > 0, deltas, positions
@@ -0,0 +1,61 @@
+import unittest
+from fractions import Fraction
+
+from game_logic import DiceGame, SlotsGame, PistolRouletteGame, IGame, GameResult
+from analysis import analyze, try_analyze
+from simulation import run_simulation
+
+class TestAnalysis(unittest.TestCase):
+
+    def test_probabilities_sum_to_one(self):
+        """тестуємо, що ймовірності всіх результатів дають у сумі 1"""
+        for game in (DiceGame(), SlotsGame(), PistolRouletteGame()):
+            analysis = analyze(game)
+            self.assertEqual(sum(analysis.outcome_probabilities.values()), 1)
+
+    def test_dice_exact_values(self):
+        """тестуємо точні значення для Костей: дубль 1/6, очікування -1/6"""
+        analysis = analyze(DiceGame())
+        self.assertEqual(analysis.win_probability, Fraction(1, 6))
+        self.assertEqual(analysis.expected_delta, Fraction(-1, 6))
+        self.assertEqual(analysis.outcome_probabilities[7], Fraction(6, 36))
+
+    def test_pistol_is_fair(self):
+        """тестуємо, що Рулетка з пістолетом має нульове очікування"""
+        analysis = analyze(PistolRouletteGame())
+        self.assertEqual(analysis.expected_delta, 0)
+        self.assertEqual(analysis.rtp, 100.0)
+        self.assertEqual(analysis.variance, 5)
+
+    def test_slots_rtp_closed_form(self):
+        """тестуємо RTP Слотів проти формули sum(p^3 * (виграш + 1))"""
+        game = SlotsGame()
+        total = sum(game.WEIGHTS)
+        expected_return = sum(
+            Fraction(weight, total) ** 3 * (Fraction(payout) + 1)
+            for weight, payout in zip(game.WEIGHTS, game.PAYOUTS)
+        )
+        self.assertAlmostEqual(analyze(game).rtp, float(expected_return * 100))
+
+    def test_simulation_agrees_with_theory(self):
+        """тестуємо, що симуляція потрапляє в довірчий інтервал теорії"""
+        game = DiceGame()
+        analysis = analyze(game)
+        summary = run_simulation(game, 200000, seed=11, workers=1)
+        error = 4 * analysis.std / summary.runs ** 0.5
+        self.assertAlmostEqual(summary.mean_delta, float(analysis.expected_delta), delta=error)
+
+    def test_game_without_model(self):
+        """тестуємо, що гра без точної моделі дає None, а не падіння"""
+        class CoinGame(IGame):
+            def get_game_name(self) -> str:
+                return "Монетка"
+
+            def play_once(self) -> GameResult:
+                return GameResult(outcome=0, is_win=False, money_delta=-1.0)
+
+        self.assertIsNone(try_analyze(CoinGame()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from benchmark import run_benchmarks, compare, count_allocations
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_rows_for_every_combination(self):
+        """тестуємо, що бенчмарк дає рядок для кожної гри, шляху і розміру"""
+        rows = run_benchmarks(["dice", "slots"], ["scalar", "batch"], [100, 1000],
+                              workers=1, repeat=1)
+        self.assertEqual(len(rows), 8)
+        for row in rows:
+            self.assertGreater(row["rounds_per_second"], 0)
+            self.assertGreaterEqual(row["peak_bytes"], 0)
+
+    def test_scalar_size_limit(self):
+        """тестуємо, що великі розміри для циклу play_once пропускаються"""
+        rows = run_benchmarks(["pistol"], ["scalar", "batch"], [100, 5000],
+                              workers=1, repeat=1, max_scalar_runs=1000)
+        self.assertEqual([(r["engine"], r["runs"]) for r in rows],
+                         [("scalar", 100), ("batch", 100), ("batch", 5000)])
+
+    def test_counts_allocations_made(self):
+        """тестуємо, що рахуються створені блоки, навіть якщо вони вже звільнені"""
+        def make():
+            return [object()]
+
+        def churn():
+            for _ in range(1000):
+                make()  #кожен список одразу звільняється
+        _, allocated = count_allocations(churn)
+        self.assertGreaterEqual(allocated, 1000)
+
+        rows = run_benchmarks(["dice"], ["scalar", "batch"], [2000], workers=1, repeat=1)
+        scalar, batch = (row["allocated_blocks_per_round"] for row in rows)
+        self.assertGreaterEqual(scalar, 1)  #цикл play_once створює об'єкт на раунд
+        self.assertLess(batch, scalar)
+
+    def test_compare_reports_speedup(self):
+        """тестуємо порівняння двох звітів"""
+        old = {"results": [{"game": "dice", "engine": "batch", "runs": 10, "rounds_per_second": 100.0}]}
+        new = {"results": [{"game": "dice", "engine": "batch", "runs": 10, "rounds_per_second": 250.0}]}
+        self.assertEqual(compare(old, new)[0]["speedup"], 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import casino_cli
+from results_store import StoredRun
+
+class TestCasinoCli(unittest.TestCase):
+
+    def run_cli(self, *argv) -> str:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = casino_cli.main(list(argv))
+        self.assertEqual(exit_code, 0)
+        return output.getvalue()
+
+    def test_json_output(self):
+        """тестуємо JSON-вивід з усіма полями підсумку"""
+        data = json.loads(self.run_cli("--game", "pistol", "--runs", "5000", "--seed", "1",
+                                       "--workers", "1", "--format", "json"))
+        self.assertEqual(data["runs"], 5000)
+        self.assertEqual(data["seed"], 1)
+        self.assertEqual(sum(data["histogram"].values()), 5000)
+
+    def test_same_seed_same_output(self):
+        """тестуємо, що однаковий seed дає однаковий результат з командного рядка"""
+        args = ("--game", "slots", "--runs", "3000", "--seed", "9", "--workers", "1", "--format", "json")
+        first = json.loads(self.run_cli(*args))
+        second = json.loads(self.run_cli(*args))
+        first.pop("elapsed_seconds")
+        second.pop("elapsed_seconds")
+        self.assertEqual(first, second)
+
+    def test_precision_mode(self):
+        """тестуємо адаптивний режим: інтервал RTP не ширший за заданий"""
+        data = json.loads(self.run_cli("--game", "dice", "--precision", "1.0", "--confidence", "0.95",
+                                       "--seed", "3", "--workers", "1", "--format", "json"))
+        self.assertLessEqual(data["rtp_half_width"], 1.0)
+        self.assertEqual(data["confidence"], 0.95)
+
+    def test_estimator_mode(self):
+        """тестуємо оцінку RTP слотів зі зменшенням дисперсії"""
+        data = json.loads(self.run_cli("--game", "slots", "--estimator", "stratified", "--runs", "20000",
+                                       "--seed", "1", "--format", "json"))
+        self.assertEqual(data["method"], "stratified")
+        self.assertLess(data["rtp_standard_error"], 1.0)
+
+    def test_estimator_csv_output(self):
+        """тестуємо, що CSV режиму --estimator містить метод і похибку оцінки"""
+        rows = list(csv.DictReader(io.StringIO(self.run_cli(
+            "--game", "slots", "--estimator", "importance", "--runs", "5000", "--seed", "1",
+            "--format", "csv"))))
+        self.assertEqual(rows[0]["method"], "importance")
+        self.assertGreater(float(rows[0]["rtp_standard_error"]), 0)
+        self.assertIn("rtp_half_width", rows[0])
+
+    def test_estimator_rejects_other_games(self):
+        """тестуємо, що --estimator не приймає інші ігри"""
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(casino_cli.main(["--game", "dice", "--estimator", "plain"]), 2)
+
+    def test_negative_seed(self):
+        """тестуємо, що від'ємний seed дає код 2, а не traceback"""
+        with redirect_stderr(io.StringIO()):
+            self.assertEqual(casino_cli.main(["--game", "dice", "--seed", "-1"]), 2)
+
+    def test_save_run(self):
+        """тестуємо збереження запуску у файл .run"""
+        with tempfile.TemporaryDirectory() as directory:
+            data = json.loads(self.run_cli("--game", "dice", "--runs", "3000", "--seed", "4",
+                                           "--workers", "1", "--save", directory, "--format", "json"))
+            run = StoredRun(data["saved_path"])
+            self.assertEqual(run.runs, 3000)
+            self.assertEqual(run.summary().histogram,
+                             {int(k): v for k, v in data["histogram"].items()})
+
+    def test_cache(self):
+        """тестуємо, що з --cache повторний запуск береться з кешу"""
+        with tempfile.TemporaryDirectory() as directory:
+            args = ("--game", "slots", "--runs", "3000", "--seed", "9", "--workers", "1",
+                    "--cache", directory, "--format", "json")
+            first = json.loads(self.run_cli(*args))
+            second = json.loads(self.run_cli(*args))
+        self.assertEqual(first["cache"], "miss")
+        self.assertEqual(second["cache"], "hit")
+        self.assertEqual(first["histogram"], second["histogram"])
+
+    def test_profile(self):
+        """тестуємо, що з --profile у JSON є звіт профілювання"""
+        data = json.loads(self.run_cli("--game", "dice", "--runs", "3000", "--seed", "4",
+                                       "--workers", "1", "--profile", "--format", "json"))
+        self.assertEqual(data["profile"]["rounds"], 3000)
+        self.assertIn("play", data["profile"]["phases"])
+
+    def test_trace(self):
+        """тестуємо, що з --trace у JSON є точки збіжності до кінця запуску"""
+        data = json.loads(self.run_cli("--game", "dice", "--runs", "3000", "--seed", "4",
+                                       "--workers", "1", "--trace", "--format", "json"))
+        self.assertEqual(data["convergence"]["runs"], [10, 20, 50, 100, 200, 500, 1000, 2000, 3000])
+        self.assertAlmostEqual(data["convergence"]["rtp"][-1], data["rtp"])
+
+    def test_wagers(self):
+        """тестуємо режим --wager: рядок на кожну ставку"""
+        data = json.loads(self.run_cli("--game", "dice", "--runs", "3000", "--seed", "4", "--workers", "1",
+                                       "--wager", "main", "--wager", "sum:7@2", "--format", "json"))
+        self.assertEqual(data["runs"], 3000)
+        self.assertEqual([wager["bet"] for wager in data["wagers"]], ["main", "sum"])
+        self.assertEqual(data["wagers"][1]["stake"], 2.0)
+
+    def test_csv_output(self):
+        """тестуємо CSV-вивід: заголовок і один рядок"""
+        rows = list(csv.DictReader(io.StringIO(self.run_cli(
+            "--runs", "100", "--seed", "2", "--workers", "1", "--format", "csv"))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["runs"], "100")
+
+    def test_text_output_and_no_gui_imports(self):
+        """тестуємо текстовий вивід і те, що CLI не тягне tkinter/matplotlib"""
+        text = self.run_cli("--runs", "100", "--seed", "2", "--workers", "1")
+        self.assertIn("СТАТИСТИКА ЗАВЕРШЕНА", text)
+        self.assertIn("Seed: 2", text)
+        self.assertNotIn("matplotlib", sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
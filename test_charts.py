@@ -0,0 +1,46 @@
+import unittest
+
+from game_logic import DiceGame, SlotsGame
+from charts import RtpTrace, ordered_bars
+
+class TestCharts(unittest.TestCase):
+
+    def test_trace_has_fixed_size(self):
+        """тестуємо, що лінія RTP не росте понад capacity точок"""
+        trace = RtpTrace(capacity=16)
+        for runs in range(1, 10001):
+            trace.add(runs, 50.0)
+            self.assertLessEqual(len(trace), 16)
+        runs, rtp = trace.points()
+        self.assertLessEqual(len(runs), 17)
+        self.assertEqual(runs[0], 1)
+        self.assertEqual(runs[-1], 10000)  #остання точка є завжди
+
+    def test_trace_is_evenly_thinned(self):
+        """тестуємо, що після проріджування точки йдуть з однаковим кроком"""
+        trace = RtpTrace(capacity=8)
+        for runs in range(20):
+            trace.add(runs, float(runs))
+        runs, rtp = trace.points()
+        self.assertEqual(runs.tolist(), [0, 4, 8, 12, 16, 19])
+        self.assertEqual(rtp.tolist(), [0.0, 4.0, 8.0, 12.0, 16.0, 19.0])
+
+    def test_trace_capacity_must_be_even(self):
+        """тестуємо перевірку розміру буфера"""
+        with self.assertRaises(ValueError):
+            RtpTrace(capacity=7)
+
+    def test_ordered_bars(self):
+        """тестуємо порядок стовпчиків: кості за сумою, інші ігри за частотою"""
+        codes, labels, values = ordered_bars(DiceGame(), {7: 5, 2: 1, 12: 3}, by_code=True)
+        self.assertEqual(codes, [2, 7, 12])
+        self.assertEqual(values, [1, 5, 3])
+
+        game = SlotsGame()
+        codes, labels, values = ordered_bars(game, {0: 2, 43: 9}, by_code=False)
+        self.assertEqual(codes, [43, 0])
+        self.assertEqual(labels[1], "🍒 🍒 🍒")
+
+
+if __name__ == '__main__':
+    unittest.main()
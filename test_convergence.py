@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from game_logic import DiceGame, PistolRouletteGame
+from convergence import ConvergenceTrace, checkpoints_between
+from simulation import run_simulation, run_until_precision
+
+class TestConvergence(unittest.TestCase):
+
+    def test_checkpoints(self):
+        """тестуємо логарифмічні контрольні точки 10, 20, 50, 100, ..."""
+        self.assertEqual(checkpoints_between(0, 1000), [10, 20, 50, 100, 200, 500, 1000])
+        self.assertEqual(checkpoints_between(20, 499), [50, 100, 200])
+        self.assertEqual(checkpoints_between(0, 9), [])
+        #100M раундів - 22 точки, буфер за замовчуванням вміщує набагато довші запуски
+        self.assertEqual(len(checkpoints_between(0, 10 ** 8)), 22)
+        self.assertGreaterEqual(ConvergenceTrace().capacity, 22)
+
+    def test_trace_matches_raw_rounds(self):
+        """тестуємо точки збіжності проти поточних RTP і виграшів, порахованих по всіх раундах"""
+        trace = ConvergenceTrace()
+        summary = run_simulation(DiceGame(), 25000, seed=3, workers=1, chunk_size=7000,
+                                 keep_raw=True, trace=trace)
+        deltas = np.concatenate([batch.money_deltas for batch in summary.raw_chunks])
+        wins = np.concatenate([batch.wins for batch in summary.raw_chunks])
+
+        runs, rtp, low, high = trace.points(0.95)
+        self.assertEqual(runs.tolist(), [10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000,
+                                         20000, 25000])
+        np.testing.assert_allclose(rtp, [(deltas[:n].sum() + n) / n * 100 for n in runs])
+        np.testing.assert_allclose(trace.win_rates()[1], [wins[:n].mean() * 100 for n in runs])
+        #остання точка - сам підсумок, а інтервал звужується з кількістю раундів
+        self.assertAlmostEqual(rtp[-1], summary.rtp)
+        half_widths = (high - low) / 2
+        self.assertAlmostEqual(half_widths[-1], summary.rtp_half_width(0.95))
+        self.assertLess(half_widths[-1], half_widths[3])
+
+    def test_same_trace_for_any_workers(self):
+        """тестуємо, що точки не залежать від кількості процесів"""
+        first, second = ConvergenceTrace(), ConvergenceTrace()
+        run_simulation(PistolRouletteGame(), 30000, seed=6, workers=1, chunk_size=4000, trace=first)
+        run_simulation(PistolRouletteGame(), 30000, seed=6, workers=2, chunk_size=4000, trace=second)
+        for left, right in zip(first.points(), second.points()):
+            np.testing.assert_array_equal(left, right)
+
+    def test_precision_mode_trace(self):
+        """тестуємо збіжність в адаптивному режимі: точки до кінця запуску"""
+        trace = ConvergenceTrace()
+        summary = run_until_precision(DiceGame(), 2.0, 0.95, seed=2, workers=1,
+                                      chunk_size=5000, min_runs=20000, trace=trace)
+        runs, rtp, _, _ = trace.points()
+        self.assertEqual(runs[-1], summary.runs)
+        self.assertEqual(runs.tolist(), sorted(runs.tolist()))
+        self.assertAlmostEqual(rtp[-1], summary.rtp)
+
+    def test_fixed_buffer(self):
+        """тестуємо, що буфер не росте понад capacity, а остання точка є завжди"""
+        trace = ConvergenceTrace(max_runs=100)
+        self.assertEqual(trace.capacity, 4)
+        for runs in checkpoints_between(0, 10 ** 6):
+            trace.record(runs, 0, -runs / 2, 0.0)
+        trace.set_last(10 ** 6 + 5, 0, -1.0, 0.0)
+        self.assertEqual(len(trace), 4)
+        runs, rtp, _, _ = trace.points()
+        self.assertEqual(runs.tolist(), [10, 20, 50, 100, 10 ** 6 + 5])
+        self.assertEqual(rtp[0], 50.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from game_logic import SlotsGame
+from analysis import analyze
+from estimators import estimate_rtp, format_estimate, METHODS
+
+class TestEstimators(unittest.TestCase):
+
+    def setUp(self):
+        self.games = [
+            SlotsGame(seed=1),
+            SlotsGame(weights=[30, 30, 20, 10, 5, 1], payouts=[2, 5, 10, 50, 200, 5000], seed=2),
+        ]
+
+    def test_estimates_are_unbiased(self):
+        """тестуємо, що кожен метод дає точний RTP у межах кількох стандартних похибок"""
+        for game in self.games:
+            exact = analyze(game).rtp
+            for method in METHODS:
+                estimate = estimate_rtp(game, 100000, method)
+                self.assertLess(abs(estimate.rtp - exact), 4 * estimate.standard_error,
+                                f"{method}: {estimate.rtp} проти {exact}")
+
+    def test_variance_reduction(self):
+        """тестуємо, що вибірка за значущістю і стратифікація зменшують похибку на порядок"""
+        for game in self.games:
+            plain = estimate_rtp(game, 100000, "plain")
+            for method in ("importance", "stratified"):
+                estimate = estimate_rtp(game, 100000, method)
+                self.assertLess(estimate.standard_error * 10, plain.standard_error)
+
+    def test_same_seed_same_estimate(self):
+        """тестуємо відтворюваність оцінки з тим самим seed"""
+        first = estimate_rtp(SlotsGame(), 20000, "stratified", seed=5)
+        second = estimate_rtp(SlotsGame(), 20000, "stratified", seed=5)
+        self.assertEqual(first, second)
+        self.assertIn("Seed: 5", format_estimate(SlotsGame(), first))
+
+    def test_unknown_method(self):
+        """тестуємо помилку для невідомого методу"""
+        with self.assertRaises(ValueError):
+            estimate_rtp(SlotsGame(), 1000, "magic")
+
+    def test_too_few_spins(self):
+        """тестуємо, що для одного спіну похибку не рахуємо, а відхиляємо запит"""
+        for method in METHODS:
+            with self.assertRaises(ValueError):
+                estimate_rtp(SlotsGame(), 1, method, seed=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,26 @@
+import random
 import unittest
-from unittest.mock import patch
+from dataclasses import FrozenInstanceError
+
+import numpy as np
+
+from benchmark import result_memory
+from game_logic import DiceGame, SlotsGame, PistolRouletteGame, GameResult, IGame, ResultBatch
+
+class ScriptedRandom(random.Random):
+    """Генератор, який повертає заздалегідь задані значення (замість patch модуля random)."""
+
+    def __init__(self, randints=(), choices=()):
+        super().__init__(0)
+        self.randints = list(randints)
+        self.scripted_choices = list(choices)
+
+    def randint(self, a, b):
+        return self.randints.pop(0)
+
+    def choices(self, population, weights=None, *, cum_weights=None, k=1):
+        return self.scripted_choices.pop(0)
 
-from game_logic import DiceGame, SlotsGame, PistolRouletteGame, GameResult, IGame
 
 class TestGameLogic(unittest.TestCase):
 
@@ -53,58 +72,213 @@ class TestGameLogic(unittest.TestCase):
         self.assertIsInstance(result.money_delta, float)
         self.assertIsInstance(result.is_win, bool)
 
-    @patch('game_logic.random.randint')
-    def test_dice_game_logic_win(self, mock_randint):
+    def test_dice_game_logic_win(self):
         """тестуємо логіку виграшу в Костях (дубль)"""
-        mock_randint.side_effect = [3, 3]
-        result = self.dice_game.play_once()
+        result = DiceGame(rng=ScriptedRandom(randints=[3, 3])).play_once()
         self.assertTrue(result.is_win)
         self.assertEqual(result.money_delta, 4.0)
 
-    @patch('game_logic.random.randint')
-    def test_dice_game_logic_lose(self, mock_randint):
+    def test_dice_game_logic_lose(self):
         """тестуємо логіку програшу в Костях (не дубль)"""
-        mock_randint.side_effect = [1, 2]
-        result = self.dice_game.play_once()
+        result = DiceGame(rng=ScriptedRandom(randints=[1, 2])).play_once()
         self.assertFalse(result.is_win)
         self.assertEqual(result.money_delta, -1.0)
 
-    @patch('game_logic.random.choices')
-    def test_slots_game_logic_jackpot(self, mock_choices):
+    def test_slots_game_logic_jackpot(self):
         """тестуємо логіку джекпоту в Слотах (7️⃣-7️⃣-7️⃣)в"""
-        mock_choices.return_value = ["7️⃣", "7️⃣", "7️⃣"]
+        rng = ScriptedRandom(choices=[[5, 5, 5]])  #індекси символу "7️⃣"
 
-        result = self.slots_game.play_once()
+        result = SlotsGame(rng=rng).play_once()
 
         self.assertTrue(result.is_win)
         self.assertEqual(result.money_delta, 100.0)
+        self.assertEqual(result.primary_value, "7️⃣ 7️⃣ 7️⃣")
 
-    @patch('game_logic.random.choices')
-    def test_slots_game_logic_lose(self, mock_choices):
+    def test_slots_game_logic_lose(self):
         """тестуємо логіку програшу в Слотах"""
-        mock_choices.return_value = ["🍒", "BAR", "🍋"]
+        rng = ScriptedRandom(choices=[[0, 3, 1]])  #"🍒", "BAR", "🍋"
 
-        result = self.slots_game.play_once()
+        result = SlotsGame(rng=rng).play_once()
 
         self.assertFalse(result.is_win)
         self.assertEqual(result.money_delta, -1.0)
+        self.assertEqual(result.primary_value, "🍒 BAR 🍋")
 
-    @patch('game_logic.random.randint')
-    def test_pistol_game_logic_lose(self, mock_randint):
+    def test_slots_custom_paytable(self):
+        """тестуємо Слоти з власними символами, вагами та виплатами"""
+        game = SlotsGame(symbols=["A", "B"], weights=[1, 3], payouts=[7, 2],
+                         rng=ScriptedRandom(choices=[[0, 0, 0]]))
+        self.assertEqual(game.play_once().money_delta, 7.0)
+
+        batch = game.play_many(5000, np.random.default_rng(6))
+        self.assertTrue(set(batch.money_deltas.tolist()) <= {7.0, 2.0, -1.0})
+        self.assertEqual(game.decode_outcome(0), "A A A")
+
+    def test_slots_fractional_weights(self):
+        """тестуємо, що дробові ваги теж працюють (через кумулятивну таблицю)"""
+        game = SlotsGame(weights=[0.25, 0.2, 0.15, 0.15, 0.1, 0.05])
+        batch = game.play_many(5000, np.random.default_rng(6))
+        self.assertTrue(np.all((batch.outcomes >= 0) & (batch.outcomes < 216)))
+
+    def test_slots_rejects_mismatched_tables(self):
+        """тестуємо, що таблиці різної довжини відхиляються"""
+        with self.assertRaises(ValueError):
+            SlotsGame(symbols=["A", "B"], weights=[1, 2, 3], payouts=[1, 2])
+
+    def test_slots_rejects_bad_weights(self):
+        """тестуємо, що від'ємні ваги чи ваги з нульовою сумою відхиляються ще в конструкторі"""
+        for weights in ([0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 2, -1]):
+            with self.assertRaises(ValueError):
+                SlotsGame(weights=weights)
+
+    def test_pistol_game_logic_lose(self):
         """тестуємо логіку програшу в Рулетці (подія сталася)"""
-        mock_randint.return_value = 1
-        result = self.pistol_game.play_once()
+        result = PistolRouletteGame(rng=ScriptedRandom(randints=[1])).play_once()
         self.assertFalse(result.is_win)
         self.assertEqual(result.money_delta, -5.0)
 
-    @patch('game_logic.random.randint')
-    def test_pistol_game_logic_win(self, mock_randint):
+    def test_pistol_game_logic_win(self):
         """тестуємо логіку виграшу в Рулетці (подія не сталася)"""
-        mock_randint.return_value = 4
-        result = self.pistol_game.play_once()
+        result = PistolRouletteGame(rng=ScriptedRandom(randints=[4])).play_once()
         self.assertTrue(result.is_win)
         self.assertEqual(result.money_delta, 1.0)
 
+    # --- Тести для пакетного режиму play_many ---
+
+    def test_play_many_returns_columnar_batch(self):
+        """тестуємо, що play_many повертає масиви потрібної довжини"""
+        for game in (self.dice_game, self.slots_game, self.pistol_game):
+            batch = game.play_many(1000)
+            self.assertIsInstance(batch, ResultBatch)
+            self.assertEqual(len(batch), 1000)
+            self.assertEqual(batch.wins.dtype, bool)
+            self.assertEqual(batch.money_deltas.shape, (1000,))
+
+    def test_dice_play_many_rules(self):
+        """тестуємо, що пакетні Кості дотримуються тих самих правил"""
+        batch = self.dice_game.play_many(10000, np.random.default_rng(1))
+        self.assertTrue(np.all((batch.outcomes >= 2) & (batch.outcomes <= 12)))
+        self.assertTrue(np.all(batch.money_deltas[batch.wins] == 4.0))
+        self.assertTrue(np.all(batch.money_deltas[~batch.wins] == -1.0))
+        #дубль завжди дає парну суму
+        self.assertTrue(np.all(batch.outcomes[batch.wins] % 2 == 0))
+
+    def test_slots_play_many_rules(self):
+        """тестуємо, що пакетні Слоти платять за таблицею і коди декодуються"""
+        batch = self.slots_game.play_many(20000, np.random.default_rng(2))
+        for code, is_win, delta in zip(batch.outcomes[:500], batch.wins, batch.money_deltas):
+            reels = self.slots_game.decode_outcome(code).split(" ")
+            self.assertEqual(is_win, len(set(reels)) == 1)
+            if is_win:
+                index = self.slots_game.SYMBOLS.index(reels[0])
+                self.assertEqual(delta, self.slots_game.PAYOUTS[index])
+            else:
+                self.assertEqual(delta, -1.0)
+
+    def test_pistol_play_many_rules(self):
+        """тестуємо, що пакетна Рулетка програє лише на 1"""
+        batch = self.pistol_game.play_many(10000, np.random.default_rng(3))
+        np.testing.assert_array_equal(batch.wins, batch.outcomes != 1)
+        self.assertEqual(set(batch.money_deltas.tolist()), {1.0, -5.0})
+
+    def test_play_many_is_reproducible_with_rng(self):
+        """тестуємо, що однаковий генератор дає однаковий пакет"""
+        first = self.slots_game.play_many(500, np.random.default_rng(42))
+        second = self.slots_game.play_many(500, np.random.default_rng(42))
+        np.testing.assert_array_equal(first.outcomes, second.outcomes)
+
+    def test_default_play_many_uses_given_rng(self):
+        """тестуємо, що базовий play_many (цикл play_once) бере потік з переданого генератора"""
+        game = PistolRouletteGame(seed=1)
+        first = IGame.play_many(game, 500, np.random.default_rng(42))
+        game.play_once()  #стан гри не впливає на пакет
+        second = IGame.play_many(game, 500, np.random.default_rng(42))
+        other = IGame.play_many(game, 500, np.random.default_rng(43))
+        np.testing.assert_array_equal(first.outcomes, second.outcomes)
+        self.assertFalse(np.array_equal(first.outcomes, other.outcomes))
+
+    # --- Тести для генераторів випадкових чисел ---
+
+    def test_same_seed_replays_play_once(self):
+        """тестуємо, що однаковий seed повторює ту саму послідовність раундів"""
+        for game_class in (DiceGame, SlotsGame, PistolRouletteGame):
+            first = game_class(seed=10)
+            second = game_class(seed=10)
+            self.assertEqual([first.play_once() for _ in range(50)],
+                             [second.play_once() for _ in range(50)])
+
+    def test_same_seed_replays_play_many(self):
+        """тестуємо, що пакетний режим без явного rng бере генератор гри"""
+        first = SlotsGame(seed=10).play_many(1000)
+        second = SlotsGame(seed=10).play_many(1000)
+        np.testing.assert_array_equal(first.outcomes, second.outcomes)
+        self.assertEqual(SlotsGame(seed=10).seed, 10)
+
+    def test_negative_seed_is_rejected(self):
+        """тестуємо, що від'ємний seed відхиляється зрозумілою помилкою ще в конструкторі"""
+        with self.assertRaises(ValueError):
+            DiceGame(seed=-1)
+
+    def test_numpy_generator_injection(self):
+        """тестуємо, що гра приймає numpy Generator і лишається відтворюваною"""
+        first = DiceGame(rng=np.random.default_rng(5))
+        second = DiceGame(rng=np.random.default_rng(5))
+        self.assertEqual(first.play_once(), second.play_once())
+        np.testing.assert_array_equal(first.play_many(100).outcomes, second.play_many(100).outcomes)
+
+    def test_random_instance_injection(self):
+        """тестуємо, що гра приймає random.Random"""
+        first = PistolRouletteGame(rng=random.Random(5))
+        second = PistolRouletteGame(rng=random.Random(5))
+        self.assertEqual(first.play_once(), second.play_once())
+        np.testing.assert_array_equal(first.play_many(100).outcomes, second.play_many(100).outcomes)
+
+    def test_rejects_unknown_rng(self):
+        """тестуємо, що невідомий тип генератора відхиляється"""
+        with self.assertRaises(TypeError):
+            DiceGame(rng=42)
+
+    # --- Тести для компактних результатів ---
+
+    def test_game_result_is_slotted_and_frozen(self):
+        """тестуємо, що GameResult не має __dict__ і не змінюється"""
+        result = self.dice_game.play_once()
+        self.assertFalse(hasattr(result, "__dict__"))
+        with self.assertRaises(FrozenInstanceError):
+            result.money_delta = 100.0
+
+    def test_result_batch_behaves_like_sequence(self):
+        """тестуємо індексацію, зрізи та ітерацію ResultBatch"""
+        batch = self.slots_game.play_many(100, np.random.default_rng(4))
+        self.assertIsInstance(batch[0], GameResult)
+        self.assertEqual(batch[3].primary_value, self.slots_game.decode_outcome(batch.outcomes[3]))
+        self.assertEqual(len(batch[10:20]), 10)
+        self.assertEqual(sum(r.money_delta for r in batch), batch.total_money_delta())
+
+        joined = ResultBatch.concatenate([batch[:40], batch[40:]])
+        np.testing.assert_array_equal(joined.outcomes, batch.outcomes)
+
+    def test_result_batch_from_results(self):
+        """тестуємо пакування списку GameResult у колонки"""
+        results = [self.pistol_game.play_once() for _ in range(50)]
+        batch = ResultBatch.from_results(results)
+        self.assertEqual(list(batch), results)
+
+    def test_memory_per_round(self):
+        """
+        тестуємо пам'ять на раунд: старий список dataclass'ів проти нових форматів.
+        Тут лише перевіряється, що новий формат менший (на 50 000 результатах);
+        цифри для 1M результатів пише бенчмарк (python benchmark.py, поле result_memory).
+        """
+        memory = result_memory(SlotsGame(), 50_000, seed=1)
+        legacy = memory["legacy_bytes_per_result"]
+
+        #цифри - лише в повідомленні про помилку, щоб тест нічого не друкував
+        report = f"пам'ять на раунд: list[dataclass] {legacy:.1f} Б, " \
+                 f"list[GameResult(slots)] {memory['slotted_bytes_per_result']:.1f} Б, " \
+                 f"ResultBatch {memory['packed_bytes_per_result']:.1f} Б"
+        self.assertLess(memory["slotted_bytes_per_result"], legacy, msg=report)
+        self.assertLess(memory["packed_bytes_per_result"] * 10, legacy, msg=report)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from game_logic import IGame, GameResult, SlotsGame
+from game_registry import GameRegistry, default_registry
+
+#найпростіша гра: лише play_once, без пакетного режиму і точної моделі
+class ScalarGame(IGame):
+
+    def get_game_name(self) -> str:
+        return "Тестова гра"
+
+    def play_once(self) -> GameResult:
+        return GameResult(outcome=1, is_win=True, money_delta=1.0)
+
+
+class TestGameRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        sys.path.insert(0, self.directory.name)
+
+    def tearDown(self):
+        sys.path.remove(self.directory.name)
+        for name in ("lazy_game_module", "plugin_game_module"):
+            sys.modules.pop(name, None)
+        self.directory.cleanup()
+
+    def write_module(self, name: str):
+        with open(os.path.join(self.directory.name, f"{name}.py"), "w", encoding="utf-8") as file:
+            file.write("from test_game_registry import ScalarGame\n\n"
+                       "class PluginGame(ScalarGame):\n    pass\n")
+
+    def test_builtin_games(self):
+        """тестуємо вбудовані ігри і їх можливості"""
+        registry = default_registry()
+        self.assertEqual(registry.keys()[:3], ["dice", "slots", "pistol"])
+        game = registry.create("slots", seed=3)
+        self.assertIsInstance(game, SlotsGame)
+        self.assertEqual(game.seed, 3)
+        capabilities = registry.get("dice").capabilities()
+        self.assertTrue(capabilities.batch and capabilities.analytic)
+
+    def test_module_is_imported_only_when_selected(self):
+        """тестуємо лінивий імпорт модуля гри"""
+        self.write_module("lazy_game_module")
+        registry = GameRegistry()
+        registry.register("lazy", "Лінива", "lazy_game_module:PluginGame")
+        self.assertNotIn("lazy_game_module", sys.modules)
+        registry.create("lazy")
+        self.assertIn("lazy_game_module", sys.modules)
+
+    def test_capabilities_of_scalar_game(self):
+        """тестуємо, що гра без play_many і outcome_space так і позначається"""
+        registry = GameRegistry()
+        registry.register("scalar", "Проста", "test_game_registry:ScalarGame")
+        capabilities = registry.get("scalar").capabilities()
+        self.assertFalse(capabilities.batch)
+        self.assertFalse(capabilities.analytic)
+
+    def test_entry_point_discovery(self):
+        """тестуємо пошук ігор через entry points встановлених пакетів"""
+        self.write_module("plugin_game_module")
+        dist_info = os.path.join(self.directory.name, "plugin_games-1.0.dist-info")
+        os.makedirs(dist_info)
+        with open(os.path.join(dist_info, "METADATA"), "w", encoding="utf-8") as file:
+            file.write("Metadata-Version: 2.1\nName: plugin-games\nVersion: 1.0\n")
+        with open(os.path.join(dist_info, "entry_points.txt"), "w", encoding="utf-8") as file:
+            file.write("[ovvrabet.games]\nplugin = plugin_game_module:PluginGame\n")
+
+        registry = GameRegistry()
+        added = registry.discover()
+        self.assertEqual([spec.key for spec in added], ["plugin"])
+        self.assertNotIn("plugin_game_module", sys.modules)
+        self.assertEqual(registry.create("plugin").get_game_name(), "Тестова гра")
+
+    def test_variants(self):
+        """тестуємо варіанти таблиць виплат і пошук ключа за грою"""
+        registry = default_registry()
+        path = os.path.join(self.directory.name, "variants.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump([{"key": "slots-flat", "base": "slots", "label": "Слоти (рівні ваги)",
+                        "config": {"weights": [1, 1, 1, 1, 1, 1]}}], file)
+        registry.load_variants(path)
+
+        game = registry.create("slots-flat")
+        self.assertEqual(game.WEIGHTS, [1, 1, 1, 1, 1, 1])
+        self.assertEqual(registry.key_for(game), "slots-flat")
+        self.assertEqual(registry.key_for(SlotsGame()), "slots")
+
+    def test_errors(self):
+        """тестуємо повторну реєстрацію і ціль, що не є грою"""
+        registry = default_registry()
+        with self.assertRaises(ValueError):
+            registry.register("dice", "Кості", "game_logic:DiceGame")
+        registry.register("broken", "Не гра", "game_logic:ResultBatch")
+        with self.assertRaises(TypeError):
+            registry.create("broken")
+        with self.assertRaises(KeyError):
+            registry.get("missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import profiling
+from game_logic import DiceGame, SlotsGame, IGame, GameResult
+from profiling import Profiler, phase, format_profile
+from simulation import run_simulation
+
+class CoinGame(IGame):
+    """гра без власного play_many (іде через цикл play_once)"""
+
+    def get_game_name(self) -> str:
+        return "Монетка"
+
+    def play_once(self) -> GameResult:
+        is_win = self.py_rng.random() < 0.5
+        return GameResult(outcome=int(is_win), is_win=is_win, money_delta=1.0 if is_win else -1.0)
+
+class TestProfiling(unittest.TestCase):
+
+    def test_disabled_phase_is_shared_noop(self):
+        """тестуємо, що без профайлера phase() нічого не створює і не записує"""
+        self.assertIsNone(profiling.active())
+        self.assertIs(phase("draw"), phase("score"))
+        with phase("draw"):
+            pass
+        self.assertIsNone(profiling.active())
+
+    def test_nested_phases(self):
+        """тестуємо вкладені фази і відновлення попереднього профайлера"""
+        with Profiler() as outer:
+            with Profiler() as inner:
+                with phase("simulate"):
+                    with phase("play"):
+                        pass
+                    with phase("play"):
+                        pass
+            self.assertIs(profiling.active(), outer)
+        self.assertIsNone(profiling.active())
+        self.assertEqual(inner.report.phases["simulate"][0], 1)
+        self.assertEqual(inner.report.phases["simulate/play"][0], 2)
+        self.assertEqual(outer.report.phases, {})
+
+    def test_profiler_is_per_thread(self):
+        """тестуємо, що фази з інших потоків не потрапляють у стек профайлера"""
+        seen = []
+
+        def other_thread():
+            seen.append(profiling.active())
+            with phase("callback"):
+                pass
+
+        with Profiler() as profiler:
+            with phase("simulate"):
+                thread = threading.Thread(target=other_thread)
+                thread.start()
+                thread.join()
+        self.assertEqual(seen, [None])
+        self.assertEqual(set(profiler.report.phases), {"simulate"})
+
+    def test_simulation_phases_and_rounds(self):
+        """тестуємо фази рушія і гри, кількість раундів і швидкість"""
+        with Profiler() as profiler:
+            run_simulation(SlotsGame(), 30000, seed=1, workers=1, chunk_size=10000)
+        report = profiler.report
+        self.assertEqual(report.rounds, 30000)
+        self.assertGreater(report.rounds_per_second, 0)
+        for path in ("play", "play/draw", "play/score", "play/aggregate", "merge"):
+            self.assertIn(path, report.phases)
+        self.assertEqual(report.phases["play/draw"][0], 3)
+        self.assertIn("раундів/с", format_profile(report))
+
+    def test_play_once_loop_phase(self):
+        """тестуємо фазу циклу play_once для гри без пакетної реалізації"""
+        with Profiler() as profiler:
+            run_simulation(CoinGame(), 2000, seed=1, workers=1, chunk_size=1000)
+        self.assertEqual(profiler.report.phases["play/play_once"][0], 2)
+        self.assertEqual(profiler.report.phases["play/pack"][0], 2)
+
+    def test_worker_phases_are_merged(self):
+        """тестуємо, що фази з процесів-воркерів потрапляють у звіт, а результат не змінюється"""
+        with Profiler() as profiler:
+            profiled = run_simulation(DiceGame(), 40000, seed=2, workers=2, chunk_size=10000)
+        self.assertEqual(profiled, run_simulation(DiceGame(), 40000, seed=2, workers=2, chunk_size=10000))
+        self.assertIsNone(profiled.profile)
+        self.assertEqual(profiler.report.phases["play/draw"][0], 4)
+        self.assertEqual(profiler.report.rounds, 40000)
+
+    def test_memory_and_dump(self):
+        """тестуємо пік пам'яті через tracemalloc і знімки cProfile/tracemalloc"""
+        with tempfile.TemporaryDirectory() as directory:
+            with Profiler(trace_memory=True, cprofile=True, dump_dir=directory) as profiler:
+                run_simulation(SlotsGame(), 10000, seed=3, workers=1, chunk_size=10000)
+            report = profiler.report
+            self.assertEqual(report.memory_source, "tracemalloc")
+            self.assertGreater(report.peak_memory_bytes, 0)
+            self.assertEqual(len(report.dump_paths), 2)
+            for path in report.dump_paths:
+                self.assertTrue(os.path.getsize(path) > 0)
+        self.assertEqual(report.to_dict()["phases"]["play"]["calls"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
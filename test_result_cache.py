@@ -0,0 +1,99 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from game_logic import DiceGame, SlotsGame, PistolRouletteGame
+from simulation import run_simulation
+from result_cache import SimulationCache, HIT, EXTENDED, MISS, UNCACHED
+
+class TestResultCache(unittest.TestCase):
+
+    def test_repeated_run_is_a_hit(self):
+        """тестуємо, що повторний запуск з тим самим seed береться з кешу"""
+        cache = SimulationCache()
+        first = cache.run(SlotsGame(), 30000, seed=1, workers=1, chunk_size=10000)
+        self.assertEqual(cache.last_source, MISS)
+        second = cache.run(SlotsGame(), 30000, seed=1, workers=1, chunk_size=10000)
+        self.assertEqual(cache.last_source, HIT)
+        self.assertEqual(cache.last_simulated_runs, 0)
+        self.assertEqual(first, second)
+
+        second.histogram.clear()  #зміни копії не псують кеш
+        self.assertEqual(cache.run(SlotsGame(), 30000, seed=1, workers=1, chunk_size=10000), first)
+
+    def test_extension_simulates_only_the_delta(self):
+        """тестуємо продовження: симулюється лише різниця, а результат як з нуля"""
+        cache = SimulationCache()
+        cache.run(DiceGame(), 40000, seed=2, workers=1, chunk_size=10000)
+        extended = cache.run(DiceGame(), 65000, seed=2, workers=1, chunk_size=10000)
+        self.assertEqual(cache.last_source, EXTENDED)
+        self.assertEqual(cache.last_simulated_runs, 25000)
+        self.assertEqual(extended, run_simulation(DiceGame(), 65000, seed=2, workers=1, chunk_size=10000))
+
+    def test_key_includes_paytable(self):
+        """тестуємо, що інша таблиця виплат - інший ключ"""
+        cache = SimulationCache()
+        cache.run(SlotsGame(), 10000, seed=3, workers=1, chunk_size=10000)
+        cache.run(SlotsGame(payouts=[1, 2, 3, 4, 5, 6]), 10000, seed=3, workers=1, chunk_size=10000)
+        self.assertEqual(cache.last_source, MISS)
+
+    def test_without_seed_cache_is_bypassed(self):
+        """тестуємо, що запуск без seed не кешується"""
+        cache = SimulationCache()
+        cache.run(DiceGame(), 1000, workers=1)
+        self.assertEqual(cache.last_source, UNCACHED)
+        self.assertEqual(cache.best_prefix(DiceGame(), None, 1000), None)
+
+    def test_game_without_config_is_bypassed(self):
+        """тестуємо, що гра з параметрами без get_config() не ділить ключ між варіантами"""
+        class LoadedPistol(PistolRouletteGame):
+            def __init__(self, loaded: int = 1, rng=None, seed=None):
+                super().__init__(rng, seed)
+                self.loaded = loaded
+
+        cache = SimulationCache()
+        self.assertTrue(cache.cacheable(DiceGame()))
+        self.assertFalse(cache.cacheable(LoadedPistol(2)))
+        cache.run(LoadedPistol(1), 1000, seed=4, workers=1)
+        self.assertEqual(cache.last_source, UNCACHED)
+        cache.run(LoadedPistol(2), 1000, seed=4, workers=1)
+        self.assertEqual(cache.last_source, UNCACHED)
+        self.assertIsNone(cache.get(LoadedPistol(2), 4, 1000))
+
+    def test_memory_lru(self):
+        """тестуємо витіснення найдавніше використаного запису з пам'яті"""
+        cache = SimulationCache(max_entries=2)
+        for seed in (1, 2, 3):
+            cache.run(DiceGame(), 1000, seed=seed, workers=1)
+        self.assertIsNone(cache.get(DiceGame(), 1, 1000))
+        self.assertIsNotNone(cache.get(DiceGame(), 3, 1000))
+
+    def test_disk_tier(self):
+        """тестуємо, що запис на диску переживає новий екземпляр кешу і витісняється за розміром"""
+        with tempfile.TemporaryDirectory() as directory:
+            SimulationCache(directory=directory).run(SlotsGame(), 20000, seed=4, workers=1, chunk_size=10000)
+            cache = SimulationCache(directory=directory)
+            cache.run(SlotsGame(), 20000, seed=4, workers=1, chunk_size=10000)
+            self.assertEqual(cache.last_source, HIT)
+
+            small = SimulationCache(directory=directory, max_disk_bytes=1)
+            small.run(SlotsGame(), 10000, seed=5, workers=1, chunk_size=10000)
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_cancelled_run_is_resumed(self):
+        """тестуємо, що скасований запуск потім дораховується, а не починається з нуля"""
+        cache = SimulationCache()
+        cancel_event = threading.Event()
+        partial = cache.run(DiceGame(), 50000, seed=6, workers=1, chunk_size=10000,
+                            on_progress=lambda progress: cancel_event.set(), cancel_event=cancel_event)
+        self.assertTrue(partial.cancelled)
+
+        full = cache.run(DiceGame(), 50000, seed=6, workers=1, chunk_size=10000)
+        self.assertEqual(cache.last_source, EXTENDED)
+        self.assertEqual(cache.last_simulated_runs, 40000)
+        self.assertFalse(full.cancelled)
+
+
+if __name__ == '__main__':
+    unittest.main()
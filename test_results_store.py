@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from game_logic import DiceGame, SlotsGame
+from simulation import run_simulation
+from results_store import ResultsStore, StoredRun, diff_runs, format_diff
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ResultsStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def save_run(self, game, runs, seed, **kwargs):
+        writer = self.store.new_writer(game, {"runs": runs})
+        summary = run_simulation(game, runs, seed=seed, workers=1, chunk_size=10000,
+                                 sink=writer, **kwargs)
+        return summary, StoredRun(writer.close(summary, elapsed=0.1))
+
+    def test_round_trip(self):
+        """тестуємо, що збережений запуск читається тими самими колонками"""
+        game = DiceGame()
+        summary, run = self.save_run(game, 25000, seed=3)
+        self.assertIsNone(summary.raw_chunks)  #sink не тримає пакети в пам'яті
+        self.assertIsInstance(run.outcomes, np.memmap)
+        self.assertEqual(run.runs, 25000)
+        self.assertEqual(run.seed, 3)
+        self.assertEqual(run.header["parameters"], {"runs": 25000})
+
+        raw = run_simulation(game, 25000, seed=3, workers=1, chunk_size=10000, keep_raw=True)
+        self.assertTrue(np.array_equal(run.outcomes, raw.raw_outcomes))
+        self.assertEqual(int(run.wins.sum()), raw.wins)
+
+    def test_reaggregated_summary_matches(self):
+        """тестуємо, що переагрегація з файлу дає той самий підсумок"""
+        summary, run = self.save_run(SlotsGame(), 30000, seed=5)
+        replay = run.summary(chunk_size=10000)
+        self.assertEqual(replay.histogram, summary.histogram)
+        self.assertEqual(replay.wins, summary.wins)
+        self.assertAlmostEqual(replay.money_delta, summary.money_delta)
+        self.assertAlmostEqual(replay.variance, summary.variance)
+
+    def test_game_is_restored_with_config(self):
+        """тестуємо, що гра відновлюється з тією самою таблицею виплат"""
+        game = SlotsGame(weights=[1, 1, 1, 1, 1, 1])
+        _, run = self.save_run(game, 1000, seed=1)
+        restored = run.game()
+        self.assertIsInstance(restored, SlotsGame)
+        self.assertEqual(restored.WEIGHTS, [1, 1, 1, 1, 1, 1])
+
+    def test_game_must_be_registered(self):
+        """тестуємо, що клас гри з файлу береться лише з реєстру"""
+        _, run = self.save_run(DiceGame(), 100, seed=1)
+        self.assertEqual(run.header["game_key"], "dice")
+        run.header.pop("game_key")
+        self.assertIsInstance(run.game(), DiceGame)  #старий файл - за шляхом до класу
+
+        run.header["game_class"] = "os.system"
+        with self.assertRaises(ValueError):
+            run.game()
+        run.header["game_key"] = "dice"
+        run.header["config"] = {"sides": 7}
+        with self.assertRaises(ValueError):
+            run.game()
+
+    def test_diff(self):
+        """тестуємо порівняння запусків з однаковим і різним seed"""
+        _, first = self.save_run(DiceGame(), 20000, seed=1)
+        _, same = self.save_run(DiceGame(), 20000, seed=1)
+        _, other = self.save_run(DiceGame(), 20000, seed=2)
+
+        identical = diff_runs(first, same)
+        self.assertIsNone(identical.first_divergence)
+        self.assertEqual(identical.histogram_difference, {})
+
+        different = diff_runs(first, other)
+        self.assertIsNotNone(different.first_divergence)
+        self.assertEqual(sum(different.histogram_difference.values()), 0)
+        self.assertIn("Перша відмінність", format_diff(first, other, different))
+
+    def test_list_runs(self):
+        """тестуємо перелік запусків у теці"""
+        self.save_run(DiceGame(), 100, seed=1)
+        self.save_run(DiceGame(), 200, seed=2)
+        self.assertEqual([run.runs for run in self.store.list_runs()], [100, 200])
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)  #тимчасових файлів не лишилося
+
+    def test_rejects_foreign_file(self):
+        """тестуємо, що чужий файл не читається як запуск"""
+        path = os.path.join(self.directory.name, "junk.run")
+        with open(path, "wb") as file:
+            file.write(b"not a run file")
+        with self.assertRaises(ValueError):
+            StoredRun(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import threading
+import unittest
+
+from game_logic import DiceGame, SlotsGame
+from scheduler import ChunkScheduler, format_jobs, DONE, CANCELLED
+from simulation import run_simulation
+
+class TestChunkScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = ChunkScheduler(workers=2)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_results_match_run_simulation(self):
+        """тестуємо, що кожне завдання черги дає той самий підсумок, що й run_simulation"""
+        slots = self.scheduler.submit(SlotsGame(), 95000, seed=1, chunk_size=10000)
+        dice = self.scheduler.submit(DiceGame(), 42000, seed=2, chunk_size=10000)
+        self.assertEqual(slots.wait(), run_simulation(SlotsGame(), 95000, seed=1, workers=1, chunk_size=10000))
+        self.assertEqual(dice.wait(), run_simulation(DiceGame(), 42000, seed=2, workers=1, chunk_size=10000))
+        self.assertEqual((slots.status, dice.status), (DONE, DONE))
+
+    def test_short_job_is_not_stuck_behind_long_one(self):
+        """тестуємо чергування: коротка гра завершується раніше за довгу, додану першою"""
+        finished = []
+        lock = threading.Lock()
+
+        def on_done(job):
+            with lock:
+                finished.append(job.label)
+
+        self.scheduler.submit(SlotsGame(), 2_000_000, seed=3, chunk_size=10000, label="long", on_done=on_done)
+        short = self.scheduler.submit(DiceGame(), 30000, seed=4, chunk_size=10000, label="short", on_done=on_done)
+        short.wait()
+        self.scheduler.jobs[0].wait()
+        self.assertEqual(finished, ["short", "long"])
+
+    def test_priority_weights_dispatch(self):
+        """тестуємо зважений вибір: пріоритет 3 отримує втричі більше пакетів"""
+        scheduler = ChunkScheduler(workers=1, max_pending=1)
+        try:
+            low = scheduler.submit(DiceGame(), 10 ** 9, seed=5, chunk_size=1000, priority=1)
+            high = scheduler.submit(DiceGame(), 10 ** 9, seed=6, chunk_size=1000, priority=3)
+            while high.dispatched < 60:
+                high.wait(0.01)
+            scheduler.cancel(low)
+            scheduler.cancel(high)
+            self.assertAlmostEqual(high.dispatched / low.dispatched, 3, delta=0.5)
+        finally:
+            scheduler.shutdown()
+
+    def test_cancel_and_progress(self):
+        """тестуємо скасування: лишаються цілі пакети до зупинки, прогрес публікується"""
+        progress = []
+        job = self.scheduler.submit(SlotsGame(), 10 ** 8, seed=7, chunk_size=10000,
+                                    on_progress=progress.append)
+        while not progress:
+            job.wait(0.01)
+        self.scheduler.cancel(job)
+        summary = job.wait()
+        self.assertEqual(job.status, CANCELLED)
+        self.assertTrue(summary.cancelled)
+        self.assertEqual(summary.runs % 10000, 0)
+        self.assertIn("скасовано", format_jobs([job]))
+
+    def test_empty_and_invalid_jobs(self):
+        """тестуємо завдання без раундів, некоректний пріоритет і розмір пакета"""
+        job = self.scheduler.submit(DiceGame(), 0, seed=1)
+        self.assertEqual(job.wait().runs, 0)
+        self.assertEqual(job.status, DONE)
+        with self.assertRaises(ValueError):
+            self.scheduler.submit(DiceGame(), 100, priority=0)
+        with self.assertRaises(ValueError):
+            self.scheduler.submit(DiceGame(), 100, chunk_size=0)
+        self.assertEqual(self.scheduler.submit(DiceGame(), 100, seed=2).wait().runs, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import unittest
+
+from game_logic import DiceGame, SlotsGame
+from service import SimulationService, JobError, DONE, CANCELLED
+from simulation import run_simulation
+
+class TestSimulationService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = SimulationService(workers=2)
+        self.service.start()
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def request(self, port: int, method: str, path: str, data=None) -> tuple:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        response = await reader.read()
+        writer.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), payload
+
+    async def test_result_matches_run_simulation(self):
+        """тестуємо, що результат завдання такий самий, як у run_simulation з тим самим seed"""
+        job = await self.service.run("slots", 120000, seed=5, chunk_size=20000)
+        self.assertEqual(job.status, DONE)
+        self.assertEqual(job.summary, run_simulation(SlotsGame(), 120000, seed=5, workers=1, chunk_size=20000))
+        self.assertEqual(job.to_dict()["result"]["runs"], 120000)
+
+    async def test_identical_jobs_are_deduplicated(self):
+        """тестуємо, що однакове завдання, що виконується, не запускається вдруге"""
+        first = self.service.submit("dice", 100000, seed=1, chunk_size=10000)
+        second = self.service.submit("dice", 100000, seed=1, chunk_size=10000)
+        other = self.service.submit("dice", 100000, seed=2, chunk_size=10000)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        await asyncio.gather(first.wait(), other.wait())
+
+        again = await self.service.run("dice", 100000, seed=1, chunk_size=10000)
+        self.assertIsNot(again, first)
+        self.assertEqual(again.source, "hit")
+        self.assertEqual(again.summary, first.summary)
+
+    async def test_concurrent_jobs_share_the_pool(self):
+        """тестуємо кілька завдань одночасно і продовження з кешу"""
+        jobs = [self.service.submit("dice", 50000, seed=seed, chunk_size=10000) for seed in range(3)]
+        await asyncio.gather(*(job.wait() for job in jobs))
+        for seed, job in enumerate(jobs):
+            self.assertEqual(job.summary, run_simulation(DiceGame(), 50000, seed=seed, workers=1, chunk_size=10000))
+
+        longer = await self.service.run("dice", 80000, seed=0, chunk_size=10000)
+        self.assertEqual(longer.source, "extended")
+        self.assertEqual(longer.summary, run_simulation(DiceGame(), 80000, seed=0, workers=1, chunk_size=10000))
+
+    async def test_cancel(self):
+        """тестуємо скасування: завдання зупиняється, підсумок містить цілі пакети"""
+        job = self.service.submit("slots", 5_000_000, seed=3, chunk_size=10000)
+        self.service.cancel(job.id)
+        await job.wait()
+        self.assertEqual(job.status, CANCELLED)
+        self.assertTrue(job.summary.cancelled)
+        self.assertEqual(job.summary.runs % 10000, 0)
+
+    async def test_invalid_jobs(self):
+        """тестуємо помилки: невідома гра, від'ємні раунди, зайвий параметр"""
+        with self.assertRaises(JobError):
+            self.service.submit("poker", 100)
+        with self.assertRaises(JobError):
+            self.service.submit("dice", -1)
+        with self.assertRaises(JobError):
+            self.service.submit("slots", 100, config={"reels": 5})
+        for config in ([1, 2], "x"):
+            with self.assertRaises(JobError):
+                self.service.submit("dice", 100, config=config)
+
+    async def test_finished_jobs_are_forgotten(self):
+        """тестуємо, що сервіс тримає лише max_finished_jobs завершених завдань"""
+        self.service.max_finished_jobs = 2
+        jobs = [await self.service.run("dice", 1000, seed=seed) for seed in range(4)]
+        self.assertEqual(list(self.service.jobs), [job.id for job in jobs[2:]])
+
+    async def test_http_api(self):
+        """тестуємо HTTP API: завдання, потік прогресу, стан і помилки"""
+        server = await self.service.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            status, payload = await self.request(port, "POST", "/jobs",
+                                                 {"game": "pistol", "runs": 40000, "seed": 1,
+                                                  "chunk_size": 10000})
+            self.assertEqual(status, 202)
+            job_id = json.loads(payload)["id"]
+
+            status, payload = await self.request(port, "GET", f"/jobs/{job_id}/events")
+            states = [json.loads(line) for line in payload.splitlines()]
+            self.assertEqual(status, 200)
+            self.assertEqual(states[-1]["status"], DONE)
+            self.assertEqual(states[-1]["result"]["runs"], 40000)
+
+            status, payload = await self.request(port, "GET", f"/jobs/{job_id}")
+            self.assertEqual(json.loads(payload)["progress"]["runs_done"], 40000)
+
+            status, payload = await self.request(port, "GET", "/games")
+            self.assertIn("slots", [game["key"] for game in json.loads(payload)])
+
+            status, _ = await self.request(port, "POST", "/jobs", {"game": "poker", "runs": 1})
+            self.assertEqual(status, 400)
+            status, _ = await self.request(port, "POST", "/jobs", {"game": "dice", "runs": 1,
+                                                                  "config": [1, 2]})
+            self.assertEqual(status, 400)
+            status, _ = await self.request(port, "GET", "/jobs/missing")
+            self.assertEqual(status, 404)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+
+from game_logic import DiceGame, SlotsGame, PistolRouletteGame
+from session import simulate_sessions, exact_sessions, format_session_report
+
+class TestSession(unittest.TestCase):
+
+    def test_same_seed_same_report(self):
+        """тестуємо відтворюваність сесій з однаковим seed"""
+        first = simulate_sessions(PistolRouletteGame(), 2000, 200, 20, seed=3)
+        second = simulate_sessions(PistolRouletteGame(), 2000, 200, 20, seed=3)
+        self.assertEqual(first.ruin_probability, second.ruin_probability)
+        np.testing.assert_array_equal(first.ruin_round_probabilities, second.ruin_round_probabilities)
+
+    def test_single_coin_dice_ruin_in_first_round(self):
+        """тестуємо: з 1 монетою в Костях розорення на 1-му раунді має ймовірність 5/6"""
+        report = simulate_sessions(DiceGame(), 60000, 1, 1, seed=4)
+        self.assertAlmostEqual(report.ruin_probability, 5 / 6, delta=0.01)
+        self.assertEqual(report.ruin_round_probabilities[0], 0)
+        self.assertEqual(report.ruin_probability_by(1), report.ruin_probability)
+
+    def test_stop_win_and_stop_loss(self):
+        """тестуємо зупинки: ймовірності всіх причин не перевищують 1"""
+        report = simulate_sessions(PistolRouletteGame(), 5000, 300, 50, stop_loss=20,
+                                   stop_win=10, seed=5)
+        total = report.ruin_probability + report.stop_loss_probability + report.stop_win_probability
+        self.assertLessEqual(total, 1.0)
+        self.assertGreater(report.stop_win_probability, 0)
+        self.assertGreater(report.stop_loss_probability, 0)
+        self.assertLessEqual(report.final_bankroll_quantiles[0.99], 50 + 10)
+
+    def test_bet_size_scales_deltas(self):
+        """тестуємо, що ставка множить виграші: з банкролом 10 і ставкою 10 Слоти розоряють за 1 раунд"""
+        report = simulate_sessions(SlotsGame(), 1000, 5, 10, bet=10, seed=6)
+        self.assertGreater(report.ruin_round_probabilities[1], 0.9)
+        self.assertAlmostEqual(report.ruin_round_probabilities.sum(), report.ruin_probability)
+
+    def test_blocks_do_not_change_totals(self):
+        """тестуємо, що сесії діляться на блоки без втрат"""
+        report = simulate_sessions(DiceGame(), 1234, 50, 5, seed=7, window=10, block_rounds=1000)
+        self.assertEqual(report.sessions, 1234)
+        self.assertLessEqual(report.ruin_round_probabilities.sum(), 1.0)
+        self.assertIn("Ймовірність розорення", format_session_report(DiceGame(), report))
+
+    # --- Точний розрахунок (марковський ланцюг) ---
+
+    def test_exact_single_round(self):
+        """тестуємо точний розрахунок на 1 раунді: розорення 5/6 з 1 монетою в Костях"""
+        report = exact_sessions(DiceGame(), 1, 1)
+        self.assertAlmostEqual(report.ruin_probability, 5 / 6)
+        self.assertAlmostEqual(report.mean_final_bankroll, 5 / 6 * 0 + 1 / 6 * 5)
+        self.assertIsNone(report.sessions)
+
+    def test_exact_fair_game_keeps_mean_bankroll(self):
+        """тестуємо: у чесній Рулетці з пістолетом середній банкрол не змінюється (мартингал)"""
+        report = exact_sessions(PistolRouletteGame(), 500, 100)
+        self.assertAlmostEqual(report.mean_final_bankroll, 100.0, places=6)
+
+    def test_exact_probabilities_are_consistent(self):
+        """тестуємо, що ймовірності зупинок узгоджені з розподілом по раундах"""
+        report = exact_sessions(PistolRouletteGame(), 300, 50, stop_loss=20, stop_win=10)
+        self.assertAlmostEqual(report.ruin_round_probabilities.sum(), report.ruin_probability)
+        self.assertLessEqual(report.ruin_probability + report.stop_loss_probability
+                             + report.stop_win_probability, 1.0 + 1e-12)
+        self.assertIn("точний розрахунок", format_session_report(PistolRouletteGame(), report))
+
+    def test_exact_matches_monte_carlo(self):
+        """тестуємо збіг точного розрахунку і Монте-Карло в межах похибки вибірки"""
+        for game, bankroll, kwargs in ((DiceGame(), 20, {}),
+                                       (PistolRouletteGame(), 30, {"stop_win": 15}),
+                                       (SlotsGame(), 30, {"bet": 2})):
+            exact = exact_sessions(game, 200, bankroll, **kwargs)
+            simulated = simulate_sessions(game, 20000, 200, bankroll, seed=8, **kwargs)
+            p = exact.ruin_probability
+            error = 4 * (p * (1 - p) / 20000) ** 0.5 + 1e-3
+            self.assertAlmostEqual(simulated.ruin_probability, p, delta=error)
+            self.assertAlmostEqual(simulated.stop_win_probability, exact.stop_win_probability, delta=0.02)
+
+    def test_rejects_empty_bankroll(self):
+        """тестуємо, що сесія без грошей на ставку відхиляється обома способами"""
+        with self.assertRaises(ValueError):
+            exact_sessions(DiceGame(), 10, 0.5)
+        with self.assertRaises(ValueError):
+            simulate_sessions(DiceGame(), 100, 10, 0.5, seed=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
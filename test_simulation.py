@@ -0,0 +1,169 @@
+import threading
+import unittest
+
+import numpy as np
+
+from game_logic import DiceGame, SlotsGame, PistolRouletteGame
+from analysis import analyze
+from simulation import SimulationSummary, run_simulation, run_until_precision, format_summary
+
+class TestSimulation(unittest.TestCase):
+
+    def test_summary_counts_every_round(self):
+        """тестуємо, що підсумок містить усі раунди, а гістограма сходиться"""
+        summary = run_simulation(DiceGame(), 25000, seed=1, workers=1, chunk_size=10000)
+        self.assertEqual(summary.runs, 25000)
+        self.assertEqual(sum(summary.histogram.values()), 25000)
+        self.assertTrue(set(summary.histogram) <= set(range(2, 13)))
+
+    def test_same_seed_is_bit_identical(self):
+        """тестуємо, що однаковий seed дає однаковий результат"""
+        first = run_simulation(SlotsGame(), 30000, seed=7, workers=2, chunk_size=10000)
+        second = run_simulation(SlotsGame(), 30000, seed=7, workers=2, chunk_size=10000)
+        self.assertEqual(first, second)
+
+    def test_result_does_not_depend_on_worker_count(self):
+        """тестуємо, що пакети мають власні потоки і не залежать від кількості процесів"""
+        serial = run_simulation(PistolRouletteGame(), 30000, seed=3, workers=1, chunk_size=10000)
+        parallel = run_simulation(PistolRouletteGame(), 30000, seed=3, workers=2, chunk_size=10000)
+        self.assertEqual(serial, parallel)
+
+    def test_different_seeds_differ(self):
+        """тестуємо, що різні seed дають різні потоки"""
+        first = run_simulation(SlotsGame(), 10000, seed=1, workers=1)
+        second = run_simulation(SlotsGame(), 10000, seed=2, workers=1)
+        self.assertNotEqual(first.histogram, second.histogram)
+
+    def test_seed_is_recorded(self):
+        """тестуємо, що випадково обраний seed записується в підсумок"""
+        summary = run_simulation(DiceGame(), 100, workers=1)
+        self.assertIsNotNone(summary.seed)
+        replay = run_simulation(DiceGame(), 100, seed=summary.seed, workers=1)
+        self.assertEqual(summary, replay)
+
+    def test_game_seed_is_used_by_default(self):
+        """тестуємо, що без явного seed рушій бере seed гри"""
+        summary = run_simulation(DiceGame(seed=21), 1000, workers=1)
+        self.assertEqual(summary.seed, 21)
+        self.assertIn("Seed: 21", format_summary(DiceGame(), summary))
+
+    def test_merge_adds_histograms(self):
+        """тестуємо злиття підсумків пакетів"""
+        summary = SimulationSummary(runs=2, wins=1, money_delta=3.0, histogram={2: 1, 4: 1})
+        summary.merge(SimulationSummary(runs=1, wins=0, money_delta=-1.0, histogram={4: 1}))
+        self.assertEqual(summary.runs, 3)
+        self.assertEqual(summary.money_delta, 2.0)
+        self.assertEqual(summary.histogram, {2: 1, 4: 2})
+
+    def test_empty_summary(self):
+        """тестуємо, що підсумок без раундів (скасовано до першого пакета) не ділить на нуль"""
+        summary = SimulationSummary(seed=1)
+        self.assertEqual(summary.rtp, 0.0)
+        self.assertEqual(summary.mean_delta, 0.0)
+        self.assertIn("0 разів", format_summary(SlotsGame(), summary))
+
+    def test_raw_outcomes_are_opt_in(self):
+        """тестуємо, що окремі результати зберігаються лише з keep_raw"""
+        summary = run_simulation(DiceGame(), 25000, seed=4, workers=1, chunk_size=10000)
+        self.assertIsNone(summary.raw_outcomes)
+
+        raw = run_simulation(DiceGame(), 25000, seed=4, workers=1, chunk_size=10000, keep_raw=True)
+        self.assertEqual(len(raw.raw_outcomes), 25000)
+        self.assertEqual(raw, summary)
+        for code, count in raw.histogram.items():
+            self.assertEqual(int((raw.raw_outcomes == code).sum()), count)
+
+    def test_variance_matches_numpy(self):
+        """тестуємо, що дисперсія з суми квадратів збігається з прямим розрахунком"""
+        game = SlotsGame()
+        batch = game.play_many(20000, np.random.default_rng(8))
+        summary = SimulationSummary()
+        summary.add_batch(batch)
+        self.assertAlmostEqual(summary.variance, float(np.var(batch.money_deltas, ddof=1)), places=6)
+        self.assertAlmostEqual(summary.mean_delta, float(batch.money_deltas.mean()))
+
+    def test_progress_is_published_per_chunk(self):
+        """тестуємо, що прогрес публікується після кожного пакета"""
+        progress = []
+        run_simulation(DiceGame(), 25000, seed=1, workers=1, chunk_size=10000,
+                       on_progress=progress.append)
+        self.assertEqual([p.runs_done for p in progress], [10000, 20000, 25000])
+        self.assertEqual(progress[-1].fraction_done, 1.0)
+        self.assertGreater(progress[-1].rounds_per_second, 0)
+
+    def test_cancel_stops_within_one_chunk(self):
+        """тестуємо, що скасування зупиняє симуляцію після поточного пакета"""
+        cancel_event = threading.Event()
+
+        def cancel_after_first(progress):
+            cancel_event.set()
+
+        for workers in (1, 2):
+            summary = run_simulation(SlotsGame(), 50000, seed=2, workers=workers, chunk_size=10000,
+                                     on_progress=cancel_after_first, cancel_event=cancel_event)
+            self.assertTrue(summary.cancelled)
+            self.assertEqual(summary.runs, 10000)
+            self.assertIn("СКАСОВАНО", format_summary(SlotsGame(), summary))
+            cancel_event.clear()
+
+    def test_welford_merge_matches_single_pass(self):
+        """тестуємо, що злиття пакетів (Велфорд/Чан) дає ту саму дисперсію, що й один прохід"""
+        batch = SlotsGame().play_many(30000, np.random.default_rng(9))
+        whole = SimulationSummary.from_batch(batch)
+        parts = SimulationSummary()
+        for start in range(0, 30000, 7000):
+            parts.merge(SimulationSummary.from_batch(batch[start:start + 7000]))
+        self.assertAlmostEqual(parts.variance, whole.variance, places=9)
+        self.assertEqual(parts.runs, whole.runs)
+
+    def test_resume_matches_full_run(self):
+        """тестуємо, що продовження з підсумку перших пакетів дає той самий результат"""
+        prefix = run_simulation(SlotsGame(), 40000, seed=3, workers=1, chunk_size=10000)
+        resumed = run_simulation(SlotsGame(), 95000, seed=3, workers=2, chunk_size=10000, resume=prefix)
+        self.assertEqual(resumed, run_simulation(SlotsGame(), 95000, seed=3, workers=1, chunk_size=10000))
+        with self.assertRaises(ValueError):
+            run_simulation(SlotsGame(), 95000, seed=4, workers=1, chunk_size=10000, resume=prefix)
+
+    # --- Адаптивна точність ---
+
+    def test_adaptive_run_reaches_target(self):
+        """тестуємо, що адаптивний режим зупиняється, щойно інтервал RTP достатньо вузький"""
+        summary = run_until_precision(DiceGame(), 1.0, confidence=0.95, seed=1, workers=1,
+                                      min_runs=10000)
+        self.assertLessEqual(summary.rtp_half_width(0.95), 1.0)
+        #не більше ніж удвічі від теоретично потрібної кількості раундів
+        required = (1.96 * analyze(DiceGame()).std * 100 / 1.0) ** 2
+        self.assertLess(summary.runs, 2 * required)
+        self.assertIn("довіра 95%", format_summary(DiceGame(), summary, confidence=0.95))
+
+    def test_adaptive_run_is_reproducible_across_workers(self):
+        """тестуємо, що адаптивний режим з тим самим seed не залежить від кількості процесів"""
+        serial = run_until_precision(PistolRouletteGame(), 2.0, seed=2, workers=1, min_runs=10000)
+        parallel = run_until_precision(PistolRouletteGame(), 2.0, seed=2, workers=2, min_runs=10000)
+        self.assertEqual(serial, parallel)
+
+    def test_adaptive_run_respects_max_runs(self):
+        """тестуємо, що max_runs обмежує адаптивний режим"""
+        summary = run_until_precision(SlotsGame(), 0.001, seed=3, workers=1, max_runs=25000)
+        self.assertEqual(summary.runs, 25000)
+
+    def test_adaptive_run_rejects_non_positive_precision(self):
+        """тестуємо, що нульова чи від'ємна точність відхиляється, а не крутиться безкінечно"""
+        for target in (0, -1.0):
+            with self.assertRaises(ValueError):
+                run_until_precision(DiceGame(), target, seed=1, workers=1)
+
+    def test_format_summary_shows_rtp_for_slots(self):
+        """тестуємо, що звіт для Слотів містить RTP"""
+        summary = run_simulation(SlotsGame(), 1000, seed=5, workers=1)
+        self.assertIn("RTP (Return To Player)", format_summary(SlotsGame(), summary))
+        self.assertNotIn("RTP (Return To Player)", format_summary(DiceGame(), summary))
+
+    def test_format_summary_shows_theory(self):
+        """тестуємо, що звіт містить точну теорію поруч із симуляцією"""
+        summary = run_simulation(DiceGame(), 1000, seed=5, workers=1)
+        self.assertIn("ТЕОРІЯ", format_summary(DiceGame(), summary))
+
+
+if __name__ == '__main__':
+    unittest.main()
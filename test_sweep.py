@@ -0,0 +1,75 @@
+import unittest
+
+from game_logic import IGame, GameResult, SlotsGame
+from analysis import analyze
+from game_registry import GameRegistry, default_registry
+from sweep import grid, random_configs, run_sweep, find_weights, in_band, SweepPoint
+
+#гра без точної моделі: перебір мусить її симулювати
+class CoinGame(IGame):
+
+    def __init__(self, payout: float = 1.0, rng=None, seed: int = None):
+        super().__init__(rng, seed)
+        self.payout = payout
+
+    def get_game_name(self) -> str:
+        return "Монетка"
+
+    def get_config(self) -> dict:
+        return {"payout": self.payout}
+
+    def play_once(self) -> GameResult:
+        is_win = self.py_rng.random() < 0.5
+        return GameResult(outcome=int(is_win), is_win=is_win,
+                          money_delta=self.payout if is_win else -1.0)
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_grid(self):
+        """тестуємо повну сітку параметрів"""
+        configs = grid(weights=[[1, 1], [2, 1]], payouts=[[5, 5], [1, 2], [3, 3]])
+        self.assertEqual(len(configs), 6)
+        self.assertEqual(configs[0], {"weights": [1, 1], "payouts": [5, 5]})
+
+    def test_random_configs(self):
+        """тестуємо випадкову вибірку різних комбінацій"""
+        configs = random_configs(5, seed=1, a=list(range(10)), b=list(range(10)))
+        self.assertEqual(len(configs), 5)
+        self.assertEqual(len({(c["a"], c["b"]) for c in configs}), 5)
+        self.assertEqual(random_configs(5, seed=1, a=list(range(10)), b=list(range(10))), configs)
+
+    def test_exact_points(self):
+        """тестуємо, що ігри з точною моделлю не симулюються"""
+        config = {"payouts": [1, 2, 3, 4, 5, 6]}
+        point, = run_sweep("slots", [config], workers=1)
+        self.assertEqual(point.method, "exact")
+        self.assertAlmostEqual(point.rtp, analyze(SlotsGame(**config)).rtp)
+
+    def test_simulated_points(self):
+        """тестуємо симуляцію для гри без точної моделі"""
+        registry = GameRegistry()
+        registry.register("coin", "Монетка", "test_sweep:CoinGame")
+        serial = run_sweep("coin", grid(payout=[0.5, 1.0, 2.0]), runs=4000, workers=1, registry=registry)
+        parallel = run_sweep("coin", grid(payout=[0.5, 1.0, 2.0]), runs=4000, workers=2, registry=registry)
+        self.assertEqual(serial, parallel)
+        self.assertTrue(all(point.method == "simulated" for point in serial))
+        self.assertEqual(serial[0].runs, 4000)
+        self.assertLess(serial[0].rtp, serial[2].rtp)
+
+    def test_find_weights(self):
+        """тестуємо підбір ваг під смугу RTP"""
+        registry = default_registry()
+        point = find_weights("slots", 94.0, 96.0, registry=registry)
+        self.assertTrue(94.0 <= point.rtp <= 96.0)
+        self.assertAlmostEqual(analyze(SlotsGame(**point.config)).rtp, point.rtp)
+        self.assertIsNone(find_weights("slots", 10000.0, 10001.0, registry=registry))
+
+    def test_in_band(self):
+        """тестуємо відбір точок у смузі RTP"""
+        points = [SweepPoint({}, "exact", rtp, 0, 0) for rtp in (90.0, 95.5, 94.2, 99.0)]
+        self.assertEqual([p.rtp for p in in_band(points, 94.0, 96.0)], [95.5, 94.2])
+
+
+if __name__ == '__main__':
+    unittest.main()
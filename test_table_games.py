@@ -0,0 +1,123 @@
+import unittest
+from fractions import Fraction
+
+import numpy as np
+
+from analysis import analyze
+from game_registry import REGISTRY
+from simulation import run_simulation
+from table_games import (RouletteGame, BaccaratGame, BlackjackGame,
+                         STAND, HIT, DOUBLE, DOUBLE_OR_STAND, SPLIT)
+
+def deal(game, *cards):
+    """грає одну роздачу з заданої послідовності карт (з запасом нулів у кінці)"""
+    shoe = np.array(list(cards) + [0] * game.MAX_CARDS_PER_ROUND, dtype=np.int8)
+    codes, wins, deltas, positions = game._play_rounds(shoe, np.array([0]))
+    return int(codes[0]), float(deltas[0]), int(positions[0])
+
+class TestRoulette(unittest.TestCase):
+
+    def test_exact_rtp_of_every_bet(self):
+        """тестуємо, що будь-яка ставка європейської рулетки має RTP 36/37"""
+        for game in (RouletteGame(), RouletteGame("dozen2"), RouletteGame("numbers", [17]),
+                     RouletteGame("numbers", [0, 1, 2, 3])):
+            analysis = analyze(game)
+            self.assertEqual(sum(p for _, p, _, _ in game.outcome_space()), Fraction(1))
+            self.assertAlmostEqual(analysis.rtp, 3600 / 37)
+
+    def test_batch_matches_tables(self):
+        """тестуємо пакет: виграш і виплата відповідають номеру"""
+        game = RouletteGame("numbers", [5, 8])
+        batch = game.play_many(5000, np.random.default_rng(1))
+        for result in batch[:200]:
+            self.assertEqual(result.is_win, result.outcome in (5, 8))
+            self.assertEqual(result.money_delta, 17.0 if result.is_win else -1.0)
+        self.assertEqual(game.decode_outcome(0), "0 зеро")
+        self.assertEqual(game.decode_outcome(1), "1 червоне")
+
+    def test_invalid_bets(self):
+        """тестуємо помилки: невідома ставка, 5 чи 9 номерів, номер поза колесом"""
+        for kwargs in ({"bet": "corner"}, {"bet": "numbers", "numbers": [1, 2, 3, 4, 5]},
+                       {"bet": "numbers", "numbers": list(range(1, 10))},
+                       {"bet": "numbers", "numbers": [37]}, {"bet": "red", "numbers": [1]}):
+            with self.assertRaises(ValueError):
+                RouletteGame(**kwargs)
+
+class TestBaccarat(unittest.TestCase):
+
+    def test_tableau(self):
+        """тестуємо правила третьої карти на заданих роздачах"""
+        game = BaccaratGame("player")
+        self.assertEqual(deal(game, 9, 0, 0, 5), (0, 1.0, 4))        #натуральна 9 гравця
+        self.assertEqual(deal(game, 2, 3, 3, 3, 6, 1), (1, -1.0, 6))  #гравець 5 бере, банкір 6 бере на 6
+        self.assertEqual(deal(game, 3, 4, 4, 3), (2, 0.0, 4))        #7 на 7 - нічия без карт
+
+    def test_house_edge(self):
+        """тестуємо перевагу казино на ставках банкіра і гравця (~1.06% і ~1.24%)"""
+        for bet, rtp in (("banker", 98.94), ("player", 98.76)):
+            summary = run_simulation(BaccaratGame(bet), 400_000, seed=1, workers=1)
+            self.assertAlmostEqual(summary.rtp, rtp, delta=0.6)
+
+    def test_empty_batch(self):
+        """тестуємо, що ігри з черевиком повертають порожній пакет на play_many(0)"""
+        for game in (BaccaratGame(), BlackjackGame()):
+            batch = game.play_many(0, np.random.default_rng(1))
+            self.assertEqual(len(batch), 0)
+            self.assertEqual(batch.outcomes.dtype, np.int8)
+            self.assertEqual(batch.wins.dtype, bool)
+            self.assertEqual(batch.money_deltas.dtype, np.float64)
+            self.assertEqual(run_simulation(game, 0, seed=1, workers=1).runs, 0)
+
+class TestBlackjack(unittest.TestCase):
+
+    def test_strategy_tables(self):
+        """тестуємо кілька клітинок базової стратегії"""
+        game = BlackjackGame()
+        self.assertEqual(game._HARD[16, 10], HIT)
+        self.assertEqual(game._HARD[12, 4], STAND)
+        self.assertEqual(game._HARD[11, 6], DOUBLE)
+        self.assertEqual(game._HARD[11, 1], HIT)
+        self.assertEqual(game._SOFT[18, 3], DOUBLE_OR_STAND)
+        self.assertEqual(game._PAIRS[8, 1], SPLIT)
+        self.assertEqual(game._PAIRS[9, 7], STAND)
+
+    def test_rounds(self):
+        """тестуємо роздачі: блекджеки, подвоєння, спліт, перебір"""
+        game = BlackjackGame()
+        self.assertEqual(deal(game, 1, 9, 10, 7)[1:], (1.5, 4))               #блекджек гравця
+        self.assertEqual(deal(game, 10, 1, 9, 10)[1:], (-1.0, 4))             #блекджек дилера
+        self.assertEqual(deal(game, 5, 6, 6, 10, 10, 9)[1:], (2.0, 6))        #подвоєння 11 проти 6
+        self.assertEqual(deal(game, 8, 10, 8, 7, 10, 3, 10)[1:], (3.0, 7))    #спліт 8, друга рука подвоєна
+        self.assertEqual(deal(game, 10, 10, 6, 7, 10)[1:], (-1.0, 5))         #перебір, дилер не добирає
+        code, delta, _ = deal(game, 1, 9, 10, 7)
+        self.assertEqual(game.decode_outcome(code), "+1.5")
+
+    def test_rtp_and_determinism(self):
+        """тестуємо RTP базової стратегії (~99.5%) і відтворюваність пакета"""
+        game = BlackjackGame()
+        summary = run_simulation(game, 300_000, seed=2, workers=1)
+        self.assertAlmostEqual(summary.rtp, 99.5, delta=1.0)
+        first = game.play_many(3000, np.random.default_rng(5))
+        second = game.play_many(3000, np.random.default_rng(5))
+        self.assertEqual(len(first), 3000)
+        np.testing.assert_array_equal(first.money_deltas, second.money_deltas)
+
+    def test_play_once(self):
+        """тестуємо play_once: руки з того самого seed однакові"""
+        first, second = BlackjackGame(seed=4), BlackjackGame(seed=4)
+        results = [first.play_once() for _ in range(50)]
+        self.assertEqual(results, [second.play_once() for _ in range(50)])
+        for result in results:
+            self.assertEqual(result.is_win, result.money_delta > 0)
+
+    def test_registered(self):
+        """тестуємо, що нові ігри є в реєстрі з пакетним режимом"""
+        for key in ("roulette", "baccarat", "blackjack"):
+            self.assertTrue(REGISTRY.get(key).capabilities().batch)
+        self.assertTrue(REGISTRY.get("roulette").capabilities().analytic)
+        self.assertFalse(REGISTRY.get("blackjack").capabilities().analytic)
+        self.assertEqual(REGISTRY.create("baccarat", bet="tie").get_config()["bet"], "tie")
+
+
+if __name__ == '__main__':
+    unittest.main()
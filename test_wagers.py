@@ -0,0 +1,124 @@
+import unittest
+import warnings
+
+import numpy as np
+
+from game_logic import DiceGame, SlotsGame, Wager
+from simulation import run_simulation
+from table_games import RouletteGame, BaccaratGame
+from wagers import WagerSummary, run_wagers, parse_wager
+
+class TestPlayWagers(unittest.TestCase):
+
+    def test_main_column_matches_play_many(self):
+        """тестуємо, що ставка "main" дає ті самі зміни балансу, що й play_many() на тому ж генераторі"""
+        for game in (DiceGame(), RouletteGame("odd"), BaccaratGame("tie")):
+            deltas = game.play_wagers(5000, [Wager(), Wager("main", stake=3)], np.random.default_rng(4))
+            batch = game.play_many(5000, np.random.default_rng(4))
+            self.assertEqual(deltas.shape, (5000, 2))
+            np.testing.assert_array_equal(deltas[:, 0], batch.money_deltas)
+            np.testing.assert_array_equal(deltas[:, 1], batch.money_deltas * 3)
+
+    def test_dice_bets_share_one_draw(self):
+        """тестуємо, що ставки Костей розраховуються на тих самих кидках"""
+        wagers = [Wager("double"), Wager("sum", 7), Wager("sum", 2), Wager("over"), Wager("under")]
+        deltas = DiceGame().play_wagers(20000, wagers, np.random.default_rng(1))
+        double, seven, two, over, under = (deltas[:, index] > 0 for index in range(5))
+        #сума 7 і сума 2 не буває одночасно, більше і менше 7 - теж
+        self.assertFalse(np.any(seven & two))
+        self.assertFalse(np.any(over & under))
+        #сума 2 - це дубль одиниць, а 7 ніколи не дубль
+        self.assertTrue(np.all(double[two]))
+        self.assertFalse(np.any(double & seven))
+        #на сумі 7 програють і over, і under
+        np.testing.assert_array_equal(seven, ~over & ~under)
+        self.assertEqual(set(np.unique(deltas[:, 2])), {-1.0, 30.0})
+
+    def test_dice_exact_rtp(self):
+        """тестуємо RTP ставок Костей за таблицею виплат проти повного перебору 36 кидків"""
+        game = DiceGame()
+        for wager, expected in ((Wager("double"), 5 / 6), (Wager("sum", 2), 31 / 36),
+                                (Wager("sum", 7), 5 / 6), (Wager("over"), 30 / 36)):
+            self.assertAlmostEqual(game.wager_payouts(wager).mean() + 1, expected)
+
+    def test_roulette_and_baccarat_bets(self):
+        """тестуємо ставки рулетки і баккара проти таблиць самих ігор"""
+        roulette = RouletteGame()
+        np.testing.assert_array_equal(roulette.wager_payouts(Wager("dozen2")),
+                                      RouletteGame("dozen2")._delta_table)
+        np.testing.assert_array_equal(roulette.wager_payouts(Wager("numbers", (17, 18))),
+                                      RouletteGame("numbers", [17, 18])._delta_table)
+        self.assertEqual(roulette.wager_payouts(Wager("numbers", 17))[17], 35.0)
+
+        deltas = BaccaratGame().play_wagers(5000, [Wager("player"), Wager("banker"), Wager("tie")],
+                                            np.random.default_rng(2))
+        #виграє рівно одна ставка: гравець, банкір або нічия
+        np.testing.assert_array_equal((deltas > 0).sum(axis=1), np.ones(5000))
+
+    def test_unknown_bets(self):
+        """тестуємо помилки для невідомих ставок і ігор без меню ставок"""
+        with self.assertRaises(ValueError):
+            DiceGame().play_wagers(10, [Wager("sum", 13)])
+        with self.assertRaises(ValueError):
+            DiceGame().play_wagers(10, [Wager("sum", (1, 2))])
+        with self.assertRaises(ValueError):
+            RouletteGame().play_wagers(10, [Wager("corner")])
+        with self.assertRaises(ValueError):
+            SlotsGame().play_wagers(10, [Wager("main"), Wager("sum", 7)])
+        #лише "main" - працює в будь-якій грі
+        self.assertEqual(SlotsGame().play_wagers(10, [Wager("main", stake=2)]).shape, (10, 1))
+
+class TestRunWagers(unittest.TestCase):
+
+    def test_main_matches_run_simulation(self):
+        """тестуємо, що "main" у run_wagers() дає той самий підсумок, що й run_simulation()"""
+        game = DiceGame()
+        wagers = run_wagers(game, [Wager(), Wager("sum", 7)], 25000, seed=3, workers=1, chunk_size=10000)
+        summary = run_simulation(game, 25000, seed=3, workers=1, chunk_size=10000)
+        self.assertEqual(wagers.runs, 25000)
+        self.assertAlmostEqual(wagers.money_deltas[0], summary.money_delta)
+        self.assertAlmostEqual(wagers.money_m2[0], summary.money_m2)
+        self.assertEqual(wagers.wins[0], summary.wins)
+        self.assertAlmostEqual(wagers.rtp[0], summary.rtp)
+
+    def test_same_result_for_any_workers(self):
+        """тестуємо, що результат однаковий при будь-якій кількості процесів"""
+        wagers = [Wager("double"), Wager("sum", 11, 2.5), Wager("under")]
+        first = run_wagers(DiceGame(), wagers, 30000, seed=8, workers=1, chunk_size=7000)
+        second = run_wagers(DiceGame(), wagers, 30000, seed=8, workers=2, chunk_size=7000)
+        np.testing.assert_array_equal(first.money_deltas, second.money_deltas)
+        np.testing.assert_array_equal(first.money_m2, second.money_m2)
+        np.testing.assert_array_equal(first.wins, second.wins)
+
+    def test_zero_runs(self):
+        """тестуємо порожній запуск: нулі замість nan і без попереджень"""
+        for game in (DiceGame(), BaccaratGame()):
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                summary = run_wagers(game, [Wager(), Wager("main", stake=2)], 0, seed=1, workers=1)
+                np.testing.assert_array_equal(summary.rtp, [0.0, 0.0])
+                np.testing.assert_array_equal(summary.win_percentage, [0.0, 0.0])
+                self.assertTrue(np.all(np.isinf(summary.rtp_half_width())))
+
+    def test_merge_matches_single_pass(self):
+        """тестуємо злиття пакетів проти підсумку однієї матриці"""
+        wagers = [Wager(), Wager("over")]
+        deltas = DiceGame().play_wagers(9000, wagers, np.random.default_rng(5))
+        whole = WagerSummary.from_matrix(wagers, deltas)
+        merged = WagerSummary(wagers)
+        for part in np.array_split(deltas, 4):
+            merged.merge(WagerSummary.from_matrix(wagers, part))
+        np.testing.assert_allclose(merged.money_m2, whole.money_m2)
+        np.testing.assert_allclose(merged.variance, np.var(deltas, axis=0, ddof=1))
+
+    def test_parse_wager(self):
+        """тестуємо розбір ставок з командного рядка"""
+        self.assertEqual(parse_wager("main"), Wager())
+        self.assertEqual(parse_wager("sum:7@2"), Wager("sum", 7, 2.0))
+        self.assertEqual(parse_wager("numbers:17,18"), Wager("numbers", (17, 18)))
+        self.assertEqual(parse_wager("tie@0.5"), Wager("tie", None, 0.5))
+        with self.assertRaises(ValueError):
+            parse_wager("over@0")
+
+if __name__ == '__main__':
+    unittest.main()
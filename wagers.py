@@ -0,0 +1,193 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from game_logic import IGame, Wager
+from profiling import phase
+from simulation import CHUNK_SIZE, chunk_rng, resolve_seed
+
+
+#підсумок "меню" ставок
+@dataclass
+class WagerSummary:
+    """
+    Накопичувач результатів play_wagers(): для кожної ставки - сума змін балансу,
+    M2 (для дисперсії) і кількість виграшних раундів. Усі ставки зіграні
+    на тих самих раундах, тож runs спільний.
+    """
+    wagers: list
+    runs: int = 0
+    money_deltas: np.ndarray = None  #сума змін балансу по кожній ставці
+    money_m2: np.ndarray = None      #сума квадратів відхилень від середнього (Велфорд)
+    wins: np.ndarray = None          #раунди, в яких ставка виграла
+    seed: int = None
+
+    def __post_init__(self):
+        count = len(self.wagers)
+        if self.money_deltas is None:
+            self.money_deltas = np.zeros(count)
+        if self.money_m2 is None:
+            self.money_m2 = np.zeros(count)
+        if self.wins is None:
+            self.wins = np.zeros(count, dtype=np.int64)
+
+    @classmethod
+    def from_matrix(cls, wagers: list, deltas: np.ndarray) -> "WagerSummary":
+        """Підсумок матриці змін балансу (раунди x ставки)."""
+        summary = cls(wagers)
+        runs = deltas.shape[0]
+        if runs == 0:
+            return summary
+        money_deltas = deltas.sum(axis=0)
+        m2 = np.square(deltas - money_deltas / runs).sum(axis=0)
+        summary._add_moments(runs, money_deltas, m2)
+        summary.wins = np.count_nonzero(deltas > 0, axis=0)
+        return summary
+
+    def merge(self, other: "WagerSummary"):
+        """Додає до цього підсумку результати іншого пакета з тими самими ставками."""
+        if other.runs > 0:
+            self._add_moments(other.runs, other.money_deltas, other.money_m2)
+        self.wins = self.wins + other.wins
+
+    def _add_moments(self, runs: int, money_deltas: np.ndarray, m2: np.ndarray):
+        """Паралельна формула Велфорда/Чана, як у SimulationSummary, для всіх ставок одразу."""
+        if self.runs == 0:
+            self.runs, self.money_deltas, self.money_m2 = runs, money_deltas, m2
+            return
+        total = self.runs + runs
+        difference = money_deltas / runs - self.money_deltas / self.runs
+        self.money_m2 = self.money_m2 + m2 + difference * difference * self.runs * runs / total
+        self.runs = total
+        self.money_deltas = self.money_deltas + money_deltas
+
+    @property
+    def stakes(self) -> np.ndarray:
+        return np.array([wager.stake for wager in self.wagers], dtype=np.float64)
+
+    @property
+    def rtp(self) -> np.ndarray:
+        """RTP кожної ставки у відсотках від поставленого."""
+        if self.runs == 0:
+            return np.zeros(len(self.wagers))
+        return (self.money_deltas / self.stakes + self.runs) / self.runs * 100
+
+    @property
+    def win_percentage(self) -> np.ndarray:
+        if self.runs == 0:
+            return np.zeros(len(self.wagers))
+        return self.wins / self.runs * 100.0
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Вибіркова дисперсія зміни балансу за раунд для кожної ставки."""
+        if self.runs < 2:
+            return np.zeros(len(self.wagers))
+        return self.money_m2 / (self.runs - 1)
+
+    def rtp_half_width(self, confidence: float = 0.99) -> np.ndarray:
+        """Половина ширини довірчого інтервалу RTP кожної ставки (у відсоткових пунктах)."""
+        if self.runs < 2:
+            return np.full(len(self.wagers), math.inf)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return z * np.sqrt(self.variance / self.runs) / self.stakes * 100
+
+
+def _play_wager_chunk(game: IGame, wagers: list, runs: int, seed: int,
+                      chunk_index: int) -> WagerSummary:
+    """Рахує один пакет ставок (виконується у процесі-воркері)."""
+    deltas = game.play_wagers(runs, wagers, chunk_rng(seed, chunk_index))
+    with phase("aggregate"):
+        return WagerSummary.from_matrix(wagers, deltas)
+
+
+def run_wagers(game: IGame, wagers: list, num_runs: int, seed: int = None,
+               workers: int = None, chunk_size: int = CHUNK_SIZE) -> WagerSummary:
+    """
+    Грає num_runs раундів і розраховує всі ставки wagers на кожному з них.
+    Пакети і їхні генератори ті самі, що в run_simulation(), тож ставка "main"
+    дає той самий результат, що й звичайна симуляція з тим самим seed.
+    """
+    if not wagers:
+        raise ValueError("Потрібна хоча б одна ставка")
+    seed = resolve_seed(game, seed)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunk_sizes = [min(chunk_size, num_runs - start) for start in range(0, num_runs, chunk_size)]
+
+    summary = WagerSummary(list(wagers), seed=seed)
+    #для одного процесу пул лише додає витрат на запуск
+    if workers == 1 or len(chunk_sizes) <= 1:
+        for index, size in enumerate(chunk_sizes):
+            summary.merge(_play_wager_chunk(game, wagers, size, seed, index))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_play_wager_chunk, game, wagers, size, seed, index)
+                       for index, size in enumerate(chunk_sizes)]
+            #зливаємо по порядку, тож результат не залежить від кількості процесів
+            for future in futures:
+                summary.merge(future.result())
+    return summary
+
+
+def parse_wager(text: str) -> Wager:
+    """
+    Ставка з рядка "тип[:значення][@розмір]": "main", "sum:7", "over@5", "numbers:17,18@2".
+    Значення з комами стає кортежем чисел, число - int.
+    """
+    text = text.strip()
+    body, _, stake = text.partition("@")
+    bet, _, value = body.partition(":")
+    if not bet:
+        raise ValueError(f"Порожня ставка: '{text}'")
+    if not value:
+        value = None
+    elif "," in value:
+        value = tuple(int(part) for part in value.split(","))
+    else:
+        try:
+            value = int(value)
+        except ValueError:
+            pass
+    stake = float(stake) if stake else 1.0
+    if stake <= 0:
+        raise ValueError(f"Розмір ставки має бути додатним: '{text}'")
+    return Wager(bet, value, stake)
+
+
+def format_wagers(game: IGame, summary: WagerSummary, confidence: float = 0.99) -> str:
+    """Текстовий звіт: рядок на ставку з RTP, відсотком виграшів і довірчим інтервалом."""
+    text = f"--- СТАВКИ: {game.get_game_name()} ---\n"
+    text += f"Раундів: {summary.runs} (seed {summary.seed}), усі ставки на тих самих розіграшах\n"
+    half_widths = summary.rtp_half_width(confidence)
+    for index, wager in enumerate(summary.wagers):
+        text += f"  {str(wager):<16} RTP {summary.rtp[index]:7.3f} % ± {half_widths[index]:.3f}, " \
+                f"виграші {summary.win_percentage[index]:.2f} %, " \
+                f"баланс {summary.money_deltas[index]:+.2f}\n"
+    return text
+
+
+def wagers_to_dict(game: IGame, summary: WagerSummary) -> dict:
+    """Підсумок ставок як словник для JSON."""
+    return {
+        "game": game.get_game_name(),
+        "runs": summary.runs,
+        "seed": summary.seed,
+        "wagers": [
+            {
+                "bet": wager.bet,
+                "value": list(wager.value) if isinstance(wager.value, tuple) else wager.value,
+                "stake": wager.stake,
+                "money_delta": float(summary.money_deltas[index]),
+                "wins": int(summary.wins[index]),
+                "win_percentage": float(summary.win_percentage[index]),
+                "rtp": float(summary.rtp[index]),
+                "variance": float(summary.variance[index]),
+            }
+            for index, wager in enumerate(summary.wagers)
+        ],
+    }